@@ -0,0 +1,97 @@
+"""Per-call overhead of BaseDAO lookups: per-call filter_by() vs cached statements.
+
+SQLite in memory stands in for PostgreSQL, so the numbers cover only what runs in
+Python: statement construction, cache key generation, compiled-cache lookup and
+result processing. The DAO coroutines differ only by ``await``, so the
+queries are run through a sync Session.
+
+Run from the project root: ``python -m benchmarks.dao_lookup``
+"""
+import datetime as dt
+import timeit
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from dao.siz import SIZModelDAO
+from dao.user import UserDAO
+from database.models import SIZModel, SIZType, SIZUser
+
+N = 20_000
+
+
+def setup() -> Session:
+    engine = create_engine('sqlite://')
+    SIZUser.metadata.create_all(
+        engine, tables=[SIZUser.__table__, SIZType.__table__, SIZModel.__table__]
+    )
+    session = Session(engine)
+    now = dt.datetime.now()
+    session.add(SIZUser(
+        id=1, tg_id=1106699847, phone_number='+79990000000', is_active=True,
+        last_modified_at=now
+    ))
+    session.add(SIZType(id=1, name='Перчатки', is_active=True, last_modified_at=now))
+    session.add_all(
+        SIZModel(
+            id=i, type_id=1, name=f'Модель {i}', is_active=True, last_modified_at=now
+        )
+        for i in range(1, 11)
+    )
+    session.commit()
+    return session
+
+
+def main() -> None:
+    session = setup()
+    cases = [
+        (
+            'UserDAO tg_id',
+            lambda: session.execute(
+                select(SIZUser).filter_by(tg_id=1106699847, is_active=True)
+            ).scalar_one_or_none(),
+            lambda: session.execute(
+                UserDAO.select_by('is_active', 'tg_id'),
+                {'tg_id': 1106699847, 'is_active': True}
+            ).scalar_one_or_none()
+        ),
+        (
+            'SIZModelDAO id',
+            lambda: session.execute(select(SIZModel).filter_by(id=7)).scalar_one(),
+            lambda: session.execute(SIZModelDAO.select_by('id'), {'id': 7}).scalar_one()
+        ),
+        (
+            'SIZModelDAO type',
+            lambda: session.execute(
+                select(SIZModel).filter_by(type_id=1, is_active=True)
+            ).scalars().all(),
+            lambda: session.execute(
+                SIZModelDAO.select_by('is_active', 'type_id'),
+                {'type_id': 1, 'is_active': True}
+            ).scalars().all()
+        ),
+    ]
+    print(f'{"lookup":<18}{"filter_by, us":>16}{"cached, us":>14}{"saved":>8}')
+    for name, old, new in cases:
+        old(), new()
+        old_t = timeit.timeit(old, number=N) / N * 1e6
+        new_t = timeit.timeit(new, number=N) / N * 1e6
+        print(f'{name:<18}{old_t:>16.2f}{new_t:>14.2f}{1 - new_t / old_t:>8.0%}')
+
+    build_old = timeit.timeit(
+        lambda: (
+            select(SIZUser).filter_by(tg_id=1, is_active=True)._generate_cache_key()
+        ),
+        number=N
+    )
+    build_new = timeit.timeit(
+        lambda: UserDAO.select_by('is_active', 'tg_id')._generate_cache_key(), number=N
+    )
+    print(
+        f'\nstatement + cache key only: '
+        f'{build_old / N * 1e6:.2f} us -> {build_new / N * 1e6:.2f} us'
+    )
+
+
+if __name__ == '__main__':
+    main()
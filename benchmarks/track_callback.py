@@ -0,0 +1,83 @@
+"""Serialized size and encode/decode cost of the FSM ``cb`` entry.
+
+Run from the project root: ``python -m benchmarks.track_callback``
+"""
+import datetime as dt
+import json
+import timeit
+
+from aiogram.types import (
+    Chat,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+    MessageEntity,
+    User,
+)
+
+from services.models import TrackCallback
+
+N = 20_000
+
+
+def sample_message() -> Message:
+    user = User(
+        id=1106699847, is_bot=False, first_name='Иван', last_name='Петров',
+        username='ivan', language_code='ru'
+    )
+    return Message(
+        message_id=4242,
+        date=dt.datetime.now(dt.timezone.utc),
+        chat=Chat(
+            id=1106699847, type='private', first_name='Иван', last_name='Петров',
+            username='ivan'
+        ),
+        from_user=user,
+        text='Выберите интересующий тип СИЗ из списка:',
+        entities=[MessageEntity(type='bold', offset=0, length=9)],
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text=f'Тип СИЗ №{i}', callback_data=f'type:{i}')]
+            for i in range(10)
+        ])
+    )
+
+
+def main() -> None:
+    message = sample_message()
+    callback_data = 'type:7'
+
+    def old_encode() -> str:
+        return json.dumps({
+            'message': message.model_dump(mode='json', exclude_none=True),
+            'callback_data': callback_data
+        })
+
+    def new_encode() -> str:
+        track = TrackCallback(message.chat.id, message.message_id, callback_data)
+        return json.dumps(track.encode())
+
+    old_raw, new_raw = old_encode(), new_encode()
+
+    def old_decode() -> Message:
+        return Message.model_validate(json.loads(old_raw)['message'])
+
+    def new_decode() -> TrackCallback:
+        return TrackCallback.decode(json.loads(new_raw))
+
+    rows = [
+        (
+            name, len(raw.encode()),
+            timeit.timeit(encode, number=N), timeit.timeit(decode, number=N)
+        )
+        for name, raw, encode, decode in (
+            ('Message in FSM', old_raw, old_encode, old_decode),
+            ('TrackCallback v1', new_raw, new_encode, new_decode)
+        )
+    ]
+    print(f'{"format":<18}{"bytes":>8}{"encode, us":>14}{"decode, us":>14}')
+    for name, size, enc, dec in rows:
+        print(f'{name:<18}{size:>8}{enc / N * 1e6:>14.2f}{dec / N * 1e6:>14.2f}')
+
+
+if __name__ == '__main__':
+    main()
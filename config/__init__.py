@@ -1,2 +1,2 @@
-from .base import load_config
+from .base import load_config, load_db_config
 from .startup import on_startup
\ No newline at end of file
@@ -12,39 +12,114 @@ class DatabaseConfig:
     host: str
     port: str
     driver: str
+    pool_size: int = 10
+    max_overflow: int = 5
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 500
+    echo: bool | str = False
 
     def __post_init__(self):
         self.dsn = f'postgres://{self.user}:{self.password}@{self.host}:{self.port}/{self.db_name}'
-        self.url = f'postgresql+{self.driver}://{self.user}:{self.password}@{self.host}/{self.db_name}'
+        self.url = f'postgresql+{self.driver}://{self.user}:{self.password}@{self.host}:{self.port}/{self.db_name}'
 
 
 @dataclass
 class BotConfig:
     token: str
     storage: BaseStorage
+    mode: str
+    service_chat_id: int | None
+
+
+@dataclass
+class WebhookConfig:
+    base_url: str | None
+    path: str
+    secret: str | None
+    host: str
+    port: int
+    max_tasks: int
+
+
+@dataclass
+class EISConfig:
+    url: str | None
+    token: str | None
+    export_dir: str | None
+    format: str
+    batch_size: int
+    interval: int
 
 
 @dataclass
 class Config:
     bot: BotConfig
     db: DatabaseConfig
+    webhook: WebhookConfig
+    eis: EISConfig
+
+
+def _echo_level(value: str) -> bool | str:
+    value = value.lower()
+    if value == 'debug':
+        return 'debug'
+    return value in ('1', 'true', 'yes', 'on')
+
+
+def load_db_config(env: Env | None = None) -> DatabaseConfig:
+    if env is None:
+        env = Env()
+        env.read_env()
+
+    return DatabaseConfig(
+        db_name=env('DB_NAME'),
+        user=env('DB_USER'),
+        password=env('DB_PASSWORD'),
+        host=env('DB_HOST'),
+        port=env('DB_PORT'),
+        driver=env('DB_DRIVER'),
+        pool_size=env.int('DB_POOL_SIZE', 10),
+        max_overflow=env.int('DB_MAX_OVERFLOW', 5),
+        pool_timeout=env.float('DB_POOL_TIMEOUT', 30.0),
+        pool_recycle=env.int('DB_POOL_RECYCLE', 1800),
+        pool_pre_ping=env.bool('DB_POOL_PRE_PING', True),
+        statement_cache_size=env.int('DB_STATEMENT_CACHE_SIZE', 500),
+        echo=_echo_level(env.str('DB_ECHO', 'false'))
+    )
 
 
 def load_config() -> Config:
     env: Env = Env()
     env.read_env()
+    mode = env.str('BOT_MODE', 'polling')
 
     return Config(
         bot=BotConfig(
             token=env('BOT_TOKEN'),
-            storage=RedisStorage.from_url(env('REDIS_URL'))
+            storage=RedisStorage.from_url(env('REDIS_URL')),
+            mode=mode,
+            service_chat_id=env.int('SERVICE_CHAT_ID', None)
+        ),
+        db=load_db_config(env),
+        webhook=WebhookConfig(
+            base_url=env.str('WEBHOOK_URL', None),
+            path=env.str('WEBHOOK_PATH', '/webhook'),
+            # Telegram's secret header is only checked when a secret is set,
+            # so webhook mode requires one
+            secret=(env.str('WEBHOOK_SECRET') if mode == 'webhook'
+                    else env.str('WEBHOOK_SECRET', None)),
+            host=env.str('WEBAPP_HOST', '0.0.0.0'),
+            port=env.int('WEBAPP_PORT', 8080),
+            max_tasks=env.int('WEBHOOK_MAX_TASKS', 100)
         ),
-        db=DatabaseConfig(
-            db_name=env('DB_NAME'),
-            user=env('DB_USER'),
-            password=env('DB_PASSWORD'),
-            host=env('DB_HOST'),
-            port=env('DB_PORT'),
-            driver=env('DB_DRIVER')
+        eis=EISConfig(
+            url=env.str('EIS_EXPORT_URL', None),
+            token=env.str('EIS_EXPORT_TOKEN', None),
+            export_dir=env.str('EIS_EXPORT_DIR', None),
+            format=env.str('EIS_EXPORT_FORMAT', 'ndjson'),
+            batch_size=env.int('EIS_EXPORT_BATCH_SIZE', 1000),
+            interval=env.int('EIS_EXPORT_INTERVAL', 60)
         )
     )
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from config.base import WebhookConfig
+
+logger = logging.getLogger(__name__)
+
+
+class LimitedRequestHandler(SimpleRequestHandler):
+    """Acknowledges every update at once and processes at most ``max_tasks`` at a time.
+
+    Telegram re-delivers an update that is not acknowledged in time, so handlers
+    run in background tasks; the tasks over the limit wait for a free slot.
+    On shutdown the running tasks get ``drain_timeout`` seconds to finish.
+    """
+
+    def __init__(
+            self,
+            dispatcher: Dispatcher,
+            bot: Bot,
+            max_tasks: int,
+            drain_timeout: float = 10.0,
+            **kwargs: Any
+    ):
+        super().__init__(
+            dispatcher=dispatcher, bot=bot, handle_in_background=True, **kwargs
+        )
+        self.drain_timeout = drain_timeout
+        self._slots = asyncio.Semaphore(max_tasks)
+
+    async def _background_feed_update(self, bot: Bot, update: dict[str, Any]) -> None:
+        async with self._slots:
+            await super()._background_feed_update(bot, update)
+
+    async def close(self) -> None:
+        if self._background_feed_update_tasks:
+            await asyncio.wait(
+                self._background_feed_update_tasks, timeout=self.drain_timeout
+            )
+        await super().close()
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher, config: WebhookConfig) -> None:
+    if not config.secret:
+        raise RuntimeError('WEBHOOK_SECRET must be set in webhook mode')
+    app = web.Application()
+    LimitedRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        max_tasks=config.max_tasks,
+        secret_token=config.secret
+    ).register(app, path=config.path)
+    setup_application(app, dp, bot=bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host=config.host, port=config.port).start()
+    logger.info(
+        'Webhook server listening on %s:%s%s', config.host, config.port, config.path
+    )
+
+    if config.base_url:
+        await bot.set_webhook(
+            url=f'{config.base_url.rstrip("/")}{config.path}',
+            secret_token=config.secret,
+            max_connections=min(config.max_tasks, 100),
+            allowed_updates=dp.resolve_used_update_types()
+        )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
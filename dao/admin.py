@@ -1,7 +1,11 @@
+import datetime as dt
 from dao.base import BaseDAO
-from sqlalchemy import select
+from dao.user import UserDAO
+from sqlalchemy import select, update, func, literal, or_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from database.models import AdminNotice
+from database.models import AdminNotice, NoticeDelivery, DeliveryStatus, SIZUser
+from database.uow import save
 
 
 class AdminDAO(BaseDAO):
@@ -13,3 +17,75 @@ class AdminDAO(BaseDAO):
         result = await session.execute(query)
         return result.scalars().all()
 
+
+class NoticeDeliveryDAO(BaseDAO):
+    model = NoticeDelivery
+
+    terminal_statuses = (
+        DeliveryStatus.SENT, DeliveryStatus.DEAD, DeliveryStatus.UNREACHABLE
+    )
+
+    @classmethod
+    async def has_recipients(cls, session: AsyncSession, notice_id: int) -> bool:
+        query = select(cls.model.id).filter_by(notice_id=notice_id).limit(1)
+        result = await session.execute(query)
+        return result.scalar_one_or_none() is not None
+
+    @classmethod
+    async def add_recipients(cls, session: AsyncSession, notice_id: int) -> None:
+        query = (
+            insert(cls.model)
+            .from_select(
+                ['notice_id', 'user_id'],
+                UserDAO.bot_users_query(literal(notice_id), SIZUser.id)
+            )
+            .on_conflict_do_nothing(index_elements=['notice_id', 'user_id'])
+        )
+        await session.execute(query)
+        await save(session)
+
+    @classmethod
+    async def get_due(cls, session: AsyncSession, notice_id: int, limit: int):
+        query = (
+            select(cls.model.id, cls.model.attempts, SIZUser.tg_id)
+            .join(SIZUser, cls.model.user_id == SIZUser.id)
+            .where(cls.model.notice_id == notice_id)
+            .where(cls.model.status.not_in(cls.terminal_statuses))
+            .where(or_(
+                cls.model.next_attempt_at == None,
+                cls.model.next_attempt_at <= dt.datetime.now()
+            ))
+            .order_by(cls.model.id)
+            .limit(limit)
+            # rows taken by another runner are skipped until it commits them
+            .with_for_update(of=cls.model, skip_locked=True)
+        )
+        result = await session.execute(query)
+        return result.all()
+
+    @classmethod
+    async def mark_sent(cls, session: AsyncSession, delivery_ids: list[int]) -> int:
+        return await cls.update_many(
+            session,
+            delivery_ids,
+            status=DeliveryStatus.SENT,
+            attempts=cls.model.attempts + 1,
+            last_error=None,
+            sent_at=dt.datetime.now()
+        )
+
+    @classmethod
+    async def mark_failed(cls, session: AsyncSession, rows: list[dict]) -> None:
+        await session.execute(update(cls.model), rows)
+        await save(session)
+
+    @classmethod
+    async def count_unfinished(cls, session: AsyncSession, notice_id: int) -> int:
+        query = (
+            select(func.count())
+            .select_from(cls.model)
+            .where(cls.model.notice_id == notice_id)
+            .where(cls.model.status.not_in(cls.terminal_statuses))
+        )
+        result = await session.execute(query)
+        return result.scalar_one()
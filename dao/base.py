@@ -1,42 +1,227 @@
-from sqlalchemy import select, insert, delete, update
+from typing import Any, Iterable, Iterator, Sequence
+from sqlalchemy import (Select, and_, bindparam, or_, select, insert, delete, update,
+                        func)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from database.uow import save
+
+MAX_QUERY_PARAMS = 32_767
+
+_statements: dict[tuple, Select] = {}
+
+
+def chunked(
+        items: Sequence, params_per_item: int = 1, reserved: int = 0
+) -> Iterator[Sequence]:
+    """Splits ``items`` so no statement binds more than asyncpg's 32767 parameters."""
+    size = max((MAX_QUERY_PARAMS - reserved) // max(params_per_item, 1), 1)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def keyset_condition(columns: Sequence, values: Sequence, forward: bool):
+    """``(columns) > (values)`` (``<`` if not ``forward``) without row comparison."""
+    clauses = []
+    for i, column in enumerate(columns):
+        step = column > values[i] if forward else column < values[i]
+        equal = (prev == value for prev, value in zip(columns[:i], values[:i]))
+        clauses.append(and_(*equal, step))
+    return or_(*clauses)
 
 
 class BaseDAO:
     model = None
 
+    @classmethod
+    def select_by(cls, *fields: str) -> Select:
+        """SELECT filtered by ``field = :field``, built once per model and field set."""
+        key = (cls.model, fields)
+        query = _statements.get(key)
+        if query is None:
+            query = select(cls.model).where(
+                *(getattr(cls.model, field) == bindparam(field) for field in fields)
+            )
+            _statements[key] = query
+        return query
+
+    @classmethod
+    async def _execute_filtered(cls, async_session: AsyncSession, filter_options: dict):
+        if None in filter_options.values():
+            return await async_session.execute(
+                select(cls.model).filter_by(**filter_options)
+            )
+        fields = tuple(sorted(filter_options))
+        return await async_session.execute(cls.select_by(*fields), filter_options)
+
     @classmethod
     async def find_by_id(cls, model_id: int, async_session: AsyncSession):
-        query = select(cls.model).filter_by(id=model_id)
-        result = await async_session.execute(query)
+        result = await async_session.execute(cls.select_by('id'), {'id': model_id})
         return result.scalar_one()
 
     @classmethod
     async def find_one_or_none(cls, async_session: AsyncSession, **filter_options):
-        query = select(cls.model).filter_by(**filter_options)
-        result = await async_session.execute(query)
+        result = await cls._execute_filtered(async_session, filter_options)
         return result.scalar_one_or_none()
 
     @classmethod
     async def find_all(cls, async_session: AsyncSession, **filter_options):
-        query = select(cls.model).filter_by(**filter_options)
-        result = await async_session.execute(query)
+        result = await cls._execute_filtered(async_session, filter_options)
         return result.scalars().all()
 
+    @classmethod
+    async def find_page(
+            cls,
+            async_session: AsyncSession,
+            limit: int,
+            after: int | None = None,
+            before: int | None = None,
+            query: Select | None = None,
+            order_by: Sequence | None = None,
+            **filter_options
+    ) -> tuple[Sequence, bool, bool]:
+        """Keyset page of ``query`` ordered by ``order_by`` (``(name, id)`` by default).
+
+        ``after``/``before`` are ids of the rows bounding the page, so the cost does not
+        depend on how deep the page is. The cursor row is looked up without the filters,
+        so a row deactivated since still bounds the page; if it was deleted the first
+        page is returned. Returns the rows, has_prev and has_next.
+        """
+        if query is None:
+            query = select(cls.model).filter_by(**filter_options)
+        if order_by is None:
+            order_by = (cls.model.name, cls.model.id)
+        cursor_id = after if after is not None else before
+        if cursor_id is not None:
+            lookup = (
+                select(*order_by)
+                .select_from(*query.get_final_froms())
+                .where(cls.model.id == cursor_id)
+            )
+            bound = (await async_session.execute(lookup)).first()
+            if bound is None:
+                after = before = None
+            else:
+                query = query.where(
+                    keyset_condition(order_by, bound, forward=after is not None)
+                )
+        if before is not None:
+            query = query.order_by(*(column.desc() for column in order_by))
+        else:
+            query = query.order_by(*order_by)
+        result = await async_session.execute(query.limit(limit + 1))
+        rows = result.scalars().all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if before is not None:
+            return rows[::-1], has_more, True
+        return rows, after is not None, has_more
+
     @classmethod
     async def add_new_object(cls, async_session: AsyncSession, **data):
         query = insert(cls.model).values(**data)
         await async_session.execute(query)
-        await async_session.commit()
+        await save(async_session)
+
+    @classmethod
+    async def insert_many(
+            cls, async_session: AsyncSession, rows: Sequence[dict[str, Any]]) -> int:
+        """Multi-row INSERT; every row must have the same keys."""
+        inserted = 0
+        for chunk in chunked(rows, len(cls.model.__table__.columns)):
+            result = await async_session.execute(insert(cls.model).values(list(chunk)))
+            inserted += result.rowcount
+        if rows:
+            await save(async_session)
+        return inserted
+
+    @classmethod
+    async def upsert_many(
+            cls,
+            async_session: AsyncSession,
+            rows: Sequence[dict[str, Any]],
+            index_elements: Iterable[str],
+            update_fields: Iterable[str] | None = None
+    ) -> int:
+        """INSERT ... ON CONFLICT (index_elements) DO UPDATE of every non-key column.
+
+        ``update_fields`` narrows the updated columns; an empty list means DO NOTHING.
+
+        ``index_elements`` must name a unique constraint present in ``rows``; ids of
+        ``Identity(always=True)`` tables cannot be inserted, so there is no default.
+        """
+        if not rows:
+            return 0
+        index_elements = list(index_elements)
+        if update_fields is None:
+            update_fields = [field for field in rows[0] if field not in index_elements]
+        affected = 0
+        for chunk in chunked(rows, len(cls.model.__table__.columns)):
+            query = pg_insert(cls.model).values(list(chunk))
+            if update_fields:
+                query = query.on_conflict_do_update(
+                    index_elements=index_elements,
+                    set_={field: query.excluded[field] for field in update_fields}
+                )
+            else:
+                query = query.on_conflict_do_nothing(index_elements=index_elements)
+            result = await async_session.execute(query)
+            affected += result.rowcount
+        await save(async_session)
+        return affected
+
+    @classmethod
+    async def update_many(
+            cls, async_session: AsyncSession, ids: Sequence[int], **values) -> int:
+        """UPDATE ... SET values WHERE id IN ids; values may be SQL expressions."""
+        affected = 0
+        for chunk in chunked(ids, reserved=len(values)):
+            query = (
+                update(cls.model)
+                .where(cls.model.id.in_(chunk))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            result = await async_session.execute(query)
+            affected += result.rowcount
+        if ids:
+            await save(async_session)
+        return affected
+
+    @classmethod
+    async def mark_many(
+            cls, async_session: AsyncSession, ids: Sequence[int], field: str) -> int:
+        """Sets the timestamp ``field`` to now() where it is NULL; returns the count."""
+        column = getattr(cls.model, field)
+        affected = 0
+        for chunk in chunked(ids):
+            query = (
+                update(cls.model)
+                .where(cls.model.id.in_(chunk), column.is_(None))
+                .values({column: func.now()})
+                .execution_options(synchronize_session=False)
+            )
+            result = await async_session.execute(query)
+            affected += result.rowcount
+        if ids:
+            await save(async_session)
+        return affected
 
     @classmethod
     async def update_object(cls, async_session: AsyncSession, model_id: int, **data):
         query = update(cls.model).filter_by(id=model_id).values(**data)
         await async_session.execute(query)
-        await async_session.commit()
+        await save(async_session)
 
     @classmethod
     async def delete_object(cls, model_id: int, async_session: AsyncSession):
         query = delete(cls.model).filter_by(id=model_id)
         await async_session.execute(query)
-        await async_session.commit()
+        await save(async_session)
+
+    @classmethod
+    async def get_version(cls, async_session: AsyncSession) -> tuple:
+        query = select(
+            func.max(cls.model.last_modified_at), func.count()
+        ).select_from(cls.model)
+        result = await async_session.execute(query)
+        return tuple(result.one())
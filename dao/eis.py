@@ -0,0 +1,86 @@
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import Row, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dao.base import BaseDAO
+from database.models import EISExportBatch
+from database.uow import save
+
+
+class EISExportDAO(BaseDAO):
+    """DAO for tables exported to EIS and flagged through ``sent_to_eis``."""
+
+    @classmethod
+    def export_columns(cls) -> list:
+        return [
+            column for column in cls.model.__table__.c if column.name != 'sent_to_eis'
+        ]
+
+    @classmethod
+    async def stream_unsent(
+            cls,
+            async_session: AsyncSession,
+            after_id: int,
+            window: int,
+            batch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        query = (
+            select(*cls.export_columns())
+            .where(cls.model.sent_to_eis.is_(None), cls.model.id > after_id)
+            .order_by(cls.model.id)
+            .limit(window)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await async_session.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+    @classmethod
+    async def get_rows(
+            cls, async_session: AsyncSession, ids: Sequence[int]) -> Sequence[Row]:
+        query = (
+            select(*cls.export_columns())
+            .where(cls.model.id.in_(ids))
+            .order_by(cls.model.id)
+        )
+        result = await async_session.execute(query)
+        return result.all()
+
+    @classmethod
+    async def mark_sent(cls, async_session: AsyncSession, ids: Sequence[int]) -> int:
+        return await cls.mark_many(async_session, ids, 'sent_to_eis')
+
+
+class EISExportBatchDAO(BaseDAO):
+    model = EISExportBatch
+
+    @classmethod
+    async def open_batch(
+            cls, async_session: AsyncSession, table_name: str, ids: Sequence[int]
+    ) -> int:
+        query = (
+            insert(cls.model)
+            .values(table_name=table_name, row_ids=list(ids))
+            .returning(cls.model.id)
+        )
+        result = await async_session.execute(query)
+        batch_id = result.scalar_one()
+        await save(async_session)
+        return batch_id
+
+    @classmethod
+    async def get_open(
+            cls, async_session: AsyncSession, table_name: str) -> Sequence[Row]:
+        query = (
+            select(cls.model.id, cls.model.row_ids)
+            .where(cls.model.table_name == table_name)
+            .order_by(cls.model.id)
+        )
+        result = await async_session.execute(query)
+        return result.all()
+
+    @classmethod
+    async def close_batch(cls, async_session: AsyncSession, batch_id: int) -> None:
+        await async_session.execute(delete(cls.model).where(cls.model.id == batch_id))
+        await save(async_session)
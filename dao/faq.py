@@ -1,3 +1,4 @@
+import zlib
 from dao.base import BaseDAO
 from database.models import SIZFAQ, QuestionPriority
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,12 +9,31 @@ class FaqDAO(BaseDAO):
     model = SIZFAQ
 
     @classmethod
-    async def find_all_sort_by_priority(cls, async_session: AsyncSession):
+    async def find_page_sort_by_priority(
+            cls,
+            async_session: AsyncSession,
+            limit: int,
+            after: int | None = None,
+            before: int | None = None
+    ):
         query = (
             select(cls.model)
             .join(QuestionPriority, cls.model.priority_id == QuestionPriority.id)
             .where(cls.model.is_active)
-            .order_by(QuestionPriority.order_value)
         )
-        result = await async_session.execute(query)
-        return result.scalars().all()
+        return await cls.find_page(
+            async_session, limit, after, before,
+            query=query,
+            order_by=(QuestionPriority.order_value, cls.model.id)
+        )
+
+    @classmethod
+    async def get_version(cls, async_session: AsyncSession) -> tuple:
+        """Also moves when a priority's order_value, which orders the pages, changes."""
+        version = await super().get_version(async_session)
+        query = select(
+            QuestionPriority.id, QuestionPriority.order_value
+        ).order_by(QuestionPriority.id)
+        priorities = (await async_session.execute(query)).all()
+        checksum = zlib.crc32(repr([tuple(row) for row in priorities]).encode())
+        return version + (checksum,)
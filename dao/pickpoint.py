@@ -1,4 +1,5 @@
 from dao.base import BaseDAO
+from dao.eis import EISExportDAO
 from database.models import PickPoint, PickPointRating
 
 
@@ -6,5 +7,5 @@ class PickPointDAO(BaseDAO):
     model = PickPoint
 
 
-class PickPointRatingDAO(BaseDAO):
+class PickPointRatingDAO(EISExportDAO):
     model = PickPointRating
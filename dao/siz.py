@@ -1,6 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, func
 from dao.base import BaseDAO
+from dao.eis import EISExportDAO
+from database.uow import save
 from database.models import SIZType, SIZModel, SIZModelReview
 
 
@@ -8,16 +10,47 @@ class SIZTypeDAO(BaseDAO):
     model = SIZType
 
     @classmethod
-    async def get_filled_types(cls, session: AsyncSession):
+    async def get_filled_types_page(
+            cls,
+            session: AsyncSession,
+            limit: int,
+            after: int | None = None,
+            before: int | None = None
+    ):
         subq = select(SIZModel.__table__.c.type_id).where(SIZModel.__table__.c.is_active).distinct().subquery()
         query = select(cls.model).join(subq, cls.model.id == subq.c.type_id).where(cls.model.is_active)
-        result = await session.execute(query)
-        return result.scalars().all()
+        return await cls.find_page(session, limit, after, before, query=query)
 
 
 class SIZModelDAO(BaseDAO):
     model = SIZModel
 
+    @classmethod
+    async def get_files(cls, session: AsyncSession):
+        query = (
+            select(
+                cls.model.file_name,
+                func.max(cls.model.file_id),
+                func.max(cls.model.file_hash)
+            )
+            .where(cls.model.file_name != None)
+            .group_by(cls.model.file_name)
+        )
+        result = await session.execute(query)
+        return result.all()
+
+    @classmethod
+    async def set_file_id(
+            cls, session: AsyncSession, file_name: str, file_id: str, file_hash: str
+    ) -> None:
+        query = (
+            update(cls.model)
+            .where(cls.model.file_name == file_name)
+            .values(file_id=file_id, file_hash=file_hash)
+        )
+        await session.execute(query)
+        await save(session)
+
 
-class SIZReviewDAO(BaseDAO):
+class SIZReviewDAO(EISExportDAO):
     model = SIZModelReview
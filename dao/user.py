@@ -1,14 +1,46 @@
 from dao.base import BaseDAO
 from database.models import SIZUser
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+import datetime as dt
+from sqlalchemy import select, update, func, Select
+from database.uow import save
 
 
 class UserDAO(BaseDAO):
     model = SIZUser
 
+    @classmethod
+    def bot_users_query(cls, *columns) -> Select:
+        return (
+            select(*(columns or (cls.model,)))
+            .where(cls.model.tg_id != None)
+            .where(cls.model.is_active)
+            .where(cls.model.unreachable_since == None)
+        )
+
     @classmethod
     async def get_all_bot_users(cls, session: AsyncSession):
-        query = select(SIZUser).where(SIZUser.tg_id != None).where(SIZUser.is_active)
-        result = await session.execute(query)
+        result = await session.execute(cls.bot_users_query())
         return result.scalars().all()
+
+    @classmethod
+    async def get_tg_ids(cls, session: AsyncSession, user_ids: set[int]) -> list[int]:
+        query = (
+            select(cls.model.tg_id)
+            .where(cls.model.id.in_(user_ids))
+            .where(cls.model.tg_id != None)
+        )
+        result = await session.execute(query)
+        return list(result.scalars().all())
+
+    @classmethod
+    async def mark_unreachable(cls, session: AsyncSession, tg_ids: set[int]) -> None:
+        query = (
+            update(cls.model)
+            .where(cls.model.tg_id.in_(tg_ids))
+            .values(unreachable_since=func.coalesce(
+                cls.model.unreachable_since, dt.datetime.now()
+            ))
+        )
+        await session.execute(query)
+        await save(session)
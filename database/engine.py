@@ -0,0 +1,80 @@
+import logging
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from config.base import DatabaseConfig
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Time spent waiting for a pooled connection, not time spent in the database."""
+
+    def __init__(self, slow_checkout: float = 0.5):
+        self.slow_checkout = slow_checkout
+        self.checkouts = 0
+        self.slow_checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def observe(self, wait: float) -> None:
+        self.checkouts += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        if wait >= self.slow_checkout:
+            self.slow_checkouts += 1
+            logger.warning('Waited %.3f s for a database connection', wait)
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        self.metrics.observe(time.perf_counter() - started)
+        return connection
+
+
+def create_engine(config: DatabaseConfig) -> AsyncEngine:
+    connect_args = {}
+    if config.driver == 'asyncpg':
+        connect_args['prepared_statement_cache_size'] = config.statement_cache_size
+    return create_async_engine(
+        url=config.url,
+        echo=config.echo,
+        poolclass=MeteredQueuePool,
+        pool_size=config.pool_size,
+        max_overflow=config.max_overflow,
+        pool_timeout=config.pool_timeout,
+        pool_recycle=config.pool_recycle,
+        pool_pre_ping=config.pool_pre_ping,
+        connect_args=connect_args
+    )
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, int | float]:
+    pool = engine.sync_engine.pool
+    metrics = MeteredQueuePool.metrics
+    return {
+        'size': pool.size(),
+        'checked_out': pool.checkedout(),
+        'overflow': max(pool.overflow(), 0),
+        'idle': pool.checkedin(),
+        'checkouts': metrics.checkouts,
+        'slow_checkouts': metrics.slow_checkouts,
+        'timeouts': metrics.timeouts,
+        'wait_avg_ms': (
+            round(metrics.wait_total / metrics.checkouts * 1000, 2)
+            if metrics.checkouts else 0.0
+        ),
+        'wait_max_ms': round(metrics.wait_max * 1000, 2)
+    }
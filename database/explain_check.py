@@ -0,0 +1,108 @@
+"""EXPLAIN check for the DAO lookups that run against hot tables.
+
+Every check calls a read-only DAO method, captures the SQL it sends and
+runs ``EXPLAIN (FORMAT JSON)`` on it with the same parameters. Sequential
+scans are disabled for the EXPLAIN, because a development database is too
+small for the planner to prefer an index on its own: a Seq Scan that remains
+on a hot table means no index can serve the predicate.
+
+Run it against a migrated database (``alembic upgrade head``)::
+
+    python -m database.explain_check
+
+The exit code is 1 if any check fails. Queries that deliberately read a whole
+table (catalog versions, the broadcast audience) are not listed here.
+"""
+import asyncio
+import json
+import sys
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from config import load_db_config
+from dao.admin import AdminDAO, NoticeDeliveryDAO
+from dao.faq import FaqDAO
+from dao.pickpoint import PickPointDAO, PickPointRatingDAO
+from dao.siz import SIZModelDAO, SIZReviewDAO, SIZTypeDAO
+from dao.user import UserDAO
+
+HOT_TABLES = {
+    'siz_user', 'siz_model', 'siz_type', 'pickpoint', 'siz_faq', 'admin_notice',
+    'notice_delivery', 'sizmodel_review', 'pickpoint_rating'
+}
+
+
+async def _first_batch(session: AsyncSession, dao) -> None:
+    async for _ in dao.stream_unsent(session, 0, 1000, 1000):
+        break
+
+
+CHECKS: list[tuple[str, Callable[[AsyncSession], Awaitable[Any]]]] = [
+    ('UserDAO.find_one_or_none(tg_id)',
+     lambda s: UserDAO.find_one_or_none(s, tg_id=1, is_active=True)),
+    ('UserDAO.find_one_or_none(phone_number)',
+     lambda s: UserDAO.find_one_or_none(s, phone_number='0')),
+    ('UserDAO.get_tg_ids', lambda s: UserDAO.get_tg_ids(s, {1})),
+    ('AdminDAO.get_new_notifications', AdminDAO.get_new_notifications),
+    ('NoticeDeliveryDAO.has_recipients',
+     lambda s: NoticeDeliveryDAO.has_recipients(s, 1)),
+    ('NoticeDeliveryDAO.get_due', lambda s: NoticeDeliveryDAO.get_due(s, 1, 500)),
+    ('NoticeDeliveryDAO.count_unfinished',
+     lambda s: NoticeDeliveryDAO.count_unfinished(s, 1)),
+    ('SIZModelDAO.find_page(type_id)',
+     lambda s: SIZModelDAO.find_page(s, 10, after=1, type_id=1, is_active=True)),
+    ('SIZTypeDAO.get_filled_types_page',
+     lambda s: SIZTypeDAO.get_filled_types_page(s, 10, after=1)),
+    ('PickPointDAO.find_page',
+     lambda s: PickPointDAO.find_page(s, 10, before=1, is_active=True)),
+    ('FaqDAO.find_page_sort_by_priority',
+     lambda s: FaqDAO.find_page_sort_by_priority(s, 10, after=1)),
+    ('SIZReviewDAO.stream_unsent', lambda s: _first_batch(s, SIZReviewDAO)),
+    ('PickPointRatingDAO.stream_unsent', lambda s: _first_batch(s, PickPointRatingDAO)),
+]
+
+
+def _seq_scans(plan: dict) -> list[str]:
+    found = []
+    if plan.get('Node Type') == 'Seq Scan' and plan.get('Relation Name') in HOT_TABLES:
+        found.append(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+async def main() -> int:
+    engine = create_async_engine(load_db_config().url)
+    captured: list[tuple[str, Any]] = []
+
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith('EXPLAIN'):
+            captured.append((statement, parameters))
+
+    failed = 0
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql('SET enable_seqscan = off')
+        for name, check in CHECKS:
+            captured.clear()
+            async with AsyncSession(bind=engine) as session:
+                await check(session)
+            for statement, parameters in captured:
+                result = await conn.exec_driver_sql(
+                    f'EXPLAIN (FORMAT JSON) {statement}', parameters
+                )
+                plan = result.scalar_one()
+                plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]['Plan']
+                if scans := _seq_scans(plan):
+                    failed += 1
+                    print(f'FAIL {name}: Seq Scan on {", ".join(scans)}')
+                else:
+                    print(f'OK   {name}')
+    await engine.dispose()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
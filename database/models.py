@@ -1,6 +1,8 @@
 import datetime
+from enum import StrEnum
 from typing import List, Optional
-from sqlalchemy import ForeignKey, Identity, text
+from sqlalchemy import DDL, ForeignKey, Identity, Index, UniqueConstraint, event, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.types import BigInteger, String, SmallInteger, Integer, DateTime, Boolean, Text
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
@@ -12,6 +14,9 @@ class Base(AsyncAttrs, DeclarativeBase):
 
 class PickPoint(Base):
     __tablename__ = 'pickpoint'
+    __table_args__ = (
+        Index('ix_pickpoint_name_id', 'name', 'id'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(255))
@@ -23,6 +28,9 @@ class PickPoint(Base):
 
 class SIZType(Base):
     __tablename__ = 'siz_type'
+    __table_args__ = (
+        Index('ix_siz_type_name_id', 'name', 'id'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(255))
@@ -34,6 +42,9 @@ class SIZType(Base):
 
 class SIZUser(Base):
     __tablename__ = 'siz_user'
+    __table_args__ = (
+        Index('ix_siz_user_tg_id', 'tg_id', postgresql_where=text('tg_id IS NOT NULL')),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     tg_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
@@ -41,6 +52,9 @@ class SIZUser(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     last_modified_at: Mapped[datetime.datetime] = mapped_column(DateTime)
     registered_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime, nullable=True)
+    unreachable_since: Mapped[Optional[datetime.datetime]] = mapped_column(
+        DateTime, nullable=True
+    )
 
     reviews: Mapped[List['SIZModelReview']] = relationship()
     ratings: Mapped[List['PickPointRating']] = relationship()
@@ -58,6 +72,12 @@ class QuestionPriority(Base):
 
 class SIZFAQ(Base):
     __tablename__ = 'siz_faq'
+    __table_args__ = (
+        Index(
+            'ix_siz_faq_active_priority_id', 'priority_id',
+            postgresql_where=text('is_active')
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     priority_id: Mapped[int] = mapped_column(
@@ -72,6 +92,10 @@ class SIZFAQ(Base):
 
 class SIZModel(Base):
     __tablename__ = 'siz_model'
+    __table_args__ = (
+        Index('ix_siz_model_type_id_is_active', 'type_id', 'is_active'),
+        Index('ix_siz_model_type_id_name_id', 'type_id', 'name', 'id'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     type_id: Mapped[int] = mapped_column(
@@ -85,6 +109,7 @@ class SIZModel(Base):
     operating_rules: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     file_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     file_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    file_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     last_modified_at: Mapped[datetime.datetime] = mapped_column(DateTime)
 
@@ -93,6 +118,12 @@ class SIZModel(Base):
 
 class PickPointRating(Base):
     __tablename__ = 'pickpoint_rating'
+    __table_args__ = (
+        Index(
+            'ix_pickpoint_rating_unsent', 'id',
+            postgresql_where=text('sent_to_eis IS NULL')
+        ),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, Identity(always=True), primary_key=True)
     pickpoint_id: Mapped[int] = mapped_column(
@@ -111,6 +142,12 @@ class PickPointRating(Base):
 
 class SIZModelReview(Base):
     __tablename__ = 'sizmodel_review'
+    __table_args__ = (
+        Index(
+            'ix_sizmodel_review_unsent', 'id',
+            postgresql_where=text('sent_to_eis IS NULL')
+        ),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, Identity(always=True), primary_key=True)
     model_id: Mapped[int] = mapped_column(
@@ -126,11 +163,77 @@ class SIZModelReview(Base):
     sent_to_eis: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime, nullable=True)
 
 
+class EISExportBatch(Base):
+    """A batch handed to the EIS sink but not yet marked; its id is the batch key."""
+    __tablename__ = 'eis_export_batch'
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(always=True), primary_key=True)
+    table_name: Mapped[str] = mapped_column(String(64), index=True)
+    row_ids: Mapped[List[int]] = mapped_column(ARRAY(BigInteger))
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime, server_default=text('NOW()')
+    )
+
+
 class AdminNotice(Base):
     __tablename__ = 'admin_notice'
+    __table_args__ = (
+        Index(
+            'ix_admin_notice_undelivered', 'id',
+            postgresql_where=text('delivered_at IS NULL')
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     notice_text: Mapped[str] = mapped_column(Text)
     created_at: Mapped[datetime.datetime] = mapped_column(DateTime)
     sent_from_eis: Mapped[datetime.datetime] = mapped_column(DateTime)
     delivered_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime, nullable=True)
+
+
+NOTICE_CHANNEL = 'admin_notice'
+
+event.listen(AdminNotice.__table__, 'after_create', DDL(f'''
+CREATE OR REPLACE FUNCTION notify_admin_notice() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('{NOTICE_CHANNEL}', NEW.id::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+'''))
+event.listen(AdminNotice.__table__, 'after_create', DDL(
+    'CREATE TRIGGER admin_notice_notify AFTER INSERT ON admin_notice '
+    'FOR EACH ROW EXECUTE FUNCTION notify_admin_notice()'
+))
+
+
+class DeliveryStatus(StrEnum):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    DEAD = 'dead'
+    UNREACHABLE = 'unreachable'
+
+
+class NoticeDelivery(Base):
+    __tablename__ = 'notice_delivery'
+    __table_args__ = (UniqueConstraint('notice_id', 'user_id'),)
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(always=True), primary_key=True)
+    notice_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey(column='admin_notice.id', ondelete='CASCADE')
+    )
+    user_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey(column='siz_user.id', ondelete='CASCADE')
+    )
+    status: Mapped[str] = mapped_column(String(16), default=DeliveryStatus.PENDING)
+    attempts: Mapped[int] = mapped_column(SmallInteger, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    next_attempt_at: Mapped[Optional[datetime.datetime]] = mapped_column(
+        DateTime, nullable=True
+    )
+    sent_at: Mapped[Optional[datetime.datetime]] = mapped_column(
+        DateTime, nullable=True
+    )
@@ -0,0 +1,50 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+_UNIT_OF_WORK = 'unit_of_work'
+_AFTER_COMMIT = 'after_commit'
+
+
+def begin_unit_of_work(session: AsyncSession) -> None:
+    """Makes DAO writes on ``session`` flush only; the owner calls checkpoint()."""
+    session.info[_UNIT_OF_WORK] = True
+
+
+async def save(session: AsyncSession) -> None:
+    if session.info.get(_UNIT_OF_WORK):
+        await session.flush()
+    else:
+        await session.commit()
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    if session.info.get(_UNIT_OF_WORK):
+        session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+    else:
+        callback()
+
+
+async def checkpoint(session: AsyncSession) -> None:
+    await session.commit()
+    for callback in session.info.pop(_AFTER_COMMIT, []):
+        callback()
+
+
+async def rollback(session: AsyncSession) -> None:
+    session.info.pop(_AFTER_COMMIT, None)
+    await session.rollback()
+
+
+@asynccontextmanager
+async def unit_of_work(
+        session_maker: async_sessionmaker) -> AsyncIterator[AsyncSession]:
+    async with session_maker() as session:
+        begin_unit_of_work(session)
+        try:
+            yield session
+        except BaseException:
+            await rollback(session)
+            raise
+        await checkpoint(session)
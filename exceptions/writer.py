@@ -0,0 +1,2 @@
+class RowNotSaved(Exception):
+    pass
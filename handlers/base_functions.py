@@ -2,7 +2,7 @@ from aiogram.types import Message, ReplyKeyboardRemove
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from presentation.keyboards.reply import initial_kb, authorization_kb, return_kb
-from services.utils import terminate_state_branch
+from services.utils import terminate_state_branch, schedule_messages_deletion
 from presentation.responses import message_response
 from services.base import BaseService
 from states.auth import AuthState
@@ -45,6 +45,16 @@ async def response_back(
     )
 
 
+async def close_confirmation(message: Message, state: FSMContext):
+    """Deletes the user's answer and the yes/no prompt; neither is on the nav stack."""
+    data = await state.get_data()
+    ids = [
+        msg_id for msg_id in (data.get('answer_id'), data.get('confirm_id')) if msg_id
+    ]
+    schedule_messages_deletion(message.bot, message.chat.id, ids)
+    await state.update_data(answer_id=None, confirm_id=None)
+
+
 async def handle_exception(message: Message, state: FSMContext):
     await message_response(
         message=message,
@@ -7,7 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from presentation.faq_views import answer_view
 from presentation.keyboards.inline import show_questions
 from states.faq import QuestionState
-from presentation.responses import message_response
+from states.callbacks import PageCallbackFactory
+from presentation.responses import message_response, edit_response
 from services.faq import FAQService
 from handlers.base_functions import navigate_to_auth, response_back, handle_exception
 from exceptions.questions import NoQuestionsExist, QuestionNotFound
@@ -22,12 +23,12 @@ async def process_show_questions(message: Message, state: FSMContext, session: A
         await navigate_to_auth(message, state)
     else:
         try:
-            questions = await FAQService.get_questions(session)
+            page = await FAQService.get_questions_page(session, state)
             await state.set_state(QuestionState.get_question)
             await message_response(
                 message=message,
                 text='Выберите интересующий вопрос из списка:',
-                reply_markup=show_questions(questions),
+                reply_markup=show_questions(page),
                 state=state
             )
             await response_back(
@@ -47,6 +48,31 @@ async def process_show_questions(message: Message, state: FSMContext, session: A
             )
 
 
+@router.callback_query(
+    StateFilter(QuestionState.get_question),
+    PageCallbackFactory.filter(F.catalog == 'questions')
+)
+async def process_switch_page(
+        callback: CallbackQuery,
+        callback_data: PageCallbackFactory,
+        state: FSMContext,
+        session: AsyncSession
+):
+    try:
+        await FAQService.remember_variables_in_state(
+            state, questions_page=[callback_data.after, callback_data.before]
+        )
+        page = await FAQService.get_questions_page(session, state)
+        await edit_response(
+            callback.message, 'Выберите интересующий вопрос из списка:',
+            show_questions(page), state
+        )
+    except NoQuestionsExist:
+        await handle_exception(callback.message, state)
+    finally:
+        await callback.answer()
+
+
 @router.callback_query(StateFilter(QuestionState.get_question), F.data.startswith('question'))
 async def process_show_answer(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
     try:
@@ -1,17 +1,22 @@
 from aiogram import Router, F
 from aiogram.fsm.state import default_state
-from aiogram.types import Message, CallbackQuery
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 import emoji
-from presentation.keyboards.inline import show_pickpoints, show_potential_score, show_yes_or_no
-from presentation.keyboards.reply import return_kb
+from presentation.keyboards.inline import (show_pickpoints, show_potential_score,
+                                          show_yes_or_no, back_kb)
 from presentation.pickpoint_views import score_comment_view, set_score_view
 from states.pickpoint import PickPointState
-from presentation.responses import message_response, callback_response
+from states.callbacks import PageCallbackFactory
+from presentation.responses import message_response, callback_response, edit_response
 from services.pickpoint import PickPointService
-from handlers.base_functions import return_to_main_menu, navigate_to_auth, response_back, handle_exception
+from services.utils import (push_screen, get_screen, pop_screen,
+                            schedule_messages_deletion)
+from handlers.base_functions import (return_to_main_menu, navigate_to_auth,
+                                     response_back, handle_exception,
+                                     close_confirmation)
 from exceptions.cache import CacheError
 from exceptions.pickpoints import RatingRecordSaveError, PickPointsNotFound
 from exceptions.user import UserNotExist
@@ -19,19 +24,39 @@ from exceptions.user import UserNotExist
 router = Router()
 
 
+async def pickpoints_screen(
+        session: AsyncSession, state: FSMContext) -> tuple[str, InlineKeyboardMarkup]:
+    page = await PickPointService.list_pickpoints_page(session, state)
+    return 'Выберите пункт выдачи для оценки:', show_pickpoints(page)
+
+
+async def score_screen(
+        session: AsyncSession, state: FSMContext) -> tuple[str, InlineKeyboardMarkup]:
+    pp_id = await PickPointService.get_variable_from_state(state, 'pickpoint_id')
+    pp_name = await PickPointService.get_pickpoint_name(session, state, pp_id)
+    return set_score_view(pp_name), show_potential_score()
+
+
+SCREENS = {
+    'pickpoints': pickpoints_screen,
+    'score': score_screen
+}
+
+
 @router.message(StateFilter(default_state), F.text.endswith('Оценить работу пункта выдачи'))
 async def process_show_pickpoints(message: Message, state: FSMContext, session: AsyncSession):
     if not await PickPointService.is_authorized_user(session, message.from_user.id):
         await navigate_to_auth(message, state)
     else:
         try:
-            pickpoints = await PickPointService.list_all_pickpoints(session)
+            text, reply_markup = await pickpoints_screen(session, state)
             await PickPointService.cache_user(session, state, message.from_user.id)
-            await message_response(
+            menu = await message_response(
                 message=message,
-                text='Выберите пункт выдачи для оценки:',
-                reply_markup=show_pickpoints(pickpoints),
-                state=state
+                text=text,
+                reply_markup=reply_markup,
+                state=state,
+                return_msg=True
             )
             await response_back(
                 message=message,
@@ -40,8 +65,10 @@ async def process_show_pickpoints(message: Message, state: FSMContext, session:
                 delete_after=True,
                 main_only=True
             )
-            await PickPointService.remember_variables_in_state(state, pickpoints=pickpoints)
-            await state.set_state(PickPointState.get_pickpoint)
+            await push_screen(
+                state, 'pickpoints', PickPointState.get_pickpoint, menu.message_id,
+                root=True
+            )
         except PickPointsNotFound:
             await message_response(
                 message=message,
@@ -61,107 +88,89 @@ async def process_show_pickpoints(message: Message, state: FSMContext, session:
 
 
 @router.callback_query(StateFilter(PickPointState.get_pickpoint), F.data.startswith('pickpoint'))
-async def process_choice_pickpoint(callback: CallbackQuery, state: FSMContext):
+async def process_choice_pickpoint(
+        callback: CallbackQuery, state: FSMContext, session: AsyncSession):
     try:
-        pp_id = int(callback.data.split(':')[-1])
-        pp_name = await PickPointService.get_item_name(state, pp_id, 'pickpoints')
-        await message_response(
-            message=callback.message,
-            text=set_score_view(pp_name),
-            reply_markup=show_potential_score(),
-            state=state,
-            num_of_msgs_to_delete=1
-        )
-        await response_back(
-            message=callback.message,
-            state=state,
-            msg_text='Для возврата к списку пунктов выдачи нажмите на кнопку <b>Назад</b>',
-            delete_after=True,
-            main_only=False
+        await PickPointService.remember_variables_in_state(
+            state, pickpoint_id=int(callback.data.split(':')[-1])
         )
-        await PickPointService.remember_variables_in_state(state, pickpoint_id=pp_id)
-        await state.set_state(PickPointState.set_score)
-    except CacheError:
+        text, reply_markup = await score_screen(session, state)
+        menu = await edit_response(callback.message, text, reply_markup, state)
+        await push_screen(state, 'score', PickPointState.set_score, menu.message_id)
+    except (PickPointsNotFound, CacheError):
         await handle_exception(callback.message, state)
     finally:
         await callback.answer()
 
 
-@router.message(StateFilter(PickPointState.set_score), F.text.endswith('Назад'))
-async def process_return_to_pickpoints(message: Message, state: FSMContext):
+@router.callback_query(
+    StateFilter(PickPointState.get_pickpoint),
+    PageCallbackFactory.filter(F.catalog == 'pickpoints')
+)
+async def process_switch_page(
+        callback: CallbackQuery,
+        callback_data: PageCallbackFactory,
+        state: FSMContext,
+        session: AsyncSession
+):
     try:
-        pickpoints = await PickPointService.get_variable_from_state(state, 'pickpoints')
-        await message_response(
-            message=message,
-            text='Выберите пункт выдачи для оценки:',
-            reply_markup=show_pickpoints(pickpoints),
-            state=state,
-            num_of_msgs_to_delete=3
-        )
-        await response_back(
-            message=message,
-            state=state,
-            msg_text='Для возврата в главное меню нажмите на кнопку <b>Вернуться в главное меню</b>',
-            delete_after=True,
-            main_only=True
-        )
-        await state.set_state(PickPointState.get_pickpoint)
-    except CacheError:
-        await handle_exception(message, state)
+        screen = await get_screen(state, callback.message.message_id)
+        if screen and screen[0] == callback_data.catalog:
+            await PickPointService.remember_variables_in_state(
+                state, pickpoints_page=[callback_data.after, callback_data.before]
+            )
+            text, reply_markup = await pickpoints_screen(session, state)
+            await edit_response(callback.message, text, reply_markup, state)
+    except (PickPointsNotFound, CacheError):
+        await handle_exception(callback.message, state)
+    finally:
+        await callback.answer()
+
+
+@router.callback_query(StateFilter(PickPointState), F.data == 'back')
+async def process_navigate_back(
+        callback: CallbackQuery, state: FSMContext, session: AsyncSession):
+    try:
+        if await state.get_state() == PickPointState.get_confirm:
+            await close_confirmation(callback.message, state)
+        screen, closed_ids = await pop_screen(state, callback.message.message_id)
+        schedule_messages_deletion(callback.bot, callback.message.chat.id, closed_ids)
+        if screen and screen[2] == callback.message.message_id:
+            text, reply_markup = await SCREENS[screen[0]](session, state)
+            await edit_response(callback.message, text, reply_markup, state)
+    except (PickPointsNotFound, CacheError):
+        await handle_exception(callback.message, state)
+    finally:
+        await callback.answer()
 
 
 @router.callback_query(StateFilter(PickPointState.set_score), F.data.in_({'1', '2', '3', '4', '5'}))
 async def process_set_score(callback: CallbackQuery, state: FSMContext):
     score = int(callback.data)
-    await message_response(
-        message=callback.message,
-        text=score_comment_view(score),
-        reply_markup=return_kb(main_only=False),
-        state=state,
-        num_of_msgs_to_delete=1,
-        delete_after=True
+    menu = await edit_response(
+        callback.message, score_comment_view(score), back_kb(), state
     )
     await PickPointService.remember_variables_in_state(state, score=score)
-    await state.set_state(PickPointState.set_comment)
+    await push_screen(state, 'comment', PickPointState.set_comment, menu.message_id)
     await callback.answer()
 
 
-@router.message(StateFilter(PickPointState.set_comment), F.text.endswith('Назад'))
-async def process_return_to_set_score(message: Message, state: FSMContext):
-    try:
-        pp_id = await PickPointService.get_variable_from_state(state, 'pickpoint_id')
-        pp_name = await PickPointService.get_item_name(state, pp_id, 'pickpoints')
-        await message_response(
-            message=message,
-            text=set_score_view(pp_name),
-            reply_markup=show_potential_score(),
-            state=state,
-            num_of_msgs_to_delete=4
-        )
-        await response_back(
-            message=message,
-            state=state,
-            msg_text='Для возврата к выбору пункта выдачи нажмите на кнопку <b>Назад</b>',
-            delete_after=True,
-            main_only=False
-        )
-        await state.set_state(PickPointState.set_score)
-    except CacheError:
-        await handle_exception(message, state)
-
-
 @router.message(StateFilter(PickPointState.set_comment), F.text,
                 ~F.text.endswith('Назад'), ~F.text.endswith('Вернуться в главное меню'))
 async def process_set_comment(message: Message, state: FSMContext):
-    await message_response(
+    prompt = await message_response(
         message=message,
         text='Сохранить отзыв?',
         reply_markup=show_yes_or_no(),
         state=state,
-        add_to_track=True
+        add_to_track=True,
+        return_msg=True
     )
     await PickPointService.remember_variables_in_state(
-        state, comment=emoji.replace_emoji(message.text.strip(), replace='')
+        state,
+        comment=emoji.replace_emoji(message.text.strip(), replace=''),
+        answer_id=message.message_id,
+        confirm_id=prompt.message_id
     )
     await state.set_state(PickPointState.get_confirm)
 
@@ -184,13 +193,10 @@ async def process_save_rating(callback: CallbackQuery, state: FSMContext, sessio
 @router.callback_query(StateFilter(PickPointState.get_confirm), F.data == 'no')
 async def process_return_to_set_comment(callback: CallbackQuery, state: FSMContext):
     try:
-        score = await PickPointService.get_variable_from_state(state, 'score')
-        await message_response(
-            message=callback.message,
-            text=score_comment_view(score),
-            reply_markup=return_kb(main_only=False),
-            state=state,
-            num_of_msgs_to_delete=4
+        answer_id = await PickPointService.get_variable_from_state(state, 'answer_id')
+        schedule_messages_deletion(
+            callback.bot, callback.message.chat.id,
+            [answer_id, callback.message.message_id]
         )
         await state.set_state(PickPointState.set_comment)
     except CacheError:
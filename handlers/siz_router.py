@@ -1,26 +1,64 @@
+import logging
+from contextlib import suppress
 from aiogram import Router, F
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.fsm.state import default_state
-from aiogram.types import Message, CallbackQuery, FSInputFile, ReplyKeyboardRemove
+from aiogram.types import (Message, CallbackQuery, InlineKeyboardMarkup,
+                           ReplyKeyboardRemove)
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 import emoji
 from sqlalchemy.ext.asyncio import AsyncSession
-from presentation.keyboards.inline import show_siz_types, show_siz_models, show_yes_or_no
-from presentation.keyboards.reply import return_kb
+from presentation.keyboards.inline import (show_siz_types, show_siz_models,
+                                          show_yes_or_no, show_model_tabs, back_kb)
+from presentation.siz_views import (
+    MODEL_SECTIONS,
+    TEXT_LIMIT,
+    model_card_view,
+    model_tabs,
+)
 from states.siz import SIZInfoState, SIZReviewState
-from presentation.responses import message_response, callback_response
+from states.callbacks import ModelTabCallbackFactory, PageCallbackFactory
+from presentation.responses import message_response, callback_response, edit_response
 from services.siz import SIZService
 from services.models import SModel
-from services.utils import add_message_to_track, erase_last_messages
-from handlers.base_functions import return_to_main_menu, navigate_to_auth, response_back, handle_exception
+from services.utils import (add_message_to_track, schedule_messages_deletion,
+                            push_screen, get_screen, pop_screen)
+from handlers.base_functions import (return_to_main_menu, navigate_to_auth,
+                                     response_back, handle_exception,
+                                     close_confirmation)
 from exceptions.user import UserNotExist
 from exceptions.cache import CacheError
 from exceptions.siz import NoTypesFound, NoModelsFound, InvalidModelError, ReviewSaveError
 
 
+logger = logging.getLogger(__name__)
+
 router = Router()
 
 
+async def types_screen(
+        session: AsyncSession, state: FSMContext) -> tuple[str, InlineKeyboardMarkup]:
+    page = await SIZService.list_types_page(session, state)
+    return 'Выберите интересующий тип СИЗ из списка:', show_siz_types(page)
+
+
+async def models_screen(
+        session: AsyncSession, state: FSMContext) -> tuple[str, InlineKeyboardMarkup]:
+    type_id = await SIZService.get_variable_from_state(state, 'type_id')
+    type_name = await SIZService.get_type_name(session, state, type_id)
+    page = await SIZService.list_models_page(session, state, type_id)
+    return (f'Вы выбрали тип СИЗ:\n<strong>{type_name}</strong>\n'
+            'Выберите интересующую модель СИЗ из списка:',
+            show_siz_models(page))
+
+
+SCREENS = {
+    'types': types_screen,
+    'models': models_screen
+}
+
+
 @router.message(
     StateFilter(default_state), F.text.endswith('Информация о СИЗ') | F.text.endswith('Оставить отзыв о СИЗ'))
 async def process_listing_types(message: Message, state: FSMContext, session: AsyncSession):
@@ -28,14 +66,15 @@ async def process_listing_types(message: Message, state: FSMContext, session: As
         await navigate_to_auth(message, state)
     else:
         try:
-            siz_types = await SIZService.list_all_types(session)
+            text, reply_markup = await types_screen(session, state)
             await SIZService.cache_user(session, state, message.from_user.id)
             new_state = SIZInfoState.get_type if message.text.endswith('Информация о СИЗ') else SIZReviewState.get_type
-            await message_response(
+            menu = await message_response(
                 message=message,
-                text='Выберите интересующий тип СИЗ из списка:',
-                reply_markup=show_siz_types(siz_types),
-                state=state
+                text=text,
+                reply_markup=reply_markup,
+                state=state,
+                return_msg=True
             )
             await response_back(
                 message=message,
@@ -44,8 +83,7 @@ async def process_listing_types(message: Message, state: FSMContext, session: As
                 delete_after=True,
                 main_only=True
             )
-            await SIZService.remember_variables_in_state(state, types=siz_types)
-            await state.set_state(new_state)
+            await push_screen(state, 'types', new_state, menu.message_id, root=True)
         except NoTypesFound:
             await message_response(
                 message=message,
@@ -69,25 +107,13 @@ async def process_listing_types(message: Message, state: FSMContext, session: As
 async def process_choice_type(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
     try:
         type_id = int(callback.data.split(':')[-1])
-        type_name = await SIZService.get_item_name(state, type_id, 'types')
-        models = await SIZService.list_all_models_by_type(session, type_id)
         new_state = SIZReviewState.get_model if await state.get_state() == SIZReviewState.get_type else SIZInfoState.get_model
-        await message_response(
-            message=callback.message,
-            text=f'Вы выбрали тип СИЗ:\n<strong>{type_name}</strong>\nВыберите интересующую модель СИЗ из списка:',
-            reply_markup=show_siz_models(models),
-            state=state,
-            num_of_msgs_to_delete=1
-        )
-        await response_back(
-            message=callback.message,
-            state=state,
-            msg_text='Для возврата к списку типов СИЗ нажмите на кнопку <b>Назад</b>',
-            delete_after=True,
-            main_only=False
+        await SIZService.remember_variables_in_state(
+            state, type_id=type_id, models_page=None
         )
-        await SIZService.remember_variables_in_state(state, type_id=type_id, models=models)
-        await state.set_state(new_state)
+        text, reply_markup = await models_screen(session, state)
+        menu = await edit_response(callback.message, text, reply_markup, state)
+        await push_screen(state, 'models', new_state, menu.message_id)
     except NoModelsFound:
         await message_response(
             message=callback.message,
@@ -102,138 +128,142 @@ async def process_choice_type(callback: CallbackQuery, state: FSMContext, sessio
         await callback.answer()
 
 
-@router.message(StateFilter(SIZReviewState.get_model), F.text.endswith('Назад'))
-@router.message(StateFilter(SIZInfoState.get_model), F.text.endswith('Назад'))
-async def process_return_to_types_list(message: Message, state: FSMContext):
+@router.callback_query(StateFilter(SIZInfoState, SIZReviewState), F.data == 'back')
+async def process_navigate_back(
+        callback: CallbackQuery, state: FSMContext, session: AsyncSession):
     try:
-        siz_types = await SIZService.get_variable_from_state(state, 'types')
-        new_state = SIZInfoState.get_type if await state.get_state() == SIZInfoState.get_model else SIZReviewState.get_type
-        await message_response(
-            message=message,
-            text='Выберите интересующий тип СИЗ из списка:',
-            reply_markup=show_siz_types(siz_types),
-            state=state,
-            num_of_msgs_to_delete=3
-        )
-        await response_back(
-            message=message,
-            state=state,
-            msg_text='Для возврата в главное меню нажмите на кнопку <b>Вернуться в главное меню</b>',
-            delete_after=True,
-            main_only=True
-        )
-        await state.set_state(new_state)
-    except CacheError:
-        await handle_exception(message, state)
+        if await state.get_state() == SIZReviewState.confirm_review:
+            await close_confirmation(callback.message, state)
+        screen, closed_ids = await pop_screen(state, callback.message.message_id)
+        schedule_messages_deletion(callback.bot, callback.message.chat.id, closed_ids)
+        if screen and screen[2] == callback.message.message_id:
+            text, reply_markup = await SCREENS[screen[0]](session, state)
+            await edit_response(callback.message, text, reply_markup, state)
+    except (NoTypesFound, NoModelsFound, CacheError):
+        await handle_exception(callback.message, state)
+    finally:
+        await callback.answer()
+
+
+@router.callback_query(
+    StateFilter(SIZInfoState, SIZReviewState),
+    PageCallbackFactory.filter(F.catalog.in_(SCREENS))
+)
+async def process_switch_page(
+        callback: CallbackQuery,
+        callback_data: PageCallbackFactory,
+        state: FSMContext,
+        session: AsyncSession
+):
+    try:
+        screen = await get_screen(state, callback.message.message_id)
+        if screen and screen[0] == callback_data.catalog:
+            cursor = [callback_data.after, callback_data.before]
+            await SIZService.remember_variables_in_state(
+                state, **{f'{callback_data.catalog}_page': cursor}
+            )
+            text, reply_markup = await SCREENS[callback_data.catalog](session, state)
+            await edit_response(callback.message, text, reply_markup, state)
+    except (NoTypesFound, NoModelsFound, CacheError):
+        await handle_exception(callback.message, state)
+    finally:
+        await callback.answer()
 
 
-@router.callback_query(StateFilter(SIZInfoState.get_model), F.data.startswith('model'))
+@router.callback_query(
+    StateFilter(SIZInfoState.get_model, SIZInfoState.show_info),
+    F.data.startswith('model')
+)
 async def process_choice_model(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
     try:
         model = await SIZService.get_model_info(session, int(callback.data.split(':')[-1]))
-        await post_model_photo(
+        await close_model_message(callback, state, 'card')
+        tabs = model_tabs(model)
+        active = tabs[0] if tabs else None
+        msg = await send_model_message(
             callback, state, session, model,
-            caption=f'Вы выбрали модель СИЗ:\n<strong>{model.name}</strong>'
+            caption=model_card_view(model, active),
+            text=model_card_view(model, active, TEXT_LIMIT),
+            reply_markup=show_model_tabs(model.id, tabs, active)
         )
-        if model.protect_props:
-            await message_response(
-                message=callback.message,
-                text=f'<strong>Защитные свойства:</strong>\n<code>{model.protect_props}</code>',
-                state=state
-            )
-        if model.care_procedure:
-            await message_response(
-                message=callback.message,
-                text=f'<strong>Порядок ухода:</strong>\n<code>{model.care_procedure}</code>',
-                state=state
-            )
-        if model.writeoff_criteria:
-            await message_response(
-                message=callback.message,
-                text=f'<strong>Критерии преждевременного списания:</strong>\n<code>{model.writeoff_criteria}</code>',
-                state=state
-            )
-        if model.operating_rules:
-            await message_response(
-                message=callback.message,
-                text=f'<strong>Правила эксплуатации:</strong>\n<code>{model.operating_rules}</code>',
-                state=state
+        await push_screen(state, 'card', SIZInfoState.show_info, msg.message_id)
+    except (InvalidModelError, CacheError):
+        await handle_exception(callback.message, state)
+    finally:
+        await callback.answer()
+
+
+@router.callback_query(
+    StateFilter(SIZInfoState.show_info),
+    ModelTabCallbackFactory.filter(F.tab.in_(MODEL_SECTIONS))
+)
+async def process_switch_model_tab(
+        callback: CallbackQuery,
+        callback_data: ModelTabCallbackFactory,
+        state: FSMContext,
+        session: AsyncSession
+):
+    try:
+        model = await SIZService.get_model_info(session, callback_data.sizmodel_id)
+        reply_markup = show_model_tabs(model.id, model_tabs(model), callback_data.tab)
+        if callback.message.photo:
+            with suppress(TelegramBadRequest):
+                await callback.message.edit_caption(
+                    caption=model_card_view(model, callback_data.tab),
+                    reply_markup=reply_markup
+                )
+        else:
+            await edit_response(
+                callback.message, model_card_view(model, callback_data.tab, TEXT_LIMIT),
+                reply_markup, state
             )
-        await response_back(
-            message=callback.message,
-            state=state,
-            msg_text='Для возврата к списку моделей СИЗ нажмите на кнопку <b>Назад</b>',
-            delete_after=True,
-            main_only=False
-        )
-        await state.set_state(SIZInfoState.show_info)
     except InvalidModelError:
         await handle_exception(callback.message, state)
     finally:
         await callback.answer()
 
 
-@router.callback_query(StateFilter(SIZReviewState.get_model), F.data.startswith('model'))
+@router.callback_query(
+    StateFilter(SIZReviewState.get_model, SIZReviewState.set_review),
+    F.data.startswith('model')
+)
 async def process_set_model(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
     try:
         model = await SIZService.get_model_info(session, int(callback.data.split(':')[-1]))
-        await post_model_photo(
+        await close_model_message(callback, state, 'review')
+        caption = (f'Вы выбрали модель СИЗ:\n<strong>{model.name}</strong>\n\n'
+                   'Напишите, пожалуйста, отзыв на выбранную модель.')
+        msg = await send_model_message(
             callback, state, session, model,
-            caption=f'Вы выбрали модель СИЗ:\n<strong>{model.name}</strong>\n\nНапишите, пожалуйста, отзыв на выбранную модель.'
-        )
-        await response_back(
-            message=callback.message,
-            state=state,
-            msg_text='Для возврата к списку моделей СИЗ нажмите на кнопку <b>Назад</b>',
-            delete_after=True,
-            main_only=False
+            caption=caption,
+            text=caption,
+            reply_markup=back_kb()
         )
         await SIZService.remember_variables_in_state(state, model_id=model.id)
-        await state.set_state(SIZReviewState.set_review)
+        await push_screen(state, 'review', SIZReviewState.set_review, msg.message_id)
     except InvalidModelError:
         await handle_exception(callback.message, state)
     finally:
         await callback.answer()
 
 
-@router.message(StateFilter(SIZReviewState.set_review), F.text.endswith('Назад'))
-@router.message(StateFilter(SIZInfoState.show_info), F.text.endswith('Назад'))
-async def process_return_to_models_list(message: Message, state: FSMContext):
-    try:
-        models = await SIZService.get_variable_from_state(state, 'models')
-        current_state = await state.get_state()
-        new_state = SIZReviewState.get_model if current_state == SIZReviewState.set_review else SIZInfoState.get_model
-        msgs_to_delete = 6 if current_state == SIZInfoState.show_info else 3
-        await message_response(
-            message=message,
-            text=f'Выберите интересующую модель СИЗ из списка:',
-            reply_markup=show_siz_models(models),
-            state=state,
-            num_of_msgs_to_delete=msgs_to_delete
-        )
-        await response_back(
-            message=message,
-            state=state,
-            msg_text='Для возврата к списку типов СИЗ нажмите на кнопку <b>Назад</b>',
-            delete_after=True,
-            main_only=False
-        )
-        await state.set_state(new_state)
-    except CacheError:
-        await handle_exception(message, state)
-
-
 @router.message(StateFilter(SIZReviewState.set_review), F.text,
                 ~F.text.endswith('Назад'), ~F.text.endswith('Вернуться в главное меню'))
 async def process_set_review(message: Message, state: FSMContext):
-    await message_response(
+    prompt = await message_response(
         message=message,
         text='Сохранить отзыв?',
         reply_markup=show_yes_or_no(),
         state=state,
-        add_to_track=True
+        add_to_track=True,
+        return_msg=True
+    )
+    await SIZService.remember_variables_in_state(
+        state,
+        review=emoji.replace_emoji(message.text.strip(), replace=''),
+        answer_id=message.message_id,
+        confirm_id=prompt.message_id
     )
-    await SIZService.remember_variables_in_state(state, review=emoji.replace_emoji(message.text.strip(), replace=''))
     await state.set_state(SIZReviewState.confirm_review)
 
 
@@ -253,25 +283,17 @@ async def process_save_review(callback: CallbackQuery, state: FSMContext, sessio
 
 
 @router.callback_query(StateFilter(SIZReviewState.confirm_review), F.data.startswith('no'))
-async def process_return_to_set_review(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
+async def process_return_to_set_review(callback: CallbackQuery, state: FSMContext):
     try:
-        model_id = await SIZService.get_variable_from_state(state, 'model_id')
-        model = await SIZService.get_model_info(session, model_id)
-        await post_model_photo(
-            callback, state, session, model,
-            caption=f'Вы выбрали модель СИЗ:\n<strong>{model.name}</strong>\n\nНапишите, пожалуйста, отзыв на выбранную модель.',
-            num_of_msgs_to_delete=4
-        )
-        await response_back(
-            message=callback.message,
-            state=state,
-            msg_text='Для возврата к списку моделей СИЗ нажмите на кнопку <b>Назад</b>',
-            delete_after=False,
-            main_only=False
+        answer_id = await SIZService.get_variable_from_state(state, 'answer_id')
+        schedule_messages_deletion(
+            callback.bot, callback.message.chat.id,
+            [answer_id, callback.message.message_id]
         )
         await state.set_state(SIZReviewState.set_review)
-    except (InvalidModelError, CacheError):
+    except CacheError:
         await handle_exception(callback.message, state)
+    finally:
         await callback.answer()
 
 
@@ -281,31 +303,39 @@ async def process_return_to_main_menu(callback: CallbackQuery, state: FSMContext
     await callback.answer()
 
 
-async def post_model_photo(
+async def close_model_message(
+        callback: CallbackQuery, state: FSMContext, screen: str) -> None:
+    current = await get_screen(state)
+    if current and current[0] == screen:
+        schedule_messages_deletion(callback.bot, callback.message.chat.id, [current[2]])
+
+
+async def send_model_message(
         callback: CallbackQuery,
         state: FSMContext,
         session: AsyncSession,
         model: SModel,
         caption: str,
-        num_of_msgs_to_delete: int = 1
-):
+        text: str,
+        reply_markup: InlineKeyboardMarkup
+) -> Message:
     try:
-        photo = model.file_id or FSInputFile(f'static/images/{model.file_name}')
-        msg = await callback.message.answer_photo(
-            photo=photo,
-            caption=caption,
-            reply_markup=return_kb(main_only=False)
+        msg = await SIZService.send_model_photo(
+            session,
+            model,
+            lambda photo: callback.message.answer_photo(
+                photo=photo,
+                caption=caption,
+                reply_markup=reply_markup
+            )
         )
-        if not model.file_id:
-            await SIZService.upload_model_file_id(session, model.id, msg.photo[0].file_id)
-        await erase_last_messages(
-            state, msg_cnt_to_delete=num_of_msgs_to_delete, bot=callback.bot, chat_id=callback.message.chat.id)
-        await add_message_to_track(msg, state)
-    except Exception:
-        await message_response(
-            message=callback.message,
-            text=caption,
-            reply_markup=return_kb(main_only=False),
-            state=state,
-            num_of_msgs_to_delete=num_of_msgs_to_delete
+    except (TelegramBadRequest, OSError) as e:
+        logger.warning(
+            'Sending photo of SIZ model %s failed, sending text: %s', model.id, e
+        )
+        msg = await callback.message.answer(
+            text=text,
+            reply_markup=reply_markup
         )
+    await add_message_to_track(msg, state)
+    return msg
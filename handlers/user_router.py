@@ -3,8 +3,9 @@ from aiogram.fsm.state import default_state
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
-from sqlalchemy.ext.asyncio import AsyncSession
-from services.notification import NotificationService
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from services.notification import (NotificationService, notification_job,
+                                   run_in_background)
 from presentation.keyboards.inline import show_yes_or_no
 from presentation.keyboards.reply import initial_kb, authorization_kb
 from services.utils import terminate_state_branch
@@ -71,16 +72,22 @@ async def process_set_notification_text(message: Message, state: FSMContext):
 
 
 @router.callback_query(StateFilter(NotificationState.get_confirm), F.data == 'yes')
-async def process_send_notification(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
+async def process_send_notification(
+        callback: CallbackQuery,
+        state: FSMContext,
+        session: AsyncSession,
+        session_maker: async_sessionmaker
+):
     data = await state.get_data()
-    await NotificationService.send_mass_notification(
+    run_in_background(NotificationService.run_mass_notification(
         bot=callback.bot,
         text=data['notification_text'],
-        session=session
-    )
+        session_maker=session_maker,
+        chat_id=callback.from_user.id
+    ))
     await callback_response(
         callback=callback,
-        text='Сообщение отправлено',
+        text='Рассылка запущена. По ее окончании придет отчет.',
         show_alert=True
     )
     await return_to_main_menu(callback.message, state, session, callback.from_user.id)
@@ -98,8 +105,13 @@ async def process_cancel_notification(callback: CallbackQuery, state: FSMContext
 
 
 @router.message(StateFilter(default_state), F.text.endswith('Выполнить обработку уведомлений'), F.from_user.id == ADMIN_ID)
-async def process_send_notifications(message: Message, state: FSMContext, session: AsyncSession):
-    await NotificationService.send_mass_admin_notification(message.bot, session)
+async def process_send_notifications(
+        message: Message,
+        state: FSMContext,
+        session: AsyncSession,
+        session_maker: async_sessionmaker
+):
+    run_in_background(notification_job(message.bot, session_maker))
     await return_to_main_menu(message, state, session, message.from_user.id)
 
 
@@ -1,12 +1,17 @@
 import asyncio
 import logging
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums.parse_mode import ParseMode
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from config import load_config, on_startup
-from middlewares import DbSessionMiddleware
+from config.webhook import run_webhook
+from database.engine import create_engine, pool_stats
+from middlewares import (DbSessionMiddleware, UserReachabilityMiddleware,
+                         FSMUnitOfWorkMiddleware, UpdateSession)
 from handlers.command_router import router as command_router
 from handlers.user_router import router as user_router
 from handlers.faq_router import router as faq_router
@@ -14,6 +19,12 @@ from handlers.pickpoint_router import router as pickpoint_router
 from handlers.siz_router import router as siz_router
 from handlers.other_router import router as other_router
 from services.notification import notification_job
+from services.listener import NoticeListener
+from services.leader import LeaderElector
+from services.base import BaseService
+from services.eis import EISExporter, eis_export_job, make_sink
+from services.siz import SIZService, photo_warm_up_job
+from services.images import report
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +40,25 @@ async def main():
 
     config = load_config()
 
-    engine = create_async_engine(url=config.db.url, echo=True)
-    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    engine = create_engine(config.db)
+    session_maker = async_sessionmaker(
+        engine, expire_on_commit=False, sync_session_class=UpdateSession
+    )
 
     bot = Bot(token=config.bot.token, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
     dp = Dispatcher(storage=config.bot.storage)
 
     dp.startup.register(on_startup)
-    dp.update.middleware(DbSessionMiddleware(session_pool=session_maker))
+    db_middleware = DbSessionMiddleware(session_pool=session_maker)
+    # outer to the session: FSM changes are written after the DB commit
+    dp.update.middleware(FSMUnitOfWorkMiddleware())
+    dp.update.middleware(db_middleware)
+    reachability_middleware = UserReachabilityMiddleware()
+    user_routers = (
+        command_router, user_router, faq_router, pickpoint_router, siz_router
+    )
+    for router in user_routers:
+        router.message.middleware(reachability_middleware)
 
     dp.include_router(command_router)
     dp.include_router(user_router)
@@ -45,17 +67,87 @@ async def main():
     dp.include_router(siz_router)
     dp.include_router(other_router)
 
+    elector = LeaderElector(
+        redis=config.bot.storage.redis,
+        on_elected=lambda: listener.trigger()
+    )
+    leader_notification_job = elector.guard(notification_job)
+    listener = NoticeListener(
+        dsn=config.db.dsn,
+        on_notice=partial(leader_notification_job, bot=bot, session_maker=session_maker)
+    )
+
     scheduler = AsyncIOScheduler(timezone='Europe/Moscow')
     scheduler.add_job(
-        notification_job,
+        leader_notification_job,
         trigger='interval',
-        minutes=10,
+        minutes=30,
+        max_instances=1,
+        coalesce=True,
         kwargs={'bot': bot, 'session_maker': session_maker}
     )
+    scheduler.add_job(
+        lambda: logger.info(
+            'DB pool: %s, sessions: %s, auth cache: %s, leader: %s',
+            pool_stats(engine), db_middleware.stats(),
+            BaseService.auth_cache.stats(), elector.stats()
+        ),
+        trigger='interval',
+        minutes=5
+    )
+
+    if config.bot.service_chat_id:
+        scheduler.add_job(
+            elector.guard(photo_warm_up_job),
+            trigger='interval',
+            hours=1,
+            next_run_time=datetime.now(timezone.utc) + timedelta(seconds=15),
+            max_instances=1,
+            coalesce=True,
+            kwargs={
+                'bot': bot,
+                'session_maker': session_maker,
+                'chat_id': config.bot.service_chat_id
+            }
+        )
+
+    eis_sink = make_sink(config.eis)
+    if eis_sink:
+        scheduler.add_job(
+            elector.guard(eis_export_job),
+            trigger='interval',
+            minutes=config.eis.interval,
+            max_instances=1,
+            coalesce=True,
+            kwargs={
+                'exporter': EISExporter(
+                    eis_sink, config.eis.format, config.eis.batch_size
+                ),
+                'session_maker': session_maker
+            }
+        )
     scheduler.start()
 
-    await bot.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot)
+    images = await SIZService.photos.pipeline.prepare_all()
+    logger.info('Model images prepared:\n%s', report(images))
+
+    elector.start()
+    listener.start()
+    await BaseService.write_queue.start(session_maker)
+
+    try:
+        if config.bot.mode == 'webhook':
+            await run_webhook(bot, dp, config.webhook)
+        else:
+            await bot.delete_webhook(drop_pending_updates=True)
+            await dp.start_polling(bot)
+    finally:
+        await BaseService.write_queue.stop()
+        await listener.stop()
+        await elector.stop()
+        if eis_sink:
+            await eis_sink.close()
+        await engine.dispose()
 
 
 if __name__ == '__main__':
@@ -1 +1,6 @@
-from .global_middlewares import DbSessionMiddleware
+from .global_middlewares import (
+    DbSessionMiddleware,
+    FSMUnitOfWorkMiddleware,
+    UpdateSession,
+    UserReachabilityMiddleware,
+)
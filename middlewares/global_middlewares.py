@@ -1,13 +1,42 @@
-from typing import Callable, Awaitable, Dict, Any
+import copy
+from typing import Callable, Awaitable, Dict, Any, Optional
 from aiogram import BaseMiddleware
-from aiogram.types import TelegramObject
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import StateType
+from aiogram.fsm.storage.redis import RedisStorage
+from aiogram.types import TelegramObject, User
+from redis.exceptions import WatchError
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import async_sessionmaker
+from database.uow import begin_unit_of_work, checkpoint, rollback
+from services.user import UserService
+
+
+class UpdateSession(Session):
+    """Sync session class for update sessions; marks ``info['used']`` on begin."""
+
+
+@sa_event.listens_for(UpdateSession, 'after_begin')
+def _mark_used(session: Session, transaction, connection) -> None:
+    session.info['used'] = True
 
 
 class DbSessionMiddleware(BaseMiddleware):
+    """Gives every update a session; a connection is checked out on first use.
+
+    AsyncSession begins lazily, so updates that never query the database do not
+    touch the pool. ``db_updates`` counts the updates that did; it needs
+    ``session_pool`` built with ``sync_session_class=UpdateSession``. The session
+    is a unit of work: DAO writes only flush and the update commits once at the end.
+    """
+
     def __init__(self, session_pool: async_sessionmaker):
         super().__init__()
         self.session_pool = session_pool
+        self.updates = 0
+        self.db_updates = 0
 
     async def __call__(
             self,
@@ -15,6 +44,186 @@ class DbSessionMiddleware(BaseMiddleware):
             event: TelegramObject,
             data: Dict[str, Any],
     ) -> Any:
+        self.updates += 1
         async with self.session_pool() as session:
+            begin_unit_of_work(session)
             data["session"] = session
+            data["session_maker"] = self.session_pool
+            try:
+                result = await handler(event, data)
+                if session.in_transaction():
+                    await checkpoint(session)
+                return result
+            except BaseException:
+                await rollback(session)
+                raise
+            finally:
+                if session.info.get('used'):
+                    self.db_updates += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'updates': self.updates,
+            'db_updates': self.db_updates,
+            'no_db_updates': self.updates - self.db_updates
+        }
+
+
+class UserReachabilityMiddleware(BaseMiddleware):
+    """Clears the unreachable mark of a user who writes to the bot again.
+
+    Runs after the handler, which has loaded the user's auth entry by then; only
+    users whose cached entry carries the mark cost a write, everyone else adds no query.
+    """
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        result = await handler(event, data)
+        user: User | None = data.get("event_from_user")
+        if user and UserService.is_marked_unreachable(user.id):
+            await UserService.mark_reachable(data["session"], user.id)
+        return result
+
+
+class BufferedFSMContext(FSMContext):
+    """FSMContext that reads data once per update and keeps changes until flush().
+
+    On flush only the keys this update changed are merged into the stored data, so
+    concurrent updates of the same user do not overwrite each other's keys.
+    set_data() and clear() replace the data as a whole.
+    """
+
+    def __init__(self, context: FSMContext, raw_state: Optional[str]):
+        super().__init__(storage=context.storage, key=context.key)
+        self._state = raw_state
+        self._data: Optional[Dict[str, Any]] = None
+        self._baseline: Dict[str, Any] = {}
+        self._state_changed = False
+        self._replaced = False
+
+    async def _load_data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = await self.storage.get_data(key=self.key)
+            self._baseline = copy.deepcopy(self._data)
+        return self._data
+
+    async def set_state(self, state: StateType = None) -> None:
+        self._state = state.state if isinstance(state, State) else state
+        self._state_changed = True
+
+    async def get_state(self) -> Optional[str]:
+        return self._state
+
+    async def set_data(self, data: Dict[str, Any]) -> None:
+        self._data = copy.deepcopy(data)
+        self._replaced = True
+
+    async def get_data(self) -> Dict[str, Any]:
+        return copy.deepcopy(await self._load_data())
+
+    async def update_data(
+            self, data: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Dict[str, Any]:
+        if data:
+            kwargs.update(data)
+        current = await self._load_data()
+        current.update(copy.deepcopy(kwargs))
+        return copy.deepcopy(current)
+
+    async def clear(self) -> None:
+        await self.set_state(None)
+        await self.set_data({})
+
+    def _changes(self) -> tuple[Dict[str, Any], set[str]]:
+        if self._data is None:
+            return {}, set()
+        changed = {
+            key: value for key, value in self._data.items()
+            if key not in self._baseline or self._baseline[key] != value
+        }
+        return changed, set(self._baseline) - set(self._data)
+
+    def _merge(self, stored: Dict[str, Any]) -> Dict[str, Any]:
+        if self._replaced:
+            return self._data
+        changed, removed = self._changes()
+        for key in removed:
+            stored.pop(key, None)
+        stored.update(changed)
+        return stored
+
+    async def flush(self) -> None:
+        changed, removed = self._changes()
+        data_changed = self._replaced or bool(changed or removed)
+        if not (self._state_changed or data_changed):
+            return
+        if isinstance(self.storage, RedisStorage):
+            await self._flush_redis(self.storage, data_changed)
+        else:
+            if self._state_changed:
+                await self.storage.set_state(key=self.key, state=self._state)
+            if data_changed:
+                self._data = self._merge(await self.storage.get_data(key=self.key))
+                await self.storage.set_data(key=self.key, data=self._data)
+        self._baseline = copy.deepcopy(self._data) if self._data is not None else {}
+        self._state_changed = self._replaced = False
+
+    async def _flush_redis(self, storage: RedisStorage, data_changed: bool) -> None:
+        state_key = storage.key_builder.build(self.key, "state")
+        data_key = storage.key_builder.build(self.key, "data")
+        async with storage.redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    if data_changed:
+                        # optimistic merge: retried if another update wrote meanwhile
+                        await pipe.watch(data_key)
+                        raw = await pipe.get(data_key)
+                        if isinstance(raw, bytes):
+                            raw = raw.decode("utf-8")
+                        data = self._merge(storage.json_loads(raw) if raw else {})
+                    pipe.multi()
+                    if self._state_changed:
+                        if self._state is None:
+                            pipe.delete(state_key)
+                        else:
+                            pipe.set(state_key, self._state, ex=storage.state_ttl)
+                    if data_changed:
+                        if not data:
+                            pipe.delete(data_key)
+                        else:
+                            pipe.set(
+                                data_key, storage.json_dumps(data), ex=storage.data_ttl
+                            )
+                    await pipe.execute()
+                    break
+                except WatchError:
+                    continue
+        if data_changed:
+            self._data = data
+
+
+class FSMUnitOfWorkMiddleware(BaseMiddleware):
+    """Buffers FSM changes of an update and writes them once it has succeeded.
+
+    Register it before DbSessionMiddleware, so the FSM is written only after
+    the update's database work has been committed.
+    """
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        context: Optional[FSMContext] = data.get("state")
+        if context is None:
             return await handler(event, data)
+        state = BufferedFSMContext(context, data.get("raw_state"))
+        data["state"] = state
+        result = await handler(event, data)
+        await state.flush()
+        return result
@@ -0,0 +1,147 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2024-09-02 10:00:00
+
+Schema as created by database/create_db.py before migrations were introduced.
+Databases created that way should be marked with ``alembic stamp 0001``.
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'pickpoint',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('last_modified_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'siz_type',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('last_modified_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'siz_user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tg_id', sa.BigInteger(), nullable=True),
+        sa.Column('phone_number', sa.String(length=12), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('last_modified_at', sa.DateTime(), nullable=False),
+        sa.Column('registered_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_siz_user_phone_number', 'siz_user', ['phone_number'], unique=True
+    )
+    op.create_table(
+        'question_priority',
+        sa.Column('id', sa.SmallInteger(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('order_value', sa.SmallInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_question_priority_name', 'question_priority', ['name'], unique=True
+    )
+    op.create_index(
+        'ix_question_priority_order_value', 'question_priority', ['order_value'],
+        unique=True
+    )
+    op.create_table(
+        'siz_faq',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('priority_id', sa.SmallInteger(), nullable=False),
+        sa.Column('question_text', sa.Text(), nullable=False),
+        sa.Column('answer_text', sa.Text(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('last_modified_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['priority_id'], ['question_priority.id'], ondelete='RESTRICT'
+        ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'siz_model',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('type_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('protect_props', sa.Text(), nullable=True),
+        sa.Column('care_procedure', sa.Text(), nullable=True),
+        sa.Column('writeoff_criteria', sa.Text(), nullable=True),
+        sa.Column('operating_rules', sa.Text(), nullable=True),
+        sa.Column('file_id', sa.String(length=255), nullable=True),
+        sa.Column('file_name', sa.String(length=255), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('last_modified_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['type_id'], ['siz_type.id'], ondelete='RESTRICT'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'pickpoint_rating',
+        sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+        sa.Column('pickpoint_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('rating_score', sa.SmallInteger(), nullable=False),
+        sa.Column('score_comment', sa.Text(), nullable=False),
+        sa.Column(
+            'created_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=False
+        ),
+        sa.Column('sent_to_eis', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['pickpoint_id'], ['pickpoint.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['siz_user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'sizmodel_review',
+        sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+        sa.Column('model_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('review_text', sa.Text(), nullable=False),
+        sa.Column(
+            'created_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=False
+        ),
+        sa.Column('sent_to_eis', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['model_id'], ['siz_model.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['siz_user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'admin_notice',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('notice_text', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('sent_from_eis', sa.DateTime(), nullable=False),
+        sa.Column('delivered_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('admin_notice')
+    op.drop_table('sizmodel_review')
+    op.drop_table('pickpoint_rating')
+    op.drop_table('siz_model')
+    op.drop_table('siz_faq')
+    op.drop_index('ix_question_priority_order_value', table_name='question_priority')
+    op.drop_index('ix_question_priority_name', table_name='question_priority')
+    op.drop_table('question_priority')
+    op.drop_index('ix_siz_user_phone_number', table_name='siz_user')
+    op.drop_table('siz_user')
+    op.drop_table('siz_type')
+    op.drop_table('pickpoint')
@@ -0,0 +1,72 @@
+"""notice delivery and EIS export batch ledgers, unreachable users, admin_notice NOTIFY
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2024-09-09 10:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'siz_user', sa.Column('unreachable_since', sa.DateTime(), nullable=True)
+    )
+    op.create_table(
+        'notice_delivery',
+        sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+        sa.Column('notice_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('attempts', sa.SmallInteger(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['notice_id'], ['admin_notice.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['siz_user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('notice_id', 'user_id')
+    )
+    op.create_table(
+        'eis_export_batch',
+        sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+        sa.Column('table_name', sa.String(length=64), nullable=False),
+        sa.Column('row_ids', postgresql.ARRAY(sa.BigInteger()), nullable=False),
+        sa.Column(
+            'created_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=False
+        ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_eis_export_batch_table_name', 'eis_export_batch', ['table_name']
+    )
+    op.execute('''
+CREATE OR REPLACE FUNCTION notify_admin_notice() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('admin_notice', NEW.id::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+''')
+    op.execute(
+        'CREATE TRIGGER admin_notice_notify AFTER INSERT ON admin_notice '
+        'FOR EACH ROW EXECUTE FUNCTION notify_admin_notice()'
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS admin_notice_notify ON admin_notice')
+    op.execute('DROP FUNCTION IF EXISTS notify_admin_notice()')
+    op.drop_index('ix_eis_export_batch_table_name', table_name='eis_export_batch')
+    op.drop_table('eis_export_batch')
+    op.drop_table('notice_delivery')
+    op.drop_column('siz_user', 'unreachable_since')
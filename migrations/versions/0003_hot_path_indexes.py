@@ -0,0 +1,49 @@
+"""indexes for hot lookup predicates
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-09-16 10:00:00
+
+Indexes are built CONCURRENTLY so that the bot keeps serving updates while
+the review and rating tables are indexed. Partial indexes are only used where
+the DAO query states the predicate literally; siz_model is filtered through
+filter_by(is_active=True), a bound parameter a generic plan cannot match
+against a partial predicate, so it gets a plain composite index.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_siz_user_tg_id', 'siz_user', ['tg_id'], 'tg_id IS NOT NULL'),
+    ('ix_admin_notice_undelivered', 'admin_notice', ['id'], 'delivered_at IS NULL'),
+    ('ix_pickpoint_rating_unsent', 'pickpoint_rating', ['id'], 'sent_to_eis IS NULL'),
+    ('ix_sizmodel_review_unsent', 'sizmodel_review', ['id'], 'sent_to_eis IS NULL'),
+    ('ix_siz_model_type_id_is_active', 'siz_model', ['type_id', 'is_active'], None),
+    ('ix_siz_faq_active_priority_id', 'siz_faq', ['priority_id'], 'is_active'),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_where=where,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in INDEXES:
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
@@ -0,0 +1,26 @@
+"""content hash of the uploaded model image
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2024-09-23 10:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'siz_model', sa.Column('file_hash', sa.String(length=64), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('siz_model', 'file_hash')
@@ -0,0 +1,40 @@
+"""indexes for keyset pagination of the catalogs
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2024-09-30 10:00:00
+
+Catalog menus are paged by ``(name, id)``; these indexes let every page,
+however deep, be read as a short index range scan.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_pickpoint_name_id', 'pickpoint', ['name', 'id']),
+    ('ix_siz_type_name_id', 'siz_type', ['name', 'id']),
+    ('ix_siz_model_type_id_name_id', 'siz_model', ['type_id', 'name', 'id']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
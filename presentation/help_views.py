@@ -54,7 +54,7 @@ HELP = {
     Выбор осуществляется путем нажатия на кнопку с указанным наименованием модели СИЗ.
     Для возврата к выбору типов СИЗ нажмите на кнопку <b>Назад</b>.
     
-    После выбора модели СИЗ появляется информация по защитным свойствам, порядке ухода и критериям преждевременного списания, если был выбран раздел получения информации.
+    После выбора модели СИЗ появляется карточка модели, если был выбран раздел получения информации. Разделы карточки (защитные свойства, порядок ухода, критерии преждевременного списания, правила эксплуатации) переключаются кнопками под карточкой, кнопка <b>Назад</b> под карточкой закрывает ее.
     Если был выбран раздел отзыва на модель СИЗ, то, на данном этапе, необходимо написать отзыв в стандартной строке мессенджера и отправить.
     Для возврата к выбору моделей СИЗ нажмите на кнопку <b>Назад</b>.
     
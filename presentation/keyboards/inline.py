@@ -1,9 +1,10 @@
-from typing import List
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from states.callbacks import (QuestionCallbackFactory, PickPointCallbackFactory,
-                              TypeCallbackFactory, ModelCallbackFactory)
-from services.models import SQuestion, SPickPoint
+                              TypeCallbackFactory, ModelCallbackFactory,
+                              ModelTabCallbackFactory, PageCallbackFactory)
+from services.models import Page
+from presentation.siz_views import TAB_TITLES
 
 
 emoji_dict = {
@@ -14,6 +15,12 @@ emoji_dict = {
     '5': '5️⃣'
 }
 
+back_button = InlineKeyboardButton(text='↩ Назад', callback_data='back')
+
+
+def back_kb() -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(inline_keyboard=[[back_button]])
+
 
 def help_chapters_kb() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
@@ -26,28 +33,52 @@ def help_chapters_kb() -> InlineKeyboardMarkup:
     )
 
 
-def show_questions(questions: List[SQuestion]) -> InlineKeyboardMarkup:
+def add_page_row(builder: InlineKeyboardBuilder, catalog: str, page: Page) -> None:
+    buttons = []
+    if page.prev_id is not None:
+        buttons.append(InlineKeyboardButton(
+            text='◀',
+            callback_data=PageCallbackFactory(
+                catalog=catalog, before=page.prev_id
+            ).pack()
+        ))
+    if page.next_id is not None:
+        buttons.append(InlineKeyboardButton(
+            text='▶',
+            callback_data=PageCallbackFactory(
+                catalog=catalog, after=page.next_id
+            ).pack()
+        ))
+    if buttons:
+        builder.row(*buttons)
+
+
+def show_questions(page: Page) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
-    for question in questions:
+    for question in page.items:
         builder.button(
             text=question.text,
             callback_data=QuestionCallbackFactory(
                 question_id=question.id
             ).pack()
         )
-    return builder.adjust(1).as_markup()
+    builder.adjust(1)
+    add_page_row(builder, 'questions', page)
+    return builder.as_markup()
 
 
-def show_pickpoints(pickpoints: dict[int, str]) -> InlineKeyboardMarkup:
+def show_pickpoints(page: Page) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
-    for pp_id, pp_name in pickpoints.items():
+    for pp_id, pp_name in page.items.items():
         builder.button(
             text=pp_name,
             callback_data=PickPointCallbackFactory(
                 pickpoint_id=pp_id
             ).pack()
         )
-    return builder.adjust(1).as_markup()
+    builder.adjust(1)
+    add_page_row(builder, 'pickpoints', page)
+    return builder.as_markup()
 
 
 def show_potential_score() -> InlineKeyboardMarkup:
@@ -57,7 +88,9 @@ def show_potential_score() -> InlineKeyboardMarkup:
             text=emoji_dict.get(score),
             callback_data=score
         )
-    return builder.adjust(5).as_markup()
+    builder.adjust(5)
+    builder.row(back_button)
+    return builder.as_markup()
 
 
 def show_yes_or_no() -> InlineKeyboardMarkup:
@@ -70,25 +103,46 @@ def show_yes_or_no() -> InlineKeyboardMarkup:
     )
 
 
-def show_siz_types(siz_types: dict[int, str]) -> InlineKeyboardMarkup:
+def show_siz_types(page: Page) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
-    for type_id, type_name in siz_types.items():
+    for type_id, type_name in page.items.items():
         builder.button(
             text=type_name,
             callback_data=TypeCallbackFactory(
                 siztype_id=type_id
             ).pack()
         )
-    return builder.adjust(1).as_markup()
+    builder.adjust(1)
+    add_page_row(builder, 'types', page)
+    return builder.as_markup()
 
 
-def show_siz_models(siz_models: dict[int, str]) -> InlineKeyboardMarkup:
+def show_siz_models(page: Page) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
-    for model_id, model_name in siz_models.items():
+    for model_id, model_name in page.items.items():
         builder.button(
             text=model_name,
             callback_data=ModelCallbackFactory(
                 sizmodel_id=model_id
             ).pack()
         )
-    return builder.adjust(1).as_markup()
+    builder.adjust(1)
+    add_page_row(builder, 'models', page)
+    builder.row(back_button)
+    return builder.as_markup()
+
+
+def show_model_tabs(
+        model_id: int, tabs: list[str], active: str | None) -> InlineKeyboardMarkup:
+    builder = InlineKeyboardBuilder()
+    for tab in tabs:
+        builder.button(
+            text=f'• {TAB_TITLES[tab]}' if tab == active else TAB_TITLES[tab],
+            callback_data=ModelTabCallbackFactory(
+                sizmodel_id=model_id,
+                tab=tab
+            ).pack()
+        )
+    builder.adjust(2)
+    builder.row(back_button)
+    return builder.as_markup()
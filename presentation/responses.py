@@ -1,7 +1,8 @@
 import asyncio
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, ReplyKeyboardMarkup, ReplyKeyboardRemove
 from aiogram.fsm.context import FSMContext
-from services.utils import add_message_to_track, erase_last_messages
+from aiogram.exceptions import TelegramBadRequest
+from services.utils import add_message_to_track, erase_last_messages, move_screens
 
 KeyboardMarkup = InlineKeyboardMarkup | ReplyKeyboardMarkup | ReplyKeyboardRemove
 
@@ -38,12 +39,27 @@ async def message_response(
 async def edit_response(
         message: Message,
         text: str,
-        reply_markup: KeyboardMarkup
-) -> None:
-    await message.edit_text(
+        reply_markup: InlineKeyboardMarkup | None = None,
+        state: FSMContext | None = None
+) -> Message:
+    """Edits ``message`` in place; if that fails, sends the screen as a new message."""
+    try:
+        await message.edit_text(
+            text=text,
+            reply_markup=reply_markup
+        )
+        return message
+    except TelegramBadRequest as e:
+        if 'message is not modified' in e.message:
+            return message
+    msg = await message.answer(
         text=text,
         reply_markup=reply_markup
     )
+    if state:
+        await add_message_to_track(msg, state)
+        await move_screens(state, message.message_id, msg.message_id)
+    return msg
 
 
 async def callback_response(
@@ -0,0 +1,39 @@
+from html import escape
+
+from services.models import SModel
+
+# Telegram limits, in characters after entity parsing
+CAPTION_LIMIT = 1024
+TEXT_LIMIT = 4096
+
+MODEL_SECTIONS = {
+    'props': ('Защитные свойства', 'protect_props'),
+    'care': ('Порядок ухода', 'care_procedure'),
+    'writeoff': ('Критерии преждевременного списания', 'writeoff_criteria'),
+    'rules': ('Правила эксплуатации', 'operating_rules')
+}
+
+TAB_TITLES = {
+    'props': 'Свойства',
+    'care': 'Уход',
+    'writeoff': 'Списание',
+    'rules': 'Эксплуатация'
+}
+
+
+def model_tabs(model: SModel) -> list[str]:
+    return [tab for tab, (_, field) in MODEL_SECTIONS.items() if getattr(model, field)]
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:max(limit - 1, 0)].rstrip() + '…'
+
+
+def model_card_view(model: SModel, tab: str | None, limit: int = CAPTION_LIMIT) -> str:
+    header = f'Вы выбрали модель СИЗ:\n<strong>{escape(model.name)}</strong>'
+    if tab is None:
+        return header
+    title, field = MODEL_SECTIONS[tab]
+    visible = len(f'Вы выбрали модель СИЗ:\n{model.name}\n\n{title}:\n')
+    body = _truncate(getattr(model, field), limit - visible)
+    return f'{header}\n\n<strong>{title}:</strong>\n<code>{escape(body)}</code>'
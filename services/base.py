@@ -1,23 +1,112 @@
-from typing import Any
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from dao.user import UserDAO
+from services.models import AuthEntry, Page
+from services.catalog import CatalogCache, CatalogSnapshot, Loader
+from services.writer import WriteBehindQueue
 from exceptions.cache import InvalidItems, InvalidVariable, ItemNotFound
 from exceptions.user import UserNotExist
 
+_MISSING = object()
+
+PageLoader = Callable[[AsyncSession, int | None, int | None], Awaitable[Page]]
+
+
+class AuthCache:
+    """TTL/LRU cache of tg_id -> AuthEntry (None for unknown or inactive users).
+
+    Unknown users are kept only for ``negative_ttl`` seconds: authorization on
+    another replica invalidates only that replica's cache.
+    """
+
+    def __init__(
+            self, maxsize: int = 10_000, ttl: float = 300.0, negative_ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, tuple[float, AuthEntry | None]] = OrderedDict()
+
+    def get(self, tg_id: int) -> AuthEntry | None | object:
+        item = self._entries.get(tg_id)
+        if item is None or item[0] < time.monotonic():
+            self._entries.pop(tg_id, None)
+            self.misses += 1
+            return _MISSING
+        self._entries.move_to_end(tg_id)
+        self.hits += 1
+        return item[1]
+
+    def peek(self, tg_id: int) -> AuthEntry | None:
+        """Cached entry without touching the counters or LRU order; None when absent."""
+        item = self._entries.get(tg_id)
+        if item is None or item[0] < time.monotonic():
+            return None
+        return item[1]
+
+    def set(self, tg_id: int, entry: AuthEntry | None) -> None:
+        ttl = self.ttl if entry is not None else self.negative_ttl
+        self._entries[tg_id] = (time.monotonic() + ttl, entry)
+        self._entries.move_to_end(tg_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *tg_ids: int | None) -> None:
+        for tg_id in tg_ids:
+            self._entries.pop(tg_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        total = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 3) if total else 0.0
+        }
+
 
 class BaseService:
 
+    admins = {1, 648987}
+    auth_cache = AuthCache()
+    catalog_cache = CatalogCache()
+    write_queue = WriteBehindQueue()
+    page_size = 10
+
     @classmethod
     async def remember_variables_in_state(cls, state: FSMContext, **kwargs) -> None:
         await state.update_data(**kwargs)
 
+    @classmethod
+    async def get_auth_entry(
+            cls, async_session: AsyncSession, tg_id: int) -> AuthEntry | None:
+        entry = cls.auth_cache.get(tg_id)
+        if entry is _MISSING:
+            user = await UserDAO.find_one_or_none(
+                async_session, tg_id=tg_id, is_active=True
+            )
+            entry = AuthEntry(
+                user_id=user.id,
+                is_active=user.is_active,
+                is_admin=user.id in cls.admins,
+                is_unreachable=user.unreachable_since is not None
+            ) if user else None
+            cls.auth_cache.set(tg_id, entry)
+        return entry
+
     @classmethod
     async def cache_user(cls, session: AsyncSession, state: FSMContext, tg_id: int) -> None:
-        user = await UserDAO.find_one_or_none(session, tg_id=tg_id, is_active=True)
-        if not user:
+        entry = await cls.get_auth_entry(session, tg_id)
+        if not entry:
             raise UserNotExist
-        await state.update_data(user_id=user.id)
+        await state.update_data(user_id=entry.user_id)
 
     @classmethod
     async def get_variables_from_state(cls, state: FSMContext, var_names: list[str]) -> list[Any]:
@@ -37,22 +126,68 @@ class BaseService:
 
     @classmethod
     async def is_authorized_user(cls, async_session: AsyncSession, tg_id: int) -> bool:
-        if not await UserDAO.find_one_or_none(async_session, tg_id=tg_id, is_active=True):
-            return False
-        return True
+        entry = await cls.get_auth_entry(async_session, tg_id)
+        return bool(entry and entry.is_active)
 
     @classmethod
-    async def get_item_name(cls, state: FSMContext, item_id: int, items_name: str) -> str:
-        try:
-            items = await cls.get_variable_from_state(state, items_name)
-            item_name = items.get(str(item_id)) or items.get(item_id)
-        except AttributeError:
-            raise InvalidItems
-        else:
-            if not item_name:
-                raise ItemNotFound
-            return item_name
-
+    async def get_page_snapshot(
+            cls,
+            session: AsyncSession,
+            state: FSMContext,
+            items_name: str,
+            catalog_key: str,
+            loader: PageLoader,
+            version_loader: Loader
+    ) -> CatalogSnapshot:
+        """Snapshot of the page of ``items_name`` the user is on.
 
+        The page cursor is kept in FSM as ``<items_name>_page``.
+        """
+        data = await state.get_data()
+        after, before = data.get(f'{items_name}_page') or (None, None)
+        snapshot = await cls.catalog_cache.get(
+            session,
+            catalog_key,
+            f'{after or ""}:{before or ""}',
+            lambda async_session: loader(async_session, after, before),
+            version_loader
+        )
+        if not snapshot.items.items and (after or before):
+            # the cursor row is gone, start over from the first page
+            await state.update_data({f'{items_name}_page': None})
+            return await cls.get_page_snapshot(
+                session, state, items_name, catalog_key, loader, version_loader
+            )
+        return snapshot
 
+    @classmethod
+    async def get_page(
+            cls,
+            session: AsyncSession,
+            state: FSMContext,
+            items_name: str,
+            catalog_key: str,
+            loader: PageLoader,
+            version_loader: Loader
+    ) -> Page:
+        snapshot = await cls.get_page_snapshot(
+            session, state, items_name, catalog_key, loader, version_loader
+        )
+        await state.update_data({f'{items_name}_stamp': snapshot.stamp})
+        return snapshot.items
 
+    @classmethod
+    async def get_item_name(
+            cls,
+            state: FSMContext,
+            snapshot: CatalogSnapshot,
+            item_id: int,
+            items_name: str
+    ) -> str:
+        item_name = snapshot.items.items.get(item_id)
+        if item_name:
+            return item_name
+        data = await state.get_data()
+        if data.get(f'{items_name}_stamp') != snapshot.stamp:
+            raise ItemNotFound
+        raise InvalidItems
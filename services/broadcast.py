@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramRetryAfter,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def is_unreachable(error: Exception) -> bool:
+    if isinstance(error, TelegramForbiddenError):
+        return True
+    return (isinstance(error, TelegramBadRequest)
+            and 'chat not found' in error.message.lower())
+
+
+class TokenBucket:
+    """Global send budget; a flood-wait from Telegram pauses every sender at once."""
+
+    def __init__(self, rate: float = 25.0, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._updated = self._paused_until
+        self._tokens = 0
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                refill = (now - self._updated) * self.rate
+                self._tokens = min(self.capacity, self._tokens + refill)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class BroadcastStats:
+    total: int
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    failures: dict[int, str] = field(default_factory=dict)
+    unreachable: set[int] = field(default_factory=set)
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def done(self) -> int:
+        return self.sent + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        return self.done / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def eta(self) -> float:
+        return (self.total - self.done) / self.throughput if self.throughput else 0.0
+
+    def __str__(self) -> str:
+        return (f'{self.done}/{self.total} (отправлено {self.sent}, '
+                f'ошибок {self.failed}, недоступно {len(self.unreachable)}, '
+                f'повторов {self.retries}), {self.throughput:.1f} сообщ./с, '
+                f'прошло {self.elapsed:.0f} с, осталось ~{self.eta:.0f} с')
+
+
+class Broadcaster:
+
+    def __init__(
+            self,
+            rate: float = 25.0,
+            concurrency: int = 10,
+            max_retries: int = 3,
+            report_interval: float = 30.0
+    ):
+        self.bucket = TokenBucket(rate)
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.report_interval = report_interval
+
+    async def broadcast(
+            self, bot: Bot, chat_ids: Sequence[int], text: str) -> BroadcastStats:
+        stats = BroadcastStats(total=len(chat_ids))
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for chat_id in chat_ids:
+            queue.put_nowait(chat_id)
+        reporter = asyncio.create_task(self._report(stats))
+        try:
+            await asyncio.gather(*(
+                self._worker(bot, queue, text, stats)
+                for _ in range(min(self.concurrency, stats.total))
+            ))
+        finally:
+            reporter.cancel()
+        logger.info('Рассылка завершена: %s', stats)
+        return stats
+
+    async def _worker(
+            self,
+            bot: Bot,
+            queue: asyncio.Queue[int],
+            text: str,
+            stats: BroadcastStats
+    ) -> None:
+        while not queue.empty():
+            chat_id = queue.get_nowait()
+            error = await self._send(bot, chat_id, text, stats)
+            if error is None:
+                stats.sent += 1
+                continue
+            stats.failed += 1
+            stats.failures[chat_id] = str(error)
+            if is_unreachable(error):
+                stats.unreachable.add(chat_id)
+
+    async def _send(
+            self,
+            bot: Bot,
+            chat_id: int,
+            text: str,
+            stats: BroadcastStats
+    ) -> Exception | None:
+        for _ in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            try:
+                await bot.send_message(chat_id=chat_id, text=text)
+                return None
+            except TelegramRetryAfter as e:
+                logger.warning('Превышен лимит Telegram, пауза %s с', e.retry_after)
+                self.bucket.pause(e.retry_after)
+                stats.retries += 1
+                error = e
+            except Exception as e:
+                logger.warning(
+                    'Не удалось отправить сообщение в чат %s: %s', chat_id, e
+                )
+                return e
+        return error
+
+    async def _report(self, stats: BroadcastStats) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            logger.info('Ход рассылки: %s', stats)
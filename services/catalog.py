@@ -0,0 +1,133 @@
+import asyncio
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+Loader = Callable[[AsyncSession], Awaitable[Any]]
+
+
+SnapshotKey = tuple[str, str]
+
+
+@dataclass
+class CatalogSnapshot:
+    version: tuple
+    items: Any
+
+    @property
+    def stamp(self) -> str:
+        return '|'.join(map(str, self.version))
+
+
+@dataclass
+class CatalogVersion:
+    value: tuple
+    checked_at: float
+
+
+class CatalogCache:
+    """In-memory snapshots of reference data, reloaded only when their version moves.
+
+    A catalog (``siz_types``, ``pickpoints``, ``faq``, ``siz_models:<type>``)
+    has one version, re-read at most once per ``check_interval`` seconds however
+    many of its pages are cached; a page snapshot is reloaded when it was loaded
+    at another version. Concurrent misses wait on a single loader. At most
+    ``max_snapshots`` pages are kept; the least recently used one is dropped first.
+    """
+
+    def __init__(self, check_interval: float = 30.0, max_snapshots: int = 256):
+        self.check_interval = check_interval
+        self.max_snapshots = max_snapshots
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.version_checks = 0
+        self.evictions = 0
+        self._versions: dict[str, CatalogVersion] = {}
+        self._version_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._snapshots: OrderedDict[SnapshotKey, CatalogSnapshot] = OrderedDict()
+        self._locks: defaultdict[SnapshotKey, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    def _fresh_version(self, catalog: str) -> tuple | None:
+        version = self._versions.get(catalog)
+        if version and time.monotonic() - version.checked_at < self.check_interval:
+            return version.value
+
+    async def version(
+            self, session: AsyncSession, catalog: str, version_loader: Loader) -> tuple:
+        if (version := self._fresh_version(catalog)) is not None:
+            return version
+        async with self._version_locks[catalog]:
+            if (version := self._fresh_version(catalog)) is not None:
+                return version
+            self.version_checks += 1
+            version = await version_loader(session)
+            self._versions[catalog] = CatalogVersion(version, time.monotonic())
+            return version
+
+    def _current(self, key: SnapshotKey, version: tuple) -> CatalogSnapshot | None:
+        snapshot = self._snapshots.get(key)
+        if snapshot and snapshot.version == version:
+            self._snapshots.move_to_end(key)
+            return snapshot
+
+    async def get(
+            self,
+            session: AsyncSession,
+            catalog: str,
+            page: str,
+            loader: Loader,
+            version_loader: Loader
+    ) -> CatalogSnapshot:
+        version = await self.version(session, catalog, version_loader)
+        key = (catalog, page)
+        if snapshot := self._current(key, version):
+            self.hits += 1
+            return snapshot
+        async with self._locks[key]:
+            if snapshot := self._current(key, version):
+                self.hits += 1
+                return snapshot
+            self.misses += 1
+            items = await loader(session)
+            self.loads += 1
+            snapshot = CatalogSnapshot(version=version, items=items)
+            self._snapshots[key] = snapshot
+            self._snapshots.move_to_end(key)
+            self._evict()
+            return snapshot
+
+    def _evict(self) -> None:
+        while len(self._snapshots) > self.max_snapshots:
+            key, _ = self._snapshots.popitem(last=False)
+            self.evictions += 1
+            lock = self._locks.get(key)
+            if lock and not lock.locked():
+                del self._locks[key]
+
+    def stamp(self, catalog: str, page: str) -> str | None:
+        snapshot = self._snapshots.get((catalog, page))
+        return snapshot.stamp if snapshot else None
+
+    def invalidate(self, catalog: str | None = None) -> None:
+        if catalog is None:
+            self._versions.clear()
+            self._snapshots.clear()
+            return
+        self._versions.pop(catalog, None)
+        for key in [key for key in self._snapshots if key[0] == catalog]:
+            del self._snapshots[key]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'catalogs': len(self._versions),
+            'snapshots': len(self._snapshots),
+            'hits': self.hits,
+            'misses': self.misses,
+            'loads': self.loads,
+            'version_checks': self.version_checks,
+            'evictions': self.evictions
+        }
@@ -0,0 +1,230 @@
+import asyncio
+import csv
+import datetime as dt
+import io
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Protocol, Sequence
+
+import aiohttp
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from config.base import EISConfig
+from dao.eis import EISExportBatchDAO, EISExportDAO
+from dao.pickpoint import PickPointRatingDAO
+from dao.siz import SIZReviewDAO
+from database.uow import begin_unit_of_work, checkpoint
+from services.leader import lease_held
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value):
+    if isinstance(value, (dt.datetime, dt.date)):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def encode_ndjson(rows: Sequence[Row]) -> bytes:
+    return b''.join(
+        json.dumps(row._asdict(), default=_json_default, ensure_ascii=False).encode()
+        + b'\n'
+        for row in rows
+    )
+
+
+def encode_csv(rows: Sequence[Row]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(rows[0]._fields)
+    writer.writerows(
+        [value.isoformat() if isinstance(value, dt.datetime) else value
+         for value in row]
+        for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+FORMATS = {
+    'ndjson': (encode_ndjson, 'application/x-ndjson', 'ndjson'),
+    'csv': (encode_csv, 'text/csv', 'csv')
+}
+
+
+class ExportSink(Protocol):
+
+    async def send(
+            self, key: str, payload: bytes, content_type: str, extension: str
+    ) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class FileSink:
+    """Writes every batch to ``<directory>/<key>.<ext>``; a resend overwrites it."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    async def send(
+            self, key: str, payload: bytes, content_type: str, extension: str) -> None:
+        path = self.directory / f'{key}.{extension}'
+        await asyncio.to_thread(self._write, path, payload)
+
+    @staticmethod
+    def _write(path: Path, payload: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + '.tmp')
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+
+    async def close(self) -> None:
+        pass
+
+
+class HttpSink:
+    """POSTs every batch with its key in ``Idempotency-Key``.
+
+    The receiver can drop resends by that key.
+    """
+
+    def __init__(self, url: str, token: str | None = None, timeout: float = 60.0):
+        self.url = url
+        self.token = token
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: aiohttp.ClientSession | None = None
+
+    async def send(
+            self, key: str, payload: bytes, content_type: str, extension: str) -> None:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+        headers = {'Content-Type': content_type, 'Idempotency-Key': key}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        request = self._session.post(self.url, data=payload, headers=headers)
+        async with request as response:
+            response.raise_for_status()
+
+    async def close(self) -> None:
+        if self._session:
+            await self._session.close()
+
+
+def make_sink(config: EISConfig) -> ExportSink | None:
+    if config.url:
+        return HttpSink(config.url, config.token)
+    if config.export_dir:
+        return FileSink(config.export_dir)
+    return None
+
+
+@dataclass
+class ExportStats:
+    table: str
+    rows: int = 0
+    batches: int = 0
+    bytes: int = 0
+    marked: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def __str__(self) -> str:
+        elapsed = time.monotonic() - self.started_at
+        return (f'{self.table}: строк {self.rows}, пакетов {self.batches}, '
+                f'{self.bytes / 1024:.0f} КБ, отмечено {self.marked}, {elapsed:.1f} с')
+
+
+class EISExporter:
+    """Streams rows with ``sent_to_eis IS NULL`` to a sink, marks acknowledged batches.
+
+    Rows are read in keyset windows of ``window`` ids, each window through a
+    server-side cursor yielding ``batch_size`` rows, so memory does not grow
+    with the backlog. Every batch is recorded in ``eis_export_batch`` before it
+    is sent and its ledger id is the batch key; marking the rows and closing the
+    ledger row happen in one transaction. A batch interrupted in between is
+    resent first on the next run with the same rows and key, so the receiver
+    overwrites (file) or deduplicates (HTTP) it.
+    """
+
+    def __init__(
+            self,
+            sink: ExportSink,
+            fmt: str = 'ndjson',
+            batch_size: int = 1000,
+            window: int = 50_000
+    ):
+        self.sink = sink
+        self.encoder, self.content_type, self.extension = FORMATS[fmt]
+        self.batch_size = batch_size
+        self.window = window
+
+    async def export(
+            self, session_maker: async_sessionmaker, dao: type[EISExportDAO]
+    ) -> ExportStats:
+        stats = ExportStats(table=dao.model.__tablename__)
+        async with session_maker() as read_session:
+            open_batches = await EISExportBatchDAO.get_open(read_session, stats.table)
+        for batch_id, ids in open_batches:
+            if not lease_held():
+                return stats
+            async with session_maker() as read_session:
+                rows = await dao.get_rows(read_session, ids)
+            await self._deliver(session_maker, dao, batch_id, ids, rows, stats)
+        after_id = 0
+        while True:
+            fetched = 0
+            async with session_maker() as read_session:
+                unsent = dao.stream_unsent(
+                    read_session, after_id, self.window, self.batch_size
+                )
+                async for rows in unsent:
+                    if not lease_held():
+                        return stats
+                    fetched += len(rows)
+                    ids = [row.id for row in rows]
+                    async with session_maker() as write_session:
+                        batch_id = await EISExportBatchDAO.open_batch(
+                            write_session, stats.table, ids
+                        )
+                    await self._deliver(session_maker, dao, batch_id, ids, rows, stats)
+                    after_id = ids[-1]
+            if fetched < self.window:
+                return stats
+
+    async def _deliver(
+            self,
+            session_maker: async_sessionmaker,
+            dao: type[EISExportDAO],
+            batch_id: int,
+            ids: Sequence[int],
+            rows: Sequence[Row],
+            stats: ExportStats
+    ) -> None:
+        payload = self.encoder(rows) if rows else b''
+        if rows:
+            await self.sink.send(
+                f'{stats.table}-{batch_id}', payload, self.content_type, self.extension
+            )
+        async with session_maker() as write_session:
+            begin_unit_of_work(write_session)
+            stats.marked += await dao.mark_sent(write_session, ids)
+            await EISExportBatchDAO.close_batch(write_session, batch_id)
+            await checkpoint(write_session)
+        stats.rows += len(rows)
+        stats.batches += 1
+        stats.bytes += len(payload)
+
+
+async def eis_export_job(exporter: EISExporter, session_maker: async_sessionmaker):
+    for dao in (SIZReviewDAO, PickPointRatingDAO):
+        try:
+            stats = await exporter.export(session_maker, dao)
+        except Exception:
+            logger.exception('Выгрузка %s в ЕИС прервана', dao.model.__tablename__)
+            continue
+        if stats.rows:
+            logger.info('Выгрузка в ЕИС: %s', stats)
@@ -1,7 +1,7 @@
-from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import NoResultFound
-from services.models import SQuestion, SAnswer
+from aiogram.fsm.context import FSMContext
+from services.models import SQuestion, SAnswer, Page
 from dao.faq import FaqDAO
 from services.base import BaseService
 from exceptions.questions import QuestionNotFound, NoQuestionsExist
@@ -10,16 +10,32 @@ from exceptions.questions import QuestionNotFound, NoQuestionsExist
 class FAQService(BaseService):
 
     @classmethod
-    async def get_questions(cls, async_session: AsyncSession) -> List[SQuestion]:
-        raw_questions = await FaqDAO.find_all_sort_by_priority(async_session)
-        if not raw_questions:
+    async def _load_questions_page(
+            cls, async_session: AsyncSession, after: int | None, before: int | None
+    ) -> Page:
+        raw_questions, has_prev, has_next = await FaqDAO.find_page_sort_by_priority(
+            async_session, cls.page_size, after, before
+        )
+        return Page.build(
+            [
+                SQuestion(
+                    id=question.id,
+                    text=question.question_text
+                ) for question in raw_questions
+            ],
+            raw_questions, has_prev, has_next
+        )
+
+    @classmethod
+    async def get_questions_page(
+            cls, async_session: AsyncSession, state: FSMContext) -> Page:
+        page = await cls.get_page(
+            async_session, state, 'questions', 'faq',
+            cls._load_questions_page, FaqDAO.get_version
+        )
+        if not page.items:
             raise NoQuestionsExist
-        return [
-            SQuestion(
-                id=question.id,
-                text=question.question_text
-            ) for question in raw_questions
-        ]
+        return page
 
     @classmethod
     async def get_answer(cls, async_session: AsyncSession, question_id: int) -> SAnswer:
@@ -0,0 +1,175 @@
+"""Normalizes model images to Telegram photo limits and caches them by content hash.
+
+Offline run from the project root: ``python -m services.images``
+"""
+import asyncio
+import hashlib
+import io
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import aiofiles
+import aiofiles.os
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+IMAGES_DIR = Path('static/images')
+CACHE_DIR = Path('static/cache')
+DEFAULT_UPLINK = 10e6 / 8
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    source: Path
+    path: Path
+    key: str
+    source_size: int
+    size: int
+
+    @property
+    def saved(self) -> int:
+        return self.source_size - self.size
+
+    def upload_time_saved(self, uplink: float) -> float:
+        return self.saved / uplink
+
+
+class ImagePipeline:
+    """Applies EXIF orientation, resizes to ``max_side`` px, flattens transparency
+    and recompresses to JPEG.
+
+    Results are written to ``cache_dir/<key>.jpg`` where the key is the hash of
+    the source bytes and of the settings, so a changed file or setting produces
+    a new cache entry. Without Pillow installed the source files are used as is.
+    """
+
+    version = 2
+
+    def __init__(
+            self,
+            images_dir: Path = IMAGES_DIR,
+            cache_dir: Path = CACHE_DIR,
+            max_side: int = 1280,
+            quality: int = 85
+    ):
+        self.images_dir = images_dir
+        self.cache_dir = cache_dir
+        self.max_side = max_side
+        self.quality = quality
+        self._prepared: dict[str, tuple[tuple[int, int], PreparedImage]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def prepare(self, file_name: str) -> PreparedImage:
+        source = self.images_dir / file_name
+        stat = await asyncio.to_thread(os.stat, source)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._prepared.get(file_name)
+        if cached and cached[0] == signature:
+            return cached[1]
+        async with self._locks.setdefault(file_name, asyncio.Lock()):
+            cached = self._prepared.get(file_name)
+            if cached and cached[0] == signature:
+                return cached[1]
+            prepared = await self._prepare(source)
+            self._prepared[file_name] = (signature, prepared)
+            return prepared
+
+    async def _prepare(self, source: Path) -> PreparedImage:
+        data, key = await asyncio.to_thread(self._read, source)
+        if Image is None:
+            return PreparedImage(source, source, key, len(data), len(data))
+        path = self.cache_dir / f'{key}.jpg'
+        if await aiofiles.os.path.exists(path):
+            size = (await aiofiles.os.stat(path)).st_size
+            return PreparedImage(source, path, key, len(data), size)
+        processed = await asyncio.to_thread(self._recompress, data)
+        if len(processed) >= len(data) and source.suffix.lower() in ('.jpg', '.jpeg'):
+            processed = data
+        await aiofiles.os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        async with aiofiles.open(tmp, 'wb') as file:
+            await file.write(processed)
+        await aiofiles.os.replace(tmp, path)
+        return PreparedImage(source, path, key, len(data), len(processed))
+
+    def _read(self, source: Path) -> tuple[bytes, str]:
+        data = source.read_bytes()
+        digest = hashlib.sha256(data)
+        if Image is not None:
+            digest.update(f'v{self.version}:{self.max_side}:{self.quality}'.encode())
+        return data, digest.hexdigest()
+
+    def _recompress(self, data: bytes) -> bytes:
+        with Image.open(io.BytesIO(data)) as source:
+            image = ImageOps.exif_transpose(source)
+            image.thumbnail((self.max_side, self.max_side))
+            if image.mode in ('RGBA', 'LA', 'P'):
+                image = image.convert('RGBA')
+                background = Image.new('RGB', image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel('A'))
+                image = background
+            elif image.mode != 'RGB':
+                image = image.convert('RGB')
+            output = io.BytesIO()
+            image.save(
+                output, 'JPEG', quality=self.quality, optimize=True, progressive=True
+            )
+            return output.getvalue()
+
+    async def prepare_all(self) -> list[PreparedImage]:
+        """Prepares every image in ``images_dir``, logging and skipping failures."""
+        try:
+            names = sorted(
+                name for name in os.listdir(self.images_dir)
+                if not name.startswith('.')
+            )
+        except OSError as e:
+            logger.error('Cannot list images in %s: %s', self.images_dir, e)
+            return []
+        prepared = []
+        for name in names:
+            try:
+                prepared.append(await self.prepare(name))
+            except Exception:
+                logger.exception('Failed to prepare image %s', name)
+        return prepared
+
+
+def report(images: list[PreparedImage], uplink: float = DEFAULT_UPLINK) -> str:
+    lines = [
+        f'{"image":<16}{"source, KB":>12}{"sent, KB":>10}'
+        f'{"saved, KB":>11}{"time saved, s":>15}'
+    ]
+    for image in images:
+        lines.append(
+            f'{image.source.name:<16}{image.source_size / 1024:>12.1f}'
+            f'{image.size / 1024:>10.1f}'
+            f'{image.saved / 1024:>11.1f}{image.upload_time_saved(uplink):>15.2f}'
+        )
+    total = sum(image.saved for image in images)
+    lines.append(
+        f'total saved: {total / 1024:.1f} KB, '
+        f'{total / uplink:.2f} s at {uplink * 8 / 1e6:.0f} Mbit/s'
+    )
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--uplink-mbps', type=float, default=10.0,
+        help='uplink used to estimate upload time'
+    )
+    args = parser.parse_args()
+    if Image is None:
+        print('Pillow is not installed, images are sent unprocessed')
+    images = asyncio.run(ImagePipeline().prepare_all())
+    print(report(images, args.uplink_mbps * 1e6 / 8))
@@ -0,0 +1,138 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import socket
+import time
+from typing import Any, Awaitable, Callable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+_current_elector: contextvars.ContextVar['LeaderElector | None'] = (
+    contextvars.ContextVar('current_elector', default=None)
+)
+
+_RENEW_SCRIPT = '''
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+'''
+
+_RELEASE_SCRIPT = '''
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+'''
+
+
+def lease_held() -> bool:
+    """False once the replica running the current guarded job has lost the lease.
+
+    Long jobs check it between chunks; outside a guarded job it is always True.
+    """
+    elector = _current_elector.get()
+    return elector is None or elector.is_leader
+
+
+class LeaderElector:
+    """Redis lease: the replica holding ``key`` runs scheduled jobs.
+
+    The lease is renewed every ``ttl / 3`` seconds, so a dead leader is replaced
+    within ``ttl`` seconds plus one renew interval.
+    """
+
+    def __init__(
+            self,
+            redis: Redis,
+            key: str = 'siz_bot:scheduler:leader',
+            ttl: float = 30.0,
+            on_elected: Callable[[], Any] | None = None
+    ):
+        self.redis = redis
+        self.key = key
+        self.ttl = ttl
+        self.on_elected = on_elected
+        self.identity = f'{socket.gethostname()}:{os.getpid()}'
+        self.is_leader = False
+        self.acquired = 0
+        self.lost = 0
+        self.last_renewed_at: float | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if self.is_leader:
+            try:
+                await self.redis.eval(_RELEASE_SCRIPT, 1, self.key, self.identity)
+            except RedisError as e:
+                logger.warning('Failed to release leader lease: %s', e)
+            self.is_leader = False
+            logger.info('Leader lease released by %s', self.identity)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._tick()
+            except RedisError as e:
+                logger.warning('Leader lease check failed: %s', e)
+                self._set_leader(False)
+            await asyncio.sleep(self.ttl / 3)
+
+    async def _tick(self) -> None:
+        ttl_ms = int(self.ttl * 1000)
+        if self.is_leader:
+            renewed = await self.redis.eval(
+                _RENEW_SCRIPT, 1, self.key, self.identity, ttl_ms
+            )
+            self._set_leader(bool(renewed))
+        else:
+            acquired = await self.redis.set(self.key, self.identity, nx=True, px=ttl_ms)
+            self._set_leader(bool(acquired))
+        if self.is_leader:
+            self.last_renewed_at = time.monotonic()
+
+    def _set_leader(self, is_leader: bool) -> None:
+        was_leader, self.is_leader = self.is_leader, is_leader
+        if is_leader and not was_leader:
+            self.acquired += 1
+            logger.info('Leader lease acquired by %s', self.identity)
+            if self.on_elected:
+                self.on_elected()
+        elif was_leader and not is_leader:
+            self.lost += 1
+            logger.warning('Leader lease lost by %s', self.identity)
+
+    def guard(
+            self, job: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(job)
+        async def wrapper(*args, **kwargs):
+            if not self.is_leader:
+                return
+            token = _current_elector.set(self)
+            try:
+                return await job(*args, **kwargs)
+            finally:
+                _current_elector.reset(token)
+        return wrapper
+
+    def stats(self) -> dict[str, int | bool | float | None]:
+        return {
+            'is_leader': self.is_leader,
+            'acquired': self.acquired,
+            'lost': self.lost,
+            'lease_age': (
+                round(time.monotonic() - self.last_renewed_at, 1)
+                if self.last_renewed_at else None
+            )
+        }
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+import asyncpg
+
+from database.models import NOTICE_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+
+class NoticeListener:
+    """Runs ``on_notice`` whenever admin_notice receives a row.
+
+    It LISTENs on a dedicated connection. Notifications that arrive while a
+    dispatch is running are coalesced into one follow-up run. After every
+    (re)connect a catch-up run picks up anything missed.
+    """
+
+    def __init__(
+            self,
+            dsn: str,
+            on_notice: Callable[[], Awaitable[None]],
+            channel: str = NOTICE_CHANNEL,
+            reconnect_delay: float = 5.0
+    ):
+        self.dsn = dsn
+        self.on_notice = on_notice
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._task: asyncio.Task | None = None
+        self._dispatcher: asyncio.Task | None = None
+        self._pending = False
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._dispatcher):
+            if task:
+                task.cancel()
+        tasks = [task for task in (self._task, self._dispatcher) if task]
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _listen(self) -> None:
+        while True:
+            closed = asyncio.Event()
+            conn = None
+            try:
+                conn = await asyncpg.connect(self.dsn)
+                conn.add_termination_listener(lambda _: closed.set())
+                await conn.add_listener(self.channel, self._on_notify)
+                logger.info('Listening on channel %s', self.channel)
+                self.trigger()
+                await closed.wait()
+                logger.warning('Lost connection listening on channel %s', self.channel)
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning('Failed to listen on channel %s: %s', self.channel, e)
+            finally:
+                if conn and not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        logger.info('Received notice id=%s', payload)
+        self.trigger()
+
+    def trigger(self) -> None:
+        self._pending = True
+        if not self._dispatcher or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._run_dispatch())
+
+    async def _run_dispatch(self) -> None:
+        while self._pending:
+            self._pending = False
+            try:
+                await self.on_notice()
+            except Exception:
+                logger.exception('Notice dispatch failed')
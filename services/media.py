@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from contextlib import suppress
+from typing import Awaitable, Callable
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import FSInputFile, InputFile, Message
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dao.siz import SIZModelDAO
+from database.uow import unit_of_work
+from services.images import ImagePipeline
+from services.models import SModel
+
+logger = logging.getLogger(__name__)
+
+
+class PhotoRegistry:
+    """Telegram file_ids of the model images, keyed by file name and content hash.
+
+    The uploaded file is the pipeline output, and the hash is its cache key.
+    A file is uploaded once per content hash: concurrent requests for the same
+    file wait for the first upload and reuse its file_id. send() prefers the
+    file_id stored in the model row and re-uploads when the row's hash no longer
+    matches the file; the hash is memoized by the pipeline, so a known file costs
+    one stat. warm_up() uploads every new or changed file to a service chat
+    ahead of time and replaces the stale file_ids.
+    """
+
+    def __init__(self, pipeline: ImagePipeline | None = None):
+        self.pipeline = pipeline or ImagePipeline()
+        self.uploads = 0
+        self.reused = 0
+        self._file_ids: dict[str, tuple[str, str]] = {}
+        self._locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    def _known(self, file_name: str, file_hash: str) -> str | None:
+        if entry := self._file_ids.get(file_name):
+            if entry[0] == file_hash:
+                return entry[1]
+
+    def _registered(self, model: SModel) -> str | None:
+        """Last known file_id of a model whose image cannot be read."""
+        if model.file_id:
+            return model.file_id
+        if entry := self._file_ids.get(model.file_name):
+            return entry[1]
+
+    async def _store(
+            self, session: AsyncSession, file_name: str, file_hash: str, file_id: str
+    ) -> None:
+        self._file_ids[file_name] = (file_hash, file_id)
+        await SIZModelDAO.set_file_id(session, file_name, file_id, file_hash)
+
+    async def send(
+            self,
+            session: AsyncSession,
+            model: SModel,
+            send: Callable[[str | InputFile], Awaitable[Message]]
+    ) -> Message:
+        try:
+            if not model.file_name:
+                raise FileNotFoundError(f'SIZ model {model.name!r} has no image')
+            image = await self.pipeline.prepare(model.file_name)
+        except FileNotFoundError:
+            if file_id := self._registered(model):
+                self.reused += 1
+                return await send(file_id)
+            raise
+        if model.file_id and model.file_hash == image.key:
+            self._file_ids[model.file_name] = (image.key, model.file_id)
+            self.reused += 1
+            return await send(model.file_id)
+        async with self._locks[model.file_name]:
+            if file_id := self._known(model.file_name, image.key):
+                self.reused += 1
+                return await send(file_id)
+            msg = await send(FSInputFile(image.path))
+            self.uploads += 1
+            await self._store(
+                session, model.file_name, image.key, msg.photo[-1].file_id
+            )
+            return msg
+
+    async def warm_up(
+            self, bot: Bot, session_maker: async_sessionmaker, chat_id: int) -> int:
+        async with session_maker() as session:
+            files = await SIZModelDAO.get_files(session)
+        uploaded = 0
+        for file_name, file_id, stored_hash in files:
+            try:
+                image = await self.pipeline.prepare(file_name)
+            except FileNotFoundError:
+                logger.warning('Image %s referenced by siz_model is missing', file_name)
+                continue
+            if file_id and stored_hash == image.key:
+                self._file_ids[file_name] = (image.key, file_id)
+                continue
+            async with self._locks[file_name]:
+                if self._known(file_name, image.key):
+                    continue
+                started = time.monotonic()
+                try:
+                    msg = await bot.send_photo(
+                        chat_id=chat_id,
+                        photo=FSInputFile(image.path),
+                        disable_notification=True
+                    )
+                except TelegramAPIError as e:
+                    logger.warning('Failed to upload image %s: %s', file_name, e)
+                    continue
+                logger.info(
+                    'Uploaded %s in %.2f s: %s KB instead of %s KB',
+                    file_name, time.monotonic() - started,
+                    image.size // 1024, image.source_size // 1024
+                )
+                async with unit_of_work(session_maker) as session:
+                    await self._store(
+                        session, file_name, image.key, msg.photo[-1].file_id
+                    )
+                self.uploads += 1
+                uploaded += 1
+                with suppress(TelegramAPIError):
+                    await bot.delete_message(chat_id=chat_id, message_id=msg.message_id)
+        if uploaded:
+            logger.info('Uploaded %s new or changed model images', uploaded)
+        return uploaded
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'files': len(self._file_ids),
+            'uploads': self.uploads,
+            'reused': self.reused
+        }
+
@@ -1,13 +1,65 @@
 from dataclasses import dataclass
-from typing import Optional
-from aiogram.types import Message
+from typing import Any, Optional, Sequence
 from pydantic import BaseModel
 
 
-@dataclass
 class TrackCallback:
-    message: Message
-    callback_data: str
+    """Callback reference stored in FSM data.
+
+    Encoded as ``[version, chat_id, message_id, callback_data]``.
+    """
+
+    __slots__ = ('chat_id', 'message_id', 'callback_data')
+
+    version = 1
+
+    def __init__(self, chat_id: int, message_id: int, callback_data: str):
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.callback_data = callback_data
+
+    def encode(self) -> list[Any]:
+        return [self.version, self.chat_id, self.message_id, self.callback_data]
+
+    @classmethod
+    def decode(cls, raw: Any) -> 'TrackCallback':
+        if isinstance(raw, cls):
+            return raw
+        if isinstance(raw, list) and raw and raw[0] == cls.version:
+            _, chat_id, message_id, callback_data = raw
+            return cls(chat_id, message_id, callback_data)
+        if isinstance(raw, dict):
+            # version 0: dataclass with the full aiogram Message
+            message = raw['message']
+            return cls(
+                message['chat']['id'], message['message_id'], raw['callback_data']
+            )
+        raise ValueError(f'Unsupported TrackCallback format: {raw!r}')
+
+
+@dataclass(frozen=True)
+class AuthEntry:
+    user_id: int
+    is_active: bool
+    is_admin: bool
+    is_unreachable: bool = False
+
+
+@dataclass(frozen=True)
+class Page:
+    """Keyset page of a catalog; ``prev_id``/``next_id`` bound the adjacent pages."""
+    items: Any
+    prev_id: Optional[int] = None
+    next_id: Optional[int] = None
+
+    @classmethod
+    def build(
+            cls, items: Any, rows: Sequence, has_prev: bool, has_next: bool) -> 'Page':
+        return cls(
+            items=items,
+            prev_id=rows[0].id if rows and has_prev else None,
+            next_id=rows[-1].id if rows and has_next else None
+        )
 
 
 class SUser(BaseModel):
@@ -40,4 +92,5 @@ class SModel(BaseModel):
     operating_rules: Optional[str] = None
     file_id: Optional[str] = None
     file_name: Optional[str] = None
+    file_hash: Optional[str] = None
 
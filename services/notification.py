@@ -1,55 +1,172 @@
 import datetime as dt
 import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Coroutine
 from aiogram import Bot
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from dao.user import UserDAO
-from dao.admin import AdminDAO
-from exceptions.admin import InvalidNotificationError
+from dao.admin import AdminDAO, NoticeDeliveryDAO
+from database.models import AdminNotice, DeliveryStatus
+from database.uow import after_commit, checkpoint, unit_of_work
+from services.base import BaseService
+from services.broadcast import Broadcaster, BroadcastStats
+from services.leader import lease_held
+
+logger = logging.getLogger(__name__)
+
+_background_tasks: set[asyncio.Task] = set()
 
 
 async def notification_job(bot: Bot, session_maker: async_sessionmaker):
-    async with session_maker() as session:
-        notifications = await AdminDAO.get_new_notifications(session)
-        for notification in notifications:
-            try:
-                users = await UserDAO.get_all_bot_users(session)
-                for user in users:
-                    try:
-                        await bot.send_message(chat_id=user.tg_id, text=notification.notice_text)
-                    except Exception as e:
-                        print(f'Не удалось отправить сообщение пользователю {user.id}\nТекст исключения:\n{e}')
-                        raise InvalidNotificationError
-                    else:
-                        await asyncio.sleep(0.1)
-            except InvalidNotificationError:
-                print(f'Не удалось отправить уведомление с id={notification.id}')
-            else:
-                await AdminDAO.update_object(session, notification.id, delivered_at=dt.datetime.now())
-            finally:
-                await asyncio.sleep(0.5)
-
-
-class NotificationService:
+    async with unit_of_work(session_maker) as session:
+        await NotificationService.send_mass_admin_notification(bot, session)
+
+
+def run_in_background(coro: Coroutine[Any, Any, Any]) -> None:
+    """Runs a broadcast outside the handler, which answers the callback at once."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+class NotificationService(BaseService):
+    broadcaster = Broadcaster()
+    chunk_size = 500
+    max_attempts = 5
+    retry_base_delay = dt.timedelta(minutes=1)
+    _admin_lock = asyncio.Lock()
+
+    @classmethod
+    async def _prune_unreachable(
+            cls, session: AsyncSession, stats: BroadcastStats) -> None:
+        if stats.unreachable:
+            await UserDAO.mark_unreachable(session, stats.unreachable)
+            after_commit(session, lambda: cls.auth_cache.invalidate(*stats.unreachable))
+
     @classmethod
-    async def send_mass_notification(cls, bot: Bot, text: str, session: AsyncSession):
-        users = await UserDAO.get_all_bot_users(session)
-        for user in users:
+    async def report_to_admins(cls, bot: Bot, session: AsyncSession, text: str) -> None:
+        for tg_id in await UserDAO.get_tg_ids(session, cls.admins):
             try:
-                await bot.send_message(chat_id=user.tg_id, text=text)
-                await asyncio.sleep(0.1)
+                await bot.send_message(chat_id=tg_id, text=text)
             except Exception as e:
-                print(f'Не удалось отправить сообщение пользователю {user.id}\nТекст исключения:\n{e}')
-                raise InvalidNotificationError
+                logger.warning(
+                    'Не удалось отправить отчет администратору %s: %s', tg_id, e
+                )
 
     @classmethod
-    async def send_mass_admin_notification(cls, bot: Bot, session: AsyncSession):
-        notifications = await AdminDAO.get_new_notifications(session)
-        for notification in notifications:
-            try:
-                await cls.send_mass_notification(bot=bot, session=session, text=notification.notice_text)
-            except InvalidNotificationError:
-                print(f'Не удалось отправить уведомление с id={notification.id}')
-            else:
-                await AdminDAO.update_object(session, notification.id, delivered_at=dt.datetime.now())
+    async def send_mass_notification(
+            cls, bot: Bot, text: str, session_maker: async_sessionmaker
+    ) -> BroadcastStats:
+        """Sends ``text`` to every bot user; no connection is held while sending."""
+        async with session_maker() as session:
+            users = await UserDAO.get_all_bot_users(session)
+        chat_ids = [user.tg_id for user in users]
+        stats = await cls.broadcaster.broadcast(bot, chat_ids, text)
+        async with unit_of_work(session_maker) as session:
+            await cls._prune_unreachable(session, stats)
+        return stats
 
+    @classmethod
+    async def run_mass_notification(
+            cls, bot: Bot, text: str, session_maker: async_sessionmaker, chat_id: int
+    ) -> None:
+        """Broadcasts ``text`` and reports the result to ``chat_id``."""
+        try:
+            stats = await cls.send_mass_notification(bot, text, session_maker)
+        except Exception:
+            logger.exception('Массовая рассылка прервана')
+            report = 'Массовая рассылка прервана из-за ошибки'
+        else:
+            report = (f'Сообщение отправлено: {stats.sent} из {stats.total}. '
+                      f'Исключено недоступных получателей: {len(stats.unreachable)}')
+        try:
+            await bot.send_message(chat_id=chat_id, text=report)
+        except Exception as e:
+            logger.warning('Не удалось отправить отчет о рассылке %s: %s', chat_id, e)
+
+    @classmethod
+    async def deliver_notice(
+            cls, bot: Bot, session: AsyncSession, notice: AdminNotice) -> None:
+        if not await NoticeDeliveryDAO.has_recipients(session, notice.id):
+            await NoticeDeliveryDAO.add_recipients(session, notice.id)
+            await checkpoint(session)
+        sent = pruned = 0
+        while due := await NoticeDeliveryDAO.get_due(
+                session, notice.id, cls.chunk_size):
+            if not lease_held():
+                await checkpoint(session)
+                logger.warning(
+                    'Рассылка уведомления id=%s остановлена: '
+                    'реплика больше не ведущая', notice.id
+                )
+                return
+            # several ledger rows may point at one chat;
+            # it gets one message and all of them are settled
+            rows_by_chat = defaultdict(list)
+            for row in due:
+                rows_by_chat[row.tg_id].append(row)
+            stats = await cls.broadcaster.broadcast(
+                bot, list(rows_by_chat), notice.notice_text
+            )
+            sent_ids = [
+                row.id
+                for tg_id, rows in rows_by_chat.items() if tg_id not in stats.failures
+                for row in rows
+            ]
+            if sent_ids:
+                await NoticeDeliveryDAO.mark_sent(session, sent_ids)
+            if stats.failures:
+                await NoticeDeliveryDAO.mark_failed(session, [
+                    cls._failed_delivery(row, error, tg_id in stats.unreachable)
+                    for tg_id, error in stats.failures.items()
+                    for row in rows_by_chat[tg_id]
+                ])
+            await cls._prune_unreachable(session, stats)
+            await checkpoint(session)
+            sent += stats.sent
+            pruned += len(stats.unreachable)
+        unfinished = await NoticeDeliveryDAO.count_unfinished(session, notice.id)
+        if unfinished:
+            logger.warning(
+                'Уведомление с id=%s доставлено не всем, ожидают повтора: %s',
+                notice.id, unfinished
+            )
+        else:
+            await AdminDAO.update_object(
+                session, notice.id, delivered_at=dt.datetime.now()
+            )
+            await checkpoint(session)
+        if sent or pruned:
+            await cls.report_to_admins(
+                bot, session,
+                f'Уведомление id={notice.id}: отправлено {sent}, '
+                f'исключено недоступных получателей {pruned}, '
+                f'ожидают повтора {unfinished}.'
+            )
 
+    @classmethod
+    def _failed_delivery(cls, row, error: str, unreachable: bool) -> dict:
+        attempts = row.attempts + 1
+        if unreachable:
+            status = DeliveryStatus.UNREACHABLE
+        elif attempts >= cls.max_attempts:
+            status = DeliveryStatus.DEAD
+        else:
+            status = DeliveryStatus.FAILED
+        return {
+            'id': row.id,
+            'status': status,
+            'attempts': attempts,
+            'last_error': error,
+            'next_attempt_at': (
+                dt.datetime.now() + cls.retry_base_delay * 2 ** (attempts - 1)
+            )
+        }
+
+    @classmethod
+    async def send_mass_admin_notification(cls, bot: Bot, session: AsyncSession):
+        async with cls._admin_lock:
+            notifications = await AdminDAO.get_new_notifications(session)
+            for notification in notifications:
+                await cls.deliver_notice(bot, session, notification)
@@ -1,19 +1,48 @@
+from datetime import datetime
 from aiogram.fsm.context import FSMContext
 from dao.pickpoint import PickPointDAO, PickPointRatingDAO
 from sqlalchemy.ext.asyncio import AsyncSession
 from services.base import BaseService
+from services.models import Page
 from exceptions.pickpoints import PickPointsNotFound, RatingRecordSaveError
 from exceptions.cache import InvalidItems
+from exceptions.writer import RowNotSaved
 
 
 class PickPointService(BaseService):
 
+    pickpoints_key = 'pickpoints'
+
+    @classmethod
+    async def _load_pickpoints_page(
+            cls, session: AsyncSession, after: int | None, before: int | None) -> Page:
+        pickpoints, has_prev, has_next = await PickPointDAO.find_page(
+            session, cls.page_size, after, before, is_active=True
+        )
+        return Page.build(
+            {pickpoint.id: pickpoint.name for pickpoint in pickpoints},
+            pickpoints, has_prev, has_next
+        )
+
     @classmethod
-    async def list_all_pickpoints(cls, session: AsyncSession) -> dict[int, str]:
-        pickpoints = await PickPointDAO.find_all(session, is_active=True)
-        if not pickpoints:
+    async def list_pickpoints_page(
+            cls, session: AsyncSession, state: FSMContext) -> Page:
+        page = await cls.get_page(
+            session, state, 'pickpoints', cls.pickpoints_key,
+            cls._load_pickpoints_page, PickPointDAO.get_version
+        )
+        if not page.items:
             raise PickPointsNotFound
-        return {pickpoint.id: pickpoint.name for pickpoint in pickpoints}
+        return page
+
+    @classmethod
+    async def get_pickpoint_name(
+            cls, session: AsyncSession, state: FSMContext, pickpoint_id: int) -> str:
+        snapshot = await cls.get_page_snapshot(
+            session, state, 'pickpoints', cls.pickpoints_key,
+            cls._load_pickpoints_page, PickPointDAO.get_version
+        )
+        return await cls.get_item_name(state, snapshot, pickpoint_id, 'pickpoints')
 
     @classmethod
     async def save_rating(cls, state: FSMContext, session: AsyncSession) -> None:
@@ -21,12 +50,14 @@ class PickPointService(BaseService):
             pickpoint_id, score, user_id, comment = await cls.get_variables_from_state(
                 state, ['pickpoint_id', 'score', 'user_id', 'comment']
             )
-            await PickPointRatingDAO.add_new_object(
+            await cls.write_queue.put(
                 session,
+                PickPointRatingDAO,
                 pickpoint_id=pickpoint_id,
                 user_id=user_id,
                 rating_score=score,
-                score_comment=comment
+                score_comment=comment,
+                created_at=datetime.now()
             )
-        except InvalidItems:
+        except (InvalidItems, RowNotSaved):
             raise RatingRecordSaveError
@@ -1,28 +1,95 @@
+from datetime import datetime
+from typing import Awaitable, Callable
+from aiogram import Bot
 from aiogram.fsm.context import FSMContext
+from aiogram.types import InputFile, Message
 from dao.siz import SIZTypeDAO, SIZModelDAO, SIZReviewDAO
-from services.models import SModel
-from sqlalchemy.ext.asyncio import AsyncSession
+from services.models import SModel, Page
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.exc import NoResultFound
 from services.base import BaseService
+from services.catalog import CatalogSnapshot
+from services.media import PhotoRegistry
 from exceptions.cache import InvalidVariable
+from exceptions.writer import RowNotSaved
 from exceptions.siz import NoTypesFound, NoModelsFound, InvalidModelError, ReviewSaveError
 
 
+async def photo_warm_up_job(bot: Bot, session_maker: async_sessionmaker, chat_id: int):
+    await SIZService.photos.warm_up(bot, session_maker, chat_id)
+
+
 class SIZService(BaseService):
 
+    types_key = 'siz_types'
+    photos = PhotoRegistry()
+
+    @staticmethod
+    def models_key(type_id: int) -> str:
+        return f'siz_models:{type_id}'
+
+    @staticmethod
+    async def _types_version(session: AsyncSession) -> tuple:
+        types_version = await SIZTypeDAO.get_version(session)
+        return types_version + await SIZModelDAO.get_version(session)
+
+    @classmethod
+    async def _load_types_page(
+            cls, session: AsyncSession, after: int | None, before: int | None) -> Page:
+        siz_types, has_prev, has_next = await SIZTypeDAO.get_filled_types_page(
+            session, cls.page_size, after, before
+        )
+        return Page.build(
+            {siz_type.id: siz_type.name for siz_type in siz_types},
+            siz_types, has_prev, has_next
+        )
+
     @classmethod
-    async def list_all_types(cls, session: AsyncSession) -> dict[int, str]:
-        siz_types = await SIZTypeDAO.get_filled_types(session)
-        if not siz_types:
+    async def _types_snapshot(
+            cls, session: AsyncSession, state: FSMContext) -> CatalogSnapshot:
+        return await cls.get_page_snapshot(
+            session, state, 'types', cls.types_key,
+            cls._load_types_page, cls._types_version
+        )
+
+    @classmethod
+    async def list_types_page(cls, session: AsyncSession, state: FSMContext) -> Page:
+        page = await cls.get_page(
+            session, state, 'types', cls.types_key,
+            cls._load_types_page, cls._types_version
+        )
+        if not page.items:
             raise NoTypesFound
-        return {siz_type.id: siz_type.name for siz_type in siz_types}
+        return page
 
     @classmethod
-    async def list_all_models_by_type(cls, session: AsyncSession, type_id: int) -> dict[int, str]:
-        siz_models = await SIZModelDAO.find_all(session, type_id=type_id, is_active=True)
-        if not siz_models:
+    async def list_models_page(
+            cls, session: AsyncSession, state: FSMContext, type_id: int) -> Page:
+        async def load_models(
+                async_session: AsyncSession, after: int | None, before: int | None
+        ) -> Page:
+            siz_models, has_prev, has_next = await SIZModelDAO.find_page(
+                async_session, cls.page_size, after, before,
+                type_id=type_id, is_active=True
+            )
+            return Page.build(
+                {siz_model.id: siz_model.name for siz_model in siz_models},
+                siz_models, has_prev, has_next
+            )
+
+        page = await cls.get_page(
+            session, state, 'models', cls.models_key(type_id),
+            load_models, SIZModelDAO.get_version
+        )
+        if not page.items:
             raise NoModelsFound
-        return {siz_model.id: siz_model.name for siz_model in siz_models}
+        return page
+
+    @classmethod
+    async def get_type_name(
+            cls, session: AsyncSession, state: FSMContext, type_id: int) -> str:
+        snapshot = await cls._types_snapshot(session, state)
+        return await cls.get_item_name(state, snapshot, type_id, 'types')
 
     @classmethod
     async def get_model_info(cls, session: AsyncSession, model_id: int) -> SModel:
@@ -36,14 +103,20 @@ class SIZService(BaseService):
                 writeoff_criteria=raw_model.writeoff_criteria,
                 operating_rules=raw_model.operating_rules,
                 file_id=raw_model.file_id,
-                file_name=raw_model.file_name
+                file_name=raw_model.file_name,
+                file_hash=raw_model.file_hash
             )
         except NoResultFound:
             raise InvalidModelError
 
     @classmethod
-    async def upload_model_file_id(cls, session: AsyncSession, model_id: int, file_id: str) -> None:
-        await SIZModelDAO.update_object(session, model_id, file_id=file_id)
+    async def send_model_photo(
+            cls,
+            session: AsyncSession,
+            model: SModel,
+            send: Callable[[str | InputFile], Awaitable[Message]]
+    ) -> Message:
+        return await cls.photos.send(session, model, send)
 
     @classmethod
     async def save_review(cls, session: AsyncSession, state: FSMContext) -> None:
@@ -51,11 +124,13 @@ class SIZService(BaseService):
             model_id, user_id, review_text = await cls.get_variables_from_state(
                 state, ['model_id', 'user_id', 'review']
             )
-            await SIZReviewDAO.add_new_object(
+            await cls.write_queue.put(
                 session,
+                SIZReviewDAO,
                 model_id=model_id,
                 user_id=user_id,
-                review_text=review_text
+                review_text=review_text,
+                created_at=datetime.now()
             )
-        except InvalidVariable:
+        except (InvalidVariable, RowNotSaved):
             raise ReviewSaveError
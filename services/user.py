@@ -3,12 +3,11 @@ from dao.user import UserDAO
 from exceptions.user import UserNotExist
 from sqlalchemy.ext.asyncio import AsyncSession
 from services.base import BaseService
+from database.uow import after_commit
 
 
 class UserService(BaseService):
 
-    admins = {1, 648987}
-
     @classmethod
     async def _get_user_by_phone(cls, phone_number: str, async_session: AsyncSession):
         phone_number = phone_number if len(phone_number) == 12 else f'+{phone_number}'
@@ -27,12 +26,25 @@ class UserService(BaseService):
             last_modified_at=datetime.now(),
             registered_at=datetime.now()
         )
+        after_commit(
+            async_session, lambda: cls.auth_cache.invalidate(user.tg_id, tg_id)
+        )
 
     @classmethod
     async def is_admin_user(cls, async_session: AsyncSession, tg_id: int) -> bool:
-        user = await UserDAO.find_one_or_none(async_session, tg_id=tg_id, is_active=True)
-        if user.id in cls.admins:
-            return True
-        return False
+        entry = await cls.get_auth_entry(async_session, tg_id)
+        return bool(entry and entry.is_admin)
 
+    @classmethod
+    def is_marked_unreachable(cls, tg_id: int) -> bool:
+        entry = cls.auth_cache.peek(tg_id)
+        return bool(entry and entry.is_unreachable)
 
+    @classmethod
+    async def mark_reachable(cls, async_session: AsyncSession, tg_id: int) -> None:
+        entry = await cls.get_auth_entry(async_session, tg_id)
+        if entry and entry.is_unreachable:
+            await UserDAO.update_object(
+                async_session, entry.user_id, unreachable_since=None
+            )
+            after_commit(async_session, lambda: cls.auth_cache.invalidate(tg_id))
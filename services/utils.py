@@ -1,39 +1,146 @@
+import asyncio
+import time
 from typing import Any, Callable, Optional
 from contextlib import suppress
 from aiogram import Bot
 from aiogram.types import CallbackQuery, Message
 from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State
 from aiogram.exceptions import TelegramBadRequest
 from services.models import TrackCallback
 
+# Telegram lets bots delete messages younger than 48 hours, at most 100 per request
+DELETE_WINDOW = 48 * 60 * 60 - 60
+DELETE_CHUNK_SIZE = 100
+
+TrackEntry = int | list[int]
+# [screen name, FSM state, id of the message showing the screen]
+NavEntry = list[str | int]
+
+_background_tasks: set[asyncio.Task] = set()
+
 
 async def add_message_to_track(message: Message, state: FSMContext) -> None:
     data: dict[str, Any] = await state.get_data()
-    track_list: list[int] | None = data.get('track_messages')
+    track_list: list[TrackEntry] | None = data.get('track_messages')
+    entry = [message.message_id, int(message.date.timestamp())]
     if track_list:
-        track_list.append(message.message_id)
+        track_list.append(entry)
     else:
-        track_list = [message.message_id]
+        track_list = [entry]
     await state.update_data(track_messages=track_list)
 
 
-async def _get_msg_stack(state: FSMContext) -> list[Message]:
+async def _get_msg_stack(state: FSMContext) -> list[TrackEntry]:
     data = await state.get_data()
-    return data.get('track_messages')
+    return data.get('track_messages') or []
+
+
+def _deletable_ids(entries: list[TrackEntry]) -> list[int]:
+    border = time.time() - DELETE_WINDOW
+    ids = []
+    for entry in entries:
+        if isinstance(entry, int):
+            ids.append(entry)
+        elif entry[1] > border:
+            ids.append(entry[0])
+    return ids
+
+
+async def delete_messages(bot: Bot, chat_id: int, entries: list[TrackEntry]) -> None:
+    ids = list(dict.fromkeys(_deletable_ids(entries)))
+    for i in range(0, len(ids), DELETE_CHUNK_SIZE):
+        with suppress(TelegramBadRequest):
+            await bot.delete_messages(
+                chat_id=chat_id, message_ids=ids[i:i + DELETE_CHUNK_SIZE]
+            )
+
+
+def schedule_messages_deletion(
+        bot: Bot, chat_id: int, entries: list[TrackEntry]) -> None:
+    if not entries:
+        return
+    task = asyncio.create_task(delete_messages(bot, chat_id, entries))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
 
 async def erase_last_messages(state: FSMContext, msg_cnt_to_delete: int, bot: Bot, chat_id: int) -> None:
     msg_stack = await _get_msg_stack(state)
-    with suppress(TelegramBadRequest):
-        await bot.delete_messages(chat_id=chat_id, message_ids=msg_stack[-msg_cnt_to_delete:])
+    schedule_messages_deletion(bot, chat_id, msg_stack[-msg_cnt_to_delete:])
+
+
+async def push_screen(
+        state: FSMContext,
+        screen: str,
+        fsm_state: State,
+        message_id: int,
+        root: bool = False
+) -> None:
+    """Puts ``screen`` on top of the navigation stack, replacing the same screen."""
+    data = await state.get_data()
+    nav: list[NavEntry] = [] if root else data.get('nav') or []
+    if nav and nav[-1][0] == screen:
+        nav.pop()
+    nav.append([screen, fsm_state.state, message_id])
+    await state.update_data(nav=nav)
+    await state.set_state(fsm_state)
+
+
+async def get_screen(
+        state: FSMContext, message_id: int | None = None) -> NavEntry | None:
+    """Current screen, or the screen currently shown in ``message_id``."""
+    data = await state.get_data()
+    for entry in reversed(data.get('nav') or []):
+        if message_id is None or entry[2] == message_id:
+            return entry
+
+
+async def move_screens(
+        state: FSMContext, old_message_id: int, new_message_id: int) -> None:
+    """Points the screens shown in ``old_message_id`` at its replacement message."""
+    data = await state.get_data()
+    nav: list[NavEntry] = data.get('nav') or []
+    if any(entry[2] == old_message_id for entry in nav):
+        for entry in nav:
+            if entry[2] == old_message_id:
+                entry[2] = new_message_id
+        await state.update_data(nav=nav)
+
+
+async def pop_screen(
+        state: FSMContext, message_id: int) -> tuple[NavEntry | None, list[int]]:
+    """Closes screens down to and including the one shown in ``message_id``.
+
+    Returns the screen to show next and ids of the closed messages that should be
+    removed from the chat.
+    """
+    data = await state.get_data()
+    nav: list[NavEntry] = data.get('nav') or []
+    if all(entry[2] != message_id for entry in nav):
+        return None, []
+    closed = []
+    while True:
+        entry = nav.pop()
+        closed.append(entry[2])
+        if entry[2] == message_id:
+            break
+    top = nav[-1] if nav else None
+    await state.update_data(nav=nav)
+    if top:
+        await state.set_state(top[1])
+    return top, [
+        msg_id for msg_id in dict.fromkeys(closed) if not top or msg_id != top[2]
+    ]
 
 
 async def set_track_callback(callback: CallbackQuery, message: Message, state: FSMContext) -> None:
     await state.update_data(
         cb=TrackCallback(
-            message=message,
+            chat_id=message.chat.id,
+            message_id=message.message_id,
             callback_data=callback.data
-        )
+        ).encode()
     )
 
 
@@ -41,28 +148,20 @@ async def get_track_callback(state: FSMContext) -> TrackCallback | None:
     data = await state.get_data()
     track_cb = data.get('cb')
     if track_cb:
-        return track_cb
+        return TrackCallback.decode(track_cb)
 
 
 async def update_track_callback(track_cb: TrackCallback, callback: CallbackQuery, state: FSMContext) -> None:
     track_cb.callback_data = callback.data
-    await state.update_data(cb=track_cb)
-
-
-async def _erase_track_messages(state: FSMContext, bot: Bot, chat_id: int) -> None:
-    data: dict[str, Any] = await state.get_data()
-    track_msgs = data.get('track_messages')
-    if track_msgs:
-        for msg_id in track_msgs:
-            with suppress(TelegramBadRequest):
-                await bot.delete_message(chat_id=chat_id, message_id=msg_id)
+    await state.update_data(cb=track_cb.encode())
 
 
 async def terminate_state_branch(message: Message, state: FSMContext, add_last: bool = True) -> None:
     if add_last:
         await add_message_to_track(message, state)
-    await _erase_track_messages(state, message.bot, message.chat.id)
+    msg_stack = await _get_msg_stack(state)
     await state.clear()
+    schedule_messages_deletion(message.bot, message.chat.id, msg_stack)
 
 
 async def save_variable_in_state(
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+from collections import defaultdict
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dao.base import BaseDAO
+from database.uow import checkpoint
+from exceptions.writer import RowNotSaved
+
+logger = logging.getLogger(__name__)
+
+_Item = tuple[type[BaseDAO], dict, asyncio.Future]
+
+
+class WriteBehindQueue:
+    """Buffers INSERTs and writes them as multi-row statements.
+
+    A batch is flushed when it reaches ``batch_size`` rows or ``flush_interval``
+    seconds after its first row. put() returns only once its row is committed and
+    raises RowNotSaved if it was dropped, so callers never confirm unsaved data.
+    If the queue is not running, or stays full for ``put_timeout`` seconds, the row
+    is inserted and committed directly with the caller's session.
+    """
+
+    def __init__(
+            self,
+            maxsize: int = 10_000,
+            batch_size: int = 500,
+            flush_interval: float = 0.2,
+            put_timeout: float = 2.0,
+            max_retries: int = 3,
+            drain_timeout: float = 10.0
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.max_retries = max_retries
+        self.drain_timeout = drain_timeout
+        self.enqueued = 0
+        self.flushed = 0
+        self.direct = 0
+        self.failed = 0
+        self._queue: asyncio.Queue[_Item] = asyncio.Queue(maxsize)
+        self._session_maker: async_sessionmaker | None = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self, session_maker: async_sessionmaker) -> None:
+        self._session_maker = session_maker
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.error(
+                'Write-behind queue was not drained in %ss', self.drain_timeout
+            )
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        while not self._queue.empty():
+            dao, _, result = self._queue.get_nowait()
+            self._reject(result, RowNotSaved(dao.model.__tablename__))
+            self._queue.task_done()
+        logger.info('Write-behind queue stopped: %s', self.stats())
+
+    async def put(self, session: AsyncSession, dao: type[BaseDAO], **row) -> None:
+        if self._task:
+            result = asyncio.get_running_loop().create_future()
+            try:
+                await asyncio.wait_for(
+                    self._queue.put((dao, row, result)), self.put_timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    'Write-behind queue is full, inserting %s directly',
+                    dao.model.__tablename__
+                )
+            else:
+                self.enqueued += 1
+                await asyncio.shield(result)
+                return
+        await dao.add_new_object(session, **row)
+        await checkpoint(session)
+        self.direct += 1
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                await self._fill(batch)
+                await self._flush(batch)
+            except asyncio.CancelledError:
+                for dao, _, result in batch:
+                    self._reject(result, RowNotSaved(dao.model.__tablename__))
+                raise
+            except Exception as e:
+                logger.exception('Write-behind flush of %s rows failed', len(batch))
+                for dao, _, result in batch:
+                    self._reject(result, RowNotSaved(dao.model.__tablename__), e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _fill(self, batch: list[_Item]) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+    async def _flush(self, batch: list[_Item]) -> None:
+        grouped: defaultdict[type[BaseDAO], list[tuple[dict, asyncio.Future]]] = (
+            defaultdict(list)
+        )
+        for dao, row, result in batch:
+            grouped[dao].append((row, result))
+        for dao, items in grouped.items():
+            rows = [row for row, _ in items]
+            for attempt in range(self.max_retries):
+                try:
+                    async with self._session_maker() as session:
+                        self.flushed += await dao.insert_many(session, rows)
+                except Exception as e:
+                    logger.warning(
+                        'Failed to flush %s rows into %s: %s',
+                        len(rows), dao.model.__tablename__, e
+                    )
+                    await asyncio.sleep(2 ** attempt)
+                else:
+                    for _, result in items:
+                        self._resolve(result)
+                    break
+            else:
+                await self._flush_one_by_one(dao, items)
+
+    async def _flush_one_by_one(
+            self,
+            dao: type[BaseDAO],
+            items: list[tuple[dict, asyncio.Future]]
+    ) -> None:
+        for row, result in items:
+            try:
+                async with self._session_maker() as session:
+                    await dao.add_new_object(session, **row)
+            except Exception as e:
+                logger.error(
+                    'Dropped row for %s: %s (%s)', dao.model.__tablename__, row, e
+                )
+                self._reject(result, RowNotSaved(dao.model.__tablename__), e)
+            else:
+                self.flushed += 1
+                self._resolve(result)
+
+    @staticmethod
+    def _resolve(result: asyncio.Future) -> None:
+        if not result.done():
+            result.set_result(None)
+
+    def _reject(
+            self,
+            result: asyncio.Future,
+            error: RowNotSaved,
+            cause: BaseException | None = None
+    ) -> None:
+        if result.done():
+            return
+        self.failed += 1
+        error.__cause__ = cause
+        result.set_exception(error)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'queued': self._queue.qsize(),
+            'enqueued': self.enqueued,
+            'flushed': self.flushed,
+            'direct': self.direct,
+            'failed': self.failed
+        }
@@ -15,3 +15,14 @@ class TypeCallbackFactory(CallbackData, prefix='type'):
 
 class ModelCallbackFactory(CallbackData, prefix='model'):
     sizmodel_id: int
+
+
+class ModelTabCallbackFactory(CallbackData, prefix='tab'):
+    sizmodel_id: int
+    tab: str
+
+
+class PageCallbackFactory(CallbackData, prefix='page'):
+    catalog: str
+    after: int | None = None
+    before: int | None = None
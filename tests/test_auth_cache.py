@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+import pytest
+
+from services import base
+from services.base import AuthCache, BaseService
+from services.models import AuthEntry
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(base.time, 'monotonic', clock)
+    return clock
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = AuthCache(ttl=10)
+    entry = AuthEntry(user_id=1, is_active=True, is_admin=False)
+    cache.set(100, entry)
+    assert cache.get(100) is entry
+    clock.now += 11
+    assert cache.get(100) is base._MISSING
+    assert cache.stats() == {'size': 0, 'hits': 1, 'misses': 1, 'hit_ratio': 0.5}
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = AuthCache(maxsize=2)
+    cache.set(1, None)
+    cache.set(2, None)
+    cache.get(1)
+    cache.set(3, None)
+    assert cache.get(2) is base._MISSING
+    assert cache.get(1) is None
+    assert cache.get(3) is None
+
+
+def test_negative_entries_are_cached_and_invalidated(clock):
+    cache = AuthCache()
+    cache.set(1, None)
+    assert cache.get(1) is None
+    cache.invalidate(1, None)
+    assert cache.get(1) is base._MISSING
+
+
+def test_negative_entries_expire_after_negative_ttl(clock):
+    cache = AuthCache(ttl=300, negative_ttl=5)
+    cache.set(1, None)
+    cache.set(2, AuthEntry(user_id=2, is_active=True, is_admin=False))
+    clock.now += 6
+    assert cache.get(1) is base._MISSING
+    assert cache.get(2) is not base._MISSING
+
+
+async def test_auth_entry_is_loaded_once(monkeypatch):
+    calls = []
+
+    async def find_one_or_none(session, **filters):
+        calls.append(filters)
+        return SimpleNamespace(id=1, is_active=True, unreachable_since=None)
+
+    monkeypatch.setattr(base.UserDAO, 'find_one_or_none', find_one_or_none)
+    monkeypatch.setattr(BaseService, 'auth_cache', AuthCache())
+    first = await BaseService.get_auth_entry(None, 500)
+    second = await BaseService.get_auth_entry(None, 500)
+    assert first == second == AuthEntry(user_id=1, is_active=True, is_admin=True)
+    assert calls == [{'tg_id': 500, 'is_active': True}]
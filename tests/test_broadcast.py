@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramRetryAfter,
+)
+from aiogram.methods import SendMessage
+
+from services import broadcast
+from services.broadcast import Broadcaster, TokenBucket
+
+METHOD = SendMessage(chat_id=1, text='hi')
+real_sleep = asyncio.sleep
+
+
+class Clock:
+    """monotonic() that only moves when the code under test sleeps.
+
+    Like a real clock it always moves forward, by at least a microsecond.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += max(seconds, 1e-6)
+        await real_sleep(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(broadcast.time, 'monotonic', clock)
+    monkeypatch.setattr(broadcast.asyncio, 'sleep', clock.sleep)
+    return clock
+
+
+class FakeBot:
+    """send_message raises the queued errors of a chat in order, then succeeds."""
+
+    def __init__(self, errors: dict[int, list[Exception]] | None = None):
+        self.errors = errors or {}
+        self.sent = []
+
+    async def send_message(self, chat_id, text):
+        if self.errors.get(chat_id):
+            raise self.errors[chat_id].pop(0)
+        self.sent.append(chat_id)
+
+
+def retry_after(seconds: int) -> TelegramRetryAfter:
+    return TelegramRetryAfter(METHOD, 'Flood control exceeded', seconds)
+
+
+async def test_bucket_spends_the_burst_then_keeps_the_rate(clock):
+    bucket = TokenBucket(rate=10)
+    for _ in range(10):
+        await bucket.acquire()
+    assert clock.slept == []
+
+    for _ in range(10):
+        await bucket.acquire()
+    assert clock.now - 1000.0 == pytest.approx(1.0, abs=1e-3)
+
+
+async def test_pause_holds_every_sender_until_retry_after(clock):
+    bucket = TokenBucket(rate=10)
+    bucket.pause(5)
+    await bucket.acquire()
+    assert clock.now - 1000.0 >= 5
+
+
+async def test_flood_wait_is_retried_after_a_pause(clock):
+    bot = FakeBot({1: [retry_after(3), retry_after(3)]})
+    stats = await Broadcaster(rate=100).broadcast(bot, [1, 2], 'hi')
+
+    assert (stats.sent, stats.failed, stats.retries) == (2, 0, 2)
+    assert bot.sent == [2, 1]
+    assert clock.now - 1000.0 >= 6
+
+
+async def test_chat_is_failed_after_max_retries(clock):
+    bot = FakeBot({1: [retry_after(1) for _ in range(5)]})
+    stats = await Broadcaster(rate=100, max_retries=2).broadcast(bot, [1], 'hi')
+
+    assert (stats.sent, stats.failed, stats.retries) == (0, 1, 3)
+    assert 1 in stats.failures
+    assert stats.unreachable == set()
+
+
+async def test_blocked_and_missing_chats_are_unreachable(clock):
+    bot = FakeBot({
+        1: [TelegramForbiddenError(METHOD, 'Forbidden: bot was blocked by the user')],
+        2: [TelegramBadRequest(METHOD, 'Bad Request: chat not found')],
+        3: [TelegramBadRequest(METHOD, 'Bad Request: message is too long')],
+    })
+    stats = await Broadcaster(rate=100).broadcast(bot, [1, 2, 3, 4], 'hi')
+
+    assert (stats.sent, stats.failed) == (1, 3)
+    assert set(stats.failures) == {1, 2, 3}
+    assert stats.unreachable == {1, 2}
+
+
+async def test_senders_are_capped_by_concurrency():
+    running = peak = 0
+
+    class SlowBot:
+        async def send_message(self, chat_id, text):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    stats = await Broadcaster(rate=1000, concurrency=3).broadcast(
+        SlowBot(), list(range(10)), 'hi'
+    )
+
+    assert stats.sent == 10
+    assert peak == 3
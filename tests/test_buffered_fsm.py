@@ -0,0 +1,86 @@
+import pytest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from middlewares.global_middlewares import BufferedFSMContext, FSMUnitOfWorkMiddleware
+
+KEY = StorageKey(bot_id=1, chat_id=1, user_id=1)
+
+
+def buffered(storage: MemoryStorage) -> BufferedFSMContext:
+    return BufferedFSMContext(FSMContext(storage=storage, key=KEY), raw_state=None)
+
+
+async def test_concurrent_updates_keep_each_others_keys():
+    storage = MemoryStorage()
+    await storage.set_data(key=KEY, data={'user_id': 1})
+    first, second = buffered(storage), buffered(storage)
+    await first.get_data()
+    await second.get_data()
+    await first.update_data(score=5)
+    await second.update_data(comment='ok')
+    await first.flush()
+    await second.flush()
+    expected = {'user_id': 1, 'score': 5, 'comment': 'ok'}
+    assert await storage.get_data(key=KEY) == expected
+
+
+async def test_nested_changes_are_detected():
+    storage = MemoryStorage()
+    await storage.set_data(key=KEY, data={'nav': [['types', 'state', 10]]})
+    state = buffered(storage)
+    data = await state.get_data()
+    data['nav'].append(['models', 'state', 10])
+    await state.update_data(nav=data['nav'])
+    await state.flush()
+    stored = await storage.get_data(key=KEY)
+    assert stored['nav'] == [['types', 'state', 10], ['models', 'state', 10]]
+
+
+async def test_mutating_returned_data_does_not_leak_into_the_buffer():
+    storage = MemoryStorage()
+    await storage.set_data(key=KEY, data={'nav': [1]})
+    state = buffered(storage)
+    (await state.get_data())['nav'].append(2)
+    assert await state.get_data() == {'nav': [1]}
+    await state.flush()
+    assert await storage.get_data(key=KEY) == {'nav': [1]}
+
+
+async def test_clear_replaces_data_and_state():
+    storage = MemoryStorage()
+    await storage.set_data(key=KEY, data={'a': 1})
+    await storage.set_state(key=KEY, state='S:x')
+    state = buffered(storage)
+    await state.clear()
+    await state.flush()
+    assert await storage.get_data(key=KEY) == {}
+    assert await storage.get_state(key=KEY) is None
+
+
+async def test_untouched_context_writes_nothing():
+    storage = MemoryStorage()
+    writes = []
+    storage.set_data = lambda **kwargs: writes.append(kwargs)
+    state = buffered(storage)
+    await state.get_data()
+    await state.flush()
+    assert writes == []
+
+
+async def test_failed_update_writes_no_fsm_changes():
+    storage = MemoryStorage()
+    await storage.set_data(key=KEY, data={'user_id': 1})
+
+    async def handler(event, data):
+        await data['state'].update_data(score=5)
+        await data['state'].set_state('rating')
+        raise RuntimeError('rolled back')
+
+    data = {'state': FSMContext(storage=storage, key=KEY), 'raw_state': None}
+    with pytest.raises(RuntimeError):
+        await FSMUnitOfWorkMiddleware()(handler, None, data)
+
+    assert await storage.get_data(key=KEY) == {'user_id': 1}
+    assert await storage.get_state(key=KEY) is None
@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from dao.admin import NoticeDeliveryDAO
+
+
+class CapturingSession:
+
+    def __init__(self):
+        self.info = {'unit_of_work': True}
+        self.statements = []
+
+    async def execute(self, query):
+        self.statements.append(str(query.compile(dialect=postgresql.dialect())))
+        return type('Result', (), {'rowcount': 1})()
+
+    async def flush(self):
+        pass
+
+
+async def test_upsert_many_requires_a_conflict_target():
+    with pytest.raises(TypeError):
+        await NoticeDeliveryDAO.upsert_many(
+            CapturingSession(), [{'notice_id': 1, 'user_id': 2}]
+        )
+
+
+async def test_upsert_many_updates_non_key_columns_on_the_given_target():
+    session = CapturingSession()
+    rows = [{'notice_id': 1, 'user_id': 2, 'status': 'pending'}]
+    await NoticeDeliveryDAO.upsert_many(session, rows, ('notice_id', 'user_id'))
+
+    [statement] = session.statements
+    assert (
+        'ON CONFLICT (notice_id, user_id) DO UPDATE SET status = excluded.status'
+        in statement
+    )
+    assert 'INSERT INTO notice_delivery (notice_id, user_id, status' in statement
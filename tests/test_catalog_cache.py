@@ -0,0 +1,102 @@
+import asyncio
+
+from services import catalog
+from services.catalog import CatalogCache
+
+
+def loader(items):
+    async def load(session):
+        return items
+    return load
+
+
+async def version(session):
+    return (1,)
+
+
+async def test_least_recently_used_snapshot_is_evicted():
+    cache = CatalogCache(max_snapshots=2)
+    await cache.get(None, 'types', ':', loader('first'), version)
+    await cache.get(None, 'types', '5:', loader('second'), version)
+    await cache.get(None, 'types', ':', loader('first'), version)
+    await cache.get(None, 'types', '9:', loader('third'), version)
+
+    assert cache.stamp('types', '5:') is None
+    assert cache.stamp('types', ':') == cache.stamp('types', '9:') == '1'
+    assert cache.stats()['snapshots'] == 2
+    assert cache.stats()['evictions'] == 1
+
+
+async def test_version_is_read_once_per_catalog_for_all_its_pages():
+    cache, checks = CatalogCache(), []
+
+    async def counted_version(session):
+        checks.append(1)
+        return (1,)
+
+    for page in (':', '5:', ':9'):
+        await cache.get(None, 'faq', page, loader(page), counted_version)
+    await cache.get(None, 'pickpoints', ':', loader('pickpoints'), counted_version)
+
+    assert len(checks) == 2
+    assert cache.stats()['version_checks'] == 2
+
+
+async def test_invalidate_drops_only_that_catalog():
+    cache = CatalogCache()
+    await cache.get(None, 'faq', ':', loader('faq'), version)
+    await cache.get(None, 'pickpoints', ':', loader('pickpoints'), version)
+
+    cache.invalidate('faq')
+
+    assert cache.stamp('faq', ':') is None
+    assert cache.stamp('pickpoints', ':') == '1'
+    assert cache.stats()['catalogs'] == 1
+
+
+async def test_snapshot_is_reloaded_only_when_the_version_moves(monkeypatch):
+    now, current, loads = [0.0], [(1,)], []
+    monkeypatch.setattr(catalog.time, 'monotonic', lambda: now[0])
+    cache = CatalogCache(check_interval=30)
+
+    async def load(session):
+        loads.append(current[0])
+        return current[0]
+
+    async def moving_version(session):
+        return current[0]
+
+    await cache.get(None, 'faq', ':', load, moving_version)
+    now[0] = 60
+    await cache.get(None, 'faq', ':', load, moving_version)
+    assert loads == [(1,)]
+
+    current[0] = (2,)
+    now[0] = 70
+    await cache.get(None, 'faq', ':', load, moving_version)
+    assert loads == [(1,)]
+    now[0] = 100
+    snapshot = await cache.get(None, 'faq', ':', load, moving_version)
+    assert loads == [(1,), (2,)]
+    assert snapshot.items == (2,)
+
+
+async def test_concurrent_misses_share_one_load():
+    cache, release, loads = CatalogCache(), asyncio.Event(), []
+
+    async def slow_load(session):
+        loads.append(1)
+        await release.wait()
+        return 'items'
+
+    waiting = [
+        asyncio.create_task(cache.get(None, 'faq', ':', slow_load, version))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    snapshots = await asyncio.gather(*waiting)
+
+    assert loads == [1]
+    assert {snapshot.items for snapshot in snapshots} == {'items'}
+    assert cache.stats()['loads'] == 1
@@ -0,0 +1,163 @@
+import json
+from collections import namedtuple
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from services import eis
+from services.eis import EISExporter
+
+ReviewRow = namedtuple('ReviewRow', 'id review_text')
+
+
+class FakeSession:
+
+    def __init__(self):
+        self.info = {}
+
+    async def commit(self):
+        pass
+
+
+@asynccontextmanager
+async def session_maker():
+    yield FakeSession()
+
+
+class FakeBatches:
+    """In-memory eis_export_batch: id -> row ids."""
+
+    def __init__(self):
+        self.open = {}
+        self.next_id = 1
+
+    async def open_batch(self, session, table_name, ids):
+        batch_id, self.next_id = self.next_id, self.next_id + 1
+        self.open[batch_id] = list(ids)
+        return batch_id
+
+    async def get_open(self, session, table_name):
+        return sorted(self.open.items())
+
+    async def close_batch(self, session, batch_id):
+        del self.open[batch_id]
+
+
+class FakeReviewDAO:
+    model = SimpleNamespace(__tablename__='sizmodel_review')
+    rows: dict[int, dict] = {}
+
+    @classmethod
+    def add(cls, *ids):
+        for row_id in ids:
+            cls.rows[row_id] = {'text': f'review {row_id}', 'sent': False}
+
+    @classmethod
+    async def stream_unsent(cls, session, after_id, window, batch_size):
+        unsent = [
+            ReviewRow(row_id, row['text'])
+            for row_id, row in sorted(cls.rows.items())
+            if not row['sent'] and row_id > after_id
+        ][:window]
+        for start in range(0, len(unsent), batch_size):
+            yield unsent[start:start + batch_size]
+
+    @classmethod
+    async def get_rows(cls, session, ids):
+        return [ReviewRow(row_id, cls.rows[row_id]['text']) for row_id in sorted(ids)]
+
+    @classmethod
+    async def mark_sent(cls, session, ids):
+        for row_id in ids:
+            cls.rows[row_id]['sent'] = True
+        return len(ids)
+
+
+class StubSink:
+
+    def __init__(self, fail_on: int | None = None):
+        self.fail_on = fail_on
+        self.sent: list[tuple[str, list[int]]] = []
+
+    async def send(self, key, payload, content_type, extension):
+        ids = [json.loads(line)['id'] for line in payload.splitlines()]
+        self.sent.append((key, ids))
+        if len(self.sent) == self.fail_on:
+            raise ConnectionError('sink went away')
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    ledger = FakeBatches()
+    monkeypatch.setattr(eis, 'EISExportBatchDAO', ledger)
+    FakeReviewDAO.rows = {}
+    return ledger
+
+
+async def test_batches_are_keyed_by_ledger_id_and_closed(batches):
+    FakeReviewDAO.add(1, 2, 3, 4, 5)
+    sink = StubSink()
+    stats = await EISExporter(sink, batch_size=2).export(session_maker, FakeReviewDAO)
+
+    assert sink.sent == [
+        ('sizmodel_review-1', [1, 2]),
+        ('sizmodel_review-2', [3, 4]),
+        ('sizmodel_review-3', [5])
+    ]
+    assert stats.rows == stats.marked == 5
+    assert batches.open == {}
+
+
+async def test_batch_interrupted_by_crash_is_resent_with_same_key_and_rows(batches):
+    FakeReviewDAO.add(1, 2, 3)
+    sink = StubSink(fail_on=2)
+    with pytest.raises(ConnectionError):
+        await EISExporter(sink, batch_size=2).export(session_maker, FakeReviewDAO)
+    assert batches.open == {2: [3]}
+
+    FakeReviewDAO.add(4)
+    sink = StubSink()
+    await EISExporter(sink, batch_size=2).export(session_maker, FakeReviewDAO)
+
+    assert sink.sent == [('sizmodel_review-2', [3]), ('sizmodel_review-3', [4])]
+    assert all(row['sent'] for row in FakeReviewDAO.rows.values())
+    assert batches.open == {}
+
+
+async def test_crash_after_send_before_mark_resends_same_batch(batches, monkeypatch):
+    FakeReviewDAO.add(1, 2)
+    sink = StubSink()
+
+    async def lost_connection(session, ids):
+        raise ConnectionError('db went away')
+
+    monkeypatch.setattr(FakeReviewDAO, 'mark_sent', lost_connection)
+    with pytest.raises(ConnectionError):
+        await EISExporter(sink).export(session_maker, FakeReviewDAO)
+    monkeypatch.undo()
+    monkeypatch.setattr(eis, 'EISExportBatchDAO', batches)
+
+    FakeReviewDAO.add(3)
+    await EISExporter(sink).export(session_maker, FakeReviewDAO)
+
+    assert sink.sent == [
+        ('sizmodel_review-1', [1, 2]),
+        ('sizmodel_review-1', [1, 2]),
+        ('sizmodel_review-2', [3])
+    ]
+
+
+async def test_export_stops_between_batches_when_lease_is_lost(batches, monkeypatch):
+    FakeReviewDAO.add(1, 2, 3, 4, 5)
+    held = iter([True, False])
+    monkeypatch.setattr(eis, 'lease_held', lambda: next(held))
+    sink = StubSink()
+    stats = await EISExporter(sink, batch_size=2).export(session_maker, FakeReviewDAO)
+
+    assert sink.sent == [('sizmodel_review-1', [1, 2])]
+    assert stats.marked == 2
+    assert batches.open == {}
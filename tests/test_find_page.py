@@ -0,0 +1,113 @@
+import datetime as dt
+
+import pytest
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import Session
+
+from dao.faq import FaqDAO
+from dao.pickpoint import PickPointDAO
+from database.models import SIZFAQ, PickPoint, QuestionPriority
+
+NAMES = ['Арбат', 'Балтийская', 'Витебская', 'Гоголя', 'Дмитров', 'Ельня', 'Жуковка']
+
+
+class SyncSession:
+    """Runs the DAO's awaited statements on a synchronous SQLite session."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, query, *args):
+        return self.session.execute(query, *args)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite://')
+    tables = [PickPoint.__table__, QuestionPriority.__table__, SIZFAQ.__table__]
+    PickPoint.metadata.create_all(engine, tables=tables)
+    now = dt.datetime.now()
+    with Session(engine) as sync_session:
+        # ids run against the name order so paging must follow (name, id)
+        sync_session.execute(insert(PickPoint), [
+            {'id': 10 - i, 'name': name, 'is_active': True, 'last_modified_at': now}
+            for i, name in enumerate(NAMES)
+        ])
+        sync_session.execute(insert(QuestionPriority), [
+            {'id': 1, 'name': 'high', 'order_value': 2},
+            {'id': 2, 'name': 'low', 'order_value': 1}
+        ])
+        sync_session.execute(insert(SIZFAQ), [
+            {'id': i, 'priority_id': 1 + i % 2, 'question_text': f'q{i}',
+             'answer_text': 'a', 'is_active': True, 'last_modified_at': now}
+            for i in range(1, 6)
+        ])
+        yield SyncSession(sync_session)
+
+
+async def page(session, after=None, before=None):
+    rows, has_prev, has_next = await PickPointDAO.find_page(
+        session, 3, after, before, is_active=True
+    )
+    return [row.name for row in rows], has_prev, has_next
+
+
+async def test_forward_paging_follows_name_order(session):
+    first = await page(session)
+    assert first == (NAMES[:3], False, True)
+    rows, _, _ = await PickPointDAO.find_page(session, 3, is_active=True)
+
+    second = await page(session, after=rows[-1].id)
+    assert second == (NAMES[3:6], True, True)
+
+    rows, _, _ = await PickPointDAO.find_page(
+        session, 3, after=rows[-1].id, is_active=True
+    )
+    assert await page(session, after=rows[-1].id) == (NAMES[6:], True, False)
+
+
+async def test_backward_paging_always_reports_a_next_page(session):
+    last_id = 10 - NAMES.index('Жуковка')
+    assert await page(session, before=last_id) == (NAMES[3:6], True, True)
+
+    second_id = 10 - NAMES.index('Гоголя')
+    assert await page(session, before=second_id) == (NAMES[:3], False, True)
+
+
+async def test_deactivated_cursor_still_bounds_the_page(session):
+    cursor_id = 10 - NAMES.index('Витебская')
+    session.session.execute(
+        update(PickPoint).where(PickPoint.id == cursor_id).values(is_active=False)
+    )
+
+    assert await page(session, after=cursor_id) == (NAMES[3:6], True, True)
+    assert await page(session, before=cursor_id) == (NAMES[:2], False, True)
+
+
+async def test_deleted_cursor_falls_back_to_the_first_page(session):
+    assert await page(session, after=999) == (NAMES[:3], False, True)
+    assert await page(session, before=999) == (NAMES[:3], False, True)
+
+
+async def test_faq_pages_by_joined_priority_then_id(session):
+    rows, has_prev, has_next = await FaqDAO.find_page_sort_by_priority(session, 2)
+    assert ([row.id for row in rows], has_prev, has_next) == ([1, 3], False, True)
+
+    rows, has_prev, has_next = await FaqDAO.find_page_sort_by_priority(
+        session, 2, after=3
+    )
+    assert ([row.id for row in rows], has_prev, has_next) == ([5, 2], True, True)
+
+    rows, has_prev, has_next = await FaqDAO.find_page_sort_by_priority(
+        session, 2, before=2
+    )
+    assert ([row.id for row in rows], has_prev, has_next) == ([3, 5], True, True)
+
+
+async def test_faq_version_moves_when_a_priority_is_reordered(session):
+    before = await FaqDAO.get_version(session)
+    session.session.execute(
+        update(QuestionPriority).where(QuestionPriority.id == 1).values(order_value=0)
+    )
+
+    assert await FaqDAO.get_version(session) != before
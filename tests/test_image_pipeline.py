@@ -0,0 +1,49 @@
+import io
+
+import pytest
+
+from services import images
+from services.images import ImagePipeline
+
+
+async def test_prepare_reuses_result_until_the_file_changes(tmp_path):
+    source = tmp_path / 'helmet.jpg'
+    source.write_bytes(b'first')
+    pipeline = ImagePipeline(images_dir=tmp_path, cache_dir=tmp_path / 'cache')
+
+    first = await pipeline.prepare('helmet.jpg')
+    assert await pipeline.prepare('helmet.jpg') is first
+
+    source.write_bytes(b'second version')
+    changed = await pipeline.prepare('helmet.jpg')
+    assert changed.key != first.key
+
+
+async def test_prepare_all_skips_images_that_fail(tmp_path):
+    (tmp_path / 'a.jpg').write_bytes(b'a')
+    (tmp_path / 'broken.jpg').mkdir()
+    (tmp_path / 'c.jpg').write_bytes(b'c')
+
+    pipeline = ImagePipeline(images_dir=tmp_path, cache_dir=tmp_path / 'cache')
+    prepared = await pipeline.prepare_all()
+
+    assert [image.source.name for image in prepared] == ['a.jpg', 'c.jpg']
+
+
+async def test_prepare_all_without_images_dir_returns_nothing(tmp_path):
+    assert await ImagePipeline(images_dir=tmp_path / 'missing').prepare_all() == []
+
+
+def test_recompress_applies_exif_orientation_before_resizing():
+    Image = pytest.importorskip('PIL.Image')
+    assert images.Image is not None
+    source = Image.new('RGB', (400, 200), 'red')
+    exif = source.getexif()
+    exif[0x0112] = 6
+    buffer = io.BytesIO()
+    source.save(buffer, 'JPEG', exif=exif)
+
+    output = ImagePipeline(max_side=100)._recompress(buffer.getvalue())
+
+    with Image.open(io.BytesIO(output)) as result:
+        assert result.size == (50, 100)
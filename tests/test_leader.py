@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from services import leader
+from services.leader import LeaderElector
+
+
+class FakeRedis:
+    """Just the lease commands LeaderElector uses; expiry is driven by ``advance``."""
+
+    def __init__(self):
+        self.now = 0
+        self.values: dict[str, tuple[str, int]] = {}
+        self.down = False
+
+    def advance(self, ms: int) -> None:
+        self.now += ms
+
+    def _get(self, key: str) -> str | None:
+        item = self.values.get(key)
+        if item and item[1] > self.now:
+            return item[0]
+        self.values.pop(key, None)
+
+    async def set(self, key, value, nx=False, px=None):
+        if self.down:
+            raise ConnectionError('down')
+        if nx and self._get(key) is not None:
+            return None
+        self.values[key] = (value, self.now + px)
+        return True
+
+    async def eval(self, script, numkeys, key, identity, *args):
+        if self.down:
+            raise ConnectionError('down')
+        if self._get(key) != identity:
+            return 0
+        if script == leader._RENEW_SCRIPT:
+            self.values[key] = (identity, self.now + int(args[0]))
+        elif script == leader._RELEASE_SCRIPT:
+            del self.values[key]
+        return 1
+
+
+def elector(redis: FakeRedis, name: str, **kwargs) -> LeaderElector:
+    instance = LeaderElector(redis, ttl=3, **kwargs)
+    instance.identity = name
+    return instance
+
+
+async def test_only_one_replica_holds_the_lease():
+    redis = FakeRedis()
+    first, second = elector(redis, 'a'), elector(redis, 'b')
+    await first._tick()
+    await second._tick()
+    assert first.is_leader and not second.is_leader
+
+
+async def test_renewal_keeps_the_lease_and_expiry_hands_it_over():
+    redis = FakeRedis()
+    elected = []
+    first = elector(redis, 'a')
+    second = elector(redis, 'b', on_elected=lambda: elected.append('b'))
+    await first._tick()
+    redis.advance(2000)
+    await first._tick()
+    redis.advance(2000)
+    await second._tick()
+    assert first.is_leader and not second.is_leader
+    redis.advance(3001)
+    await second._tick()
+    await first._tick()
+    assert second.is_leader and not first.is_leader
+    assert elected == ['b']
+    assert first.stats()['lost'] == 1
+
+
+async def test_release_frees_the_lease_only_for_its_holder():
+    redis = FakeRedis()
+    first, second = elector(redis, 'a'), elector(redis, 'b')
+    await first._tick()
+    await second.stop()
+    assert redis._get(first.key) == 'a'
+    await first.stop()
+    assert redis._get(first.key) is None
+    await second._tick()
+    assert second.is_leader
+
+
+async def test_redis_failure_demotes_the_leader(monkeypatch):
+    async def stop_loop(seconds):
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(leader.asyncio, 'sleep', stop_loop)
+    redis = FakeRedis()
+    first = elector(redis, 'a')
+    await first._tick()
+    redis.down = True
+    with pytest.raises(asyncio.CancelledError):
+        await first._run()
+    assert not first.is_leader
+    assert first.stats()['lost'] == 1
+
+
+async def test_guard_runs_jobs_only_on_the_leader():
+    redis = FakeRedis()
+    first, second = elector(redis, 'a'), elector(redis, 'b')
+    await first._tick()
+    await second._tick()
+    runs = []
+
+    async def job(name):
+        runs.append(name)
+
+    await first.guard(job)('a')
+    await second.guard(job)('b')
+    assert runs == ['a']
+
+
+async def test_lease_held_turns_false_inside_a_job_once_the_lease_is_lost():
+    redis = FakeRedis()
+    first = elector(redis, 'a')
+    await first._tick()
+    seen = []
+
+    async def job():
+        seen.append(leader.lease_held())
+        first.is_leader = False
+        seen.append(leader.lease_held())
+
+    await first.guard(job)()
+    assert seen == [True, False]
+    assert leader.lease_held()
@@ -0,0 +1,142 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from handlers import user_router
+from services import notification
+from services.broadcast import BroadcastStats
+from services.notification import NotificationService
+
+
+class Sessions:
+    """session_maker that counts the sessions open at any moment."""
+
+    def __init__(self):
+        self.open = 0
+
+    def __call__(self):
+        return FakeSession(self)
+
+
+class FakeSession:
+    def __init__(self, sessions: Sessions):
+        self.sessions = sessions
+        self.info = {}
+
+    async def __aenter__(self):
+        self.sessions.open += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        self.sessions.open -= 1
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+class FakeBroadcaster:
+    def __init__(self, sessions: Sessions, unreachable: set[int]):
+        self.sessions = sessions
+        self.unreachable = unreachable
+        self.open_while_sending = None
+
+    async def broadcast(self, bot, chat_ids, text):
+        self.open_while_sending = self.sessions.open
+        stats = BroadcastStats(total=len(chat_ids))
+        stats.sent = len(chat_ids) - len(self.unreachable)
+        stats.failed = len(self.unreachable)
+        stats.unreachable = set(self.unreachable)
+        return stats
+
+
+class FakeBot:
+    def __init__(self):
+        self.messages = []
+
+    async def send_message(self, chat_id, text):
+        self.messages.append((chat_id, text))
+
+
+@pytest.fixture
+def users(monkeypatch):
+    marked = []
+
+    async def get_all_bot_users(session):
+        return [SimpleNamespace(tg_id=1), SimpleNamespace(tg_id=2)]
+
+    async def mark_unreachable(session, tg_ids):
+        marked.append(tg_ids)
+
+    monkeypatch.setattr(notification.UserDAO, 'get_all_bot_users', get_all_bot_users)
+    monkeypatch.setattr(notification.UserDAO, 'mark_unreachable', mark_unreachable)
+    return marked
+
+
+async def test_broadcast_holds_no_session_and_reports_to_the_admin(users, monkeypatch):
+    sessions, bot = Sessions(), FakeBot()
+    broadcaster = FakeBroadcaster(sessions, unreachable={2})
+    monkeypatch.setattr(NotificationService, 'broadcaster', broadcaster)
+
+    await NotificationService.run_mass_notification(bot, 'hi', sessions, chat_id=99)
+
+    assert broadcaster.open_while_sending == 0
+    assert users == [{2}]
+    assert bot.messages == [
+        (99, 'Сообщение отправлено: 1 из 2. Исключено недоступных получателей: 1')
+    ]
+
+
+async def test_failed_broadcast_is_reported(users, monkeypatch):
+    bot = FakeBot()
+
+    async def broadcast(bot, chat_ids, text):
+        raise RuntimeError('connection lost')
+
+    monkeypatch.setattr(
+        NotificationService, 'broadcaster', SimpleNamespace(broadcast=broadcast)
+    )
+
+    await NotificationService.run_mass_notification(bot, 'hi', Sessions(), chat_id=99)
+
+    assert bot.messages == [(99, 'Массовая рассылка прервана из-за ошибки')]
+
+
+async def test_confirmation_is_answered_before_the_broadcast_ends(monkeypatch):
+    release, finished, answered, menu = asyncio.Event(), [], [], []
+
+    async def run_mass_notification(bot, text, session_maker, chat_id):
+        await release.wait()
+        finished.append((text, chat_id))
+
+    async def answer(text=None, show_alert=None):
+        answered.append(text)
+
+    async def return_to_main_menu(message, state, session, user_id):
+        menu.append(user_id)
+
+    monkeypatch.setattr(
+        NotificationService, 'run_mass_notification', run_mass_notification
+    )
+    monkeypatch.setattr(user_router, 'return_to_main_menu', return_to_main_menu)
+    state = FSMContext(
+        storage=MemoryStorage(), key=StorageKey(bot_id=1, chat_id=1, user_id=1)
+    )
+    await state.update_data(notification_text='hi')
+    callback = SimpleNamespace(
+        bot=None, message=None, from_user=SimpleNamespace(id=99), answer=answer
+    )
+
+    await user_router.process_send_notification(callback, state, None, Sessions())
+
+    assert answered and menu == [99]
+    assert finished == []
+    release.set()
+    await asyncio.gather(*notification._background_tasks)
+    assert finished == [('hi', 99)]
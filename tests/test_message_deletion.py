@@ -0,0 +1,55 @@
+import pytest
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import DeleteMessages
+
+from services import utils
+from services.utils import DELETE_WINDOW, delete_messages
+
+NOW = 1_700_000_000
+
+
+class FakeBot:
+    """Records delete_messages calls; a chunk listed in ``failing`` is rejected."""
+
+    def __init__(self, failing: int | None = None):
+        self.failing = failing
+        self.calls = []
+
+    async def delete_messages(self, chat_id, message_ids):
+        self.calls.append(message_ids)
+        if len(self.calls) == self.failing:
+            raise TelegramBadRequest(
+                DeleteMessages(chat_id=chat_id, message_ids=message_ids),
+                'Bad Request: message to delete not found'
+            )
+
+
+@pytest.fixture(autouse=True)
+def now(monkeypatch):
+    monkeypatch.setattr(utils.time, 'time', lambda: NOW)
+
+
+async def test_messages_older_than_the_delete_window_are_skipped():
+    bot = FakeBot()
+    entries = [[1, NOW - DELETE_WINDOW - 1], [2, NOW - DELETE_WINDOW + 1], [3, NOW]]
+
+    await delete_messages(bot, 1, entries)
+
+    assert bot.calls == [[2, 3]]
+
+
+async def test_legacy_int_entries_are_deleted_without_a_date():
+    bot = FakeBot()
+
+    await delete_messages(bot, 1, [5, [6, NOW], 5])
+
+    assert bot.calls == [[5, 6]]
+
+
+async def test_ids_are_sent_in_chunks_of_100_and_a_failed_chunk_is_skipped():
+    bot = FakeBot(failing=1)
+
+    await delete_messages(bot, 1, [[i, NOW] for i in range(250)])
+
+    assert [len(chunk) for chunk in bot.calls] == [100, 100, 50]
+    assert bot.calls[2][-1] == 249
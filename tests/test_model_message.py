@@ -0,0 +1,54 @@
+import datetime as dt
+from types import SimpleNamespace
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from handlers import siz_router
+from services.models import SModel
+
+MODEL = SModel(id=7, name='Каска', file_name='helmet.jpg')
+
+
+class FakeMessage:
+
+    def __init__(self):
+        self.texts = []
+
+    async def answer(self, text, reply_markup=None):
+        self.texts.append(text)
+        return SimpleNamespace(message_id=len(self.texts), date=dt.datetime.now())
+
+
+def failing_photo(error):
+    async def send_model_photo(session, model, send):
+        raise error
+    return send_model_photo
+
+
+async def send(monkeypatch, error):
+    monkeypatch.setattr(siz_router.SIZService, 'send_model_photo', failing_photo(error))
+    callback = SimpleNamespace(message=FakeMessage())
+    state = FSMContext(
+        storage=MemoryStorage(), key=StorageKey(bot_id=1, chat_id=1, user_id=1)
+    )
+    await siz_router.send_model_message(
+        callback, state, None, MODEL, 'caption', 'text', None
+    )
+    return callback.message.texts
+
+
+@pytest.mark.parametrize('error', [
+    FileNotFoundError('helmet.jpg'),
+    TelegramBadRequest(method=None, message='Bad Request: wrong file identifier')
+])
+async def test_photo_failure_falls_back_to_text(monkeypatch, error):
+    assert await send(monkeypatch, error) == ['text']
+
+
+async def test_unexpected_errors_are_not_swallowed(monkeypatch):
+    with pytest.raises(KeyError):
+        await send(monkeypatch, KeyError('bug'))
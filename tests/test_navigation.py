@@ -0,0 +1,81 @@
+import datetime as dt
+from types import SimpleNamespace
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from handlers import base_functions
+from handlers.base_functions import close_confirmation
+from presentation.responses import edit_response
+from services.utils import get_screen, push_screen
+from states.pickpoint import PickPointState
+
+
+class FakeMessage:
+
+    def __init__(self, message_id: int, error: str | None = None):
+        self.message_id = message_id
+        self.chat = SimpleNamespace(id=1)
+        self.bot = None
+        self.error = error
+        self.edited = []
+        self.answered = []
+
+    async def edit_text(self, text, reply_markup=None):
+        if self.error:
+            raise TelegramBadRequest(method=None, message=self.error)
+        self.edited.append(text)
+
+    async def answer(self, text, reply_markup=None):
+        self.answered.append(text)
+        return SimpleNamespace(message_id=self.message_id + 100, date=dt.datetime.now())
+
+
+@pytest.fixture
+def state():
+    return FSMContext(
+        storage=MemoryStorage(), key=StorageKey(bot_id=1, chat_id=1, user_id=1)
+    )
+
+
+async def test_unchanged_screen_is_not_resent(state):
+    message = FakeMessage(
+        10, 'Bad Request: message is not modified: specified new message content'
+    )
+    assert await edit_response(message, 'menu', None, state) is message
+    assert message.answered == []
+
+
+async def test_uneditable_screen_is_resent_and_nav_follows_it(state):
+    await push_screen(state, 'pickpoints', PickPointState.get_pickpoint, 10, root=True)
+    message = FakeMessage(10, "Bad Request: message can't be edited")
+
+    shown = await edit_response(message, 'menu', None, state)
+
+    assert message.answered == ['menu']
+    assert shown.message_id == 110
+    assert (await get_screen(state))[2] == 110
+
+
+async def test_edited_screen_keeps_its_message(state):
+    message = FakeMessage(10)
+    assert await edit_response(message, 'menu', None, state) is message
+    assert message.edited == ['menu']
+
+
+async def test_close_confirmation_deletes_answer_and_prompt(state, monkeypatch):
+    deleted = []
+    monkeypatch.setattr(
+        base_functions, 'schedule_messages_deletion',
+        lambda bot, chat_id, ids: deleted.extend(ids)
+    )
+    await state.update_data(answer_id=21, confirm_id=22)
+
+    await close_confirmation(FakeMessage(10), state)
+
+    assert deleted == [21, 22]
+    data = await state.get_data()
+    assert data['answer_id'] is None and data['confirm_id'] is None
@@ -0,0 +1,127 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from dao.admin import NoticeDeliveryDAO
+from database.models import DeliveryStatus
+from services import notification
+from services.broadcast import BroadcastStats
+from services.notification import NotificationService
+
+UNFINISHED = (DeliveryStatus.PENDING, DeliveryStatus.FAILED)
+NOTICE = SimpleNamespace(id=7, notice_text='hi')
+
+
+class FakeLedger:
+    """In-memory notice_delivery rows: id -> {tg_id, attempts, status}."""
+
+    def __init__(self, rows: dict[int, int]):
+        self.rows = {
+            row_id: {'tg_id': tg_id, 'attempts': 0, 'status': DeliveryStatus.PENDING}
+            for row_id, tg_id in rows.items()
+        }
+
+    async def has_recipients(self, session, notice_id):
+        return True
+
+    async def get_due(self, session, notice_id, limit):
+        due = [
+            SimpleNamespace(id=row_id, tg_id=row['tg_id'], attempts=row['attempts'])
+            for row_id, row in sorted(self.rows.items())
+            if row['status'] in UNFINISHED and row['attempts'] == 0
+        ]
+        return due[:limit]
+
+    async def mark_sent(self, session, ids):
+        for row_id in ids:
+            row = self.rows[row_id]
+            row.update(status=DeliveryStatus.SENT, attempts=row['attempts'] + 1)
+
+    async def mark_failed(self, session, rows):
+        for row in rows:
+            self.rows[row['id']].update(status=row['status'], attempts=row['attempts'])
+
+    async def count_unfinished(self, session, notice_id):
+        return sum(row['status'] in UNFINISHED for row in self.rows.values())
+
+
+class FakeBroadcaster:
+    def __init__(self, failing: dict[int, str] | None = None):
+        self.failing = failing or {}
+        self.sent_to = []
+
+    async def broadcast(self, bot, chat_ids, text):
+        self.sent_to.extend(chat_ids)
+        stats = BroadcastStats(total=len(chat_ids))
+        for chat_id in chat_ids:
+            if chat_id in self.failing:
+                stats.failed += 1
+                stats.failures[chat_id] = self.failing[chat_id]
+            else:
+                stats.sent += 1
+        return stats
+
+
+@pytest.fixture
+def deliver(monkeypatch):
+    def setup(rows, failing=None):
+        ledger = FakeLedger(rows)
+        broadcaster = FakeBroadcaster(failing)
+        delivered = []
+
+        async def noop(*args, **kwargs):
+            pass
+
+        async def update_object(session, notice_id, **values):
+            delivered.append(notice_id)
+
+        monkeypatch.setattr(notification, 'NoticeDeliveryDAO', ledger)
+        monkeypatch.setattr(notification, 'checkpoint', noop)
+        monkeypatch.setattr(notification.AdminDAO, 'update_object', update_object)
+        monkeypatch.setattr(NotificationService, 'broadcaster', broadcaster)
+        monkeypatch.setattr(NotificationService, 'report_to_admins', noop)
+        return ledger, broadcaster, delivered
+    return setup
+
+
+async def test_rows_sharing_a_chat_are_all_settled(deliver):
+    ledger, broadcaster, delivered = deliver({1: 100, 2: 100, 3: 200})
+    await NotificationService.deliver_notice(None, None, NOTICE)
+    assert broadcaster.sent_to == [100, 200]
+    assert {row['status'] for row in ledger.rows.values()} == {DeliveryStatus.SENT}
+    assert delivered == [7]
+
+
+async def test_failed_chat_fails_every_row_pointing_at_it(deliver):
+    ledger, _, delivered = deliver({1: 100, 2: 100, 3: 200}, failing={100: 'timeout'})
+    await NotificationService.deliver_notice(None, None, NOTICE)
+    assert ledger.rows[1]['status'] == ledger.rows[2]['status'] == DeliveryStatus.FAILED
+    assert ledger.rows[3]['status'] == DeliveryStatus.SENT
+    assert delivered == []
+
+
+async def test_delivery_stops_between_chunks_when_lease_is_lost(deliver, monkeypatch):
+    ledger, broadcaster, delivered = deliver({1: 100, 2: 200, 3: 300})
+    held = iter([True, False])
+    monkeypatch.setattr(notification, 'lease_held', lambda: next(held))
+    monkeypatch.setattr(NotificationService, 'chunk_size', 2)
+
+    await NotificationService.deliver_notice(None, None, NOTICE)
+
+    assert broadcaster.sent_to == [100, 200]
+    assert ledger.rows[3]['status'] == DeliveryStatus.PENDING
+    assert delivered == []
+
+
+async def test_due_deliveries_are_claimed_with_skip_locked():
+    statements = []
+
+    class CapturingSession:
+        async def execute(self, query):
+            statements.append(str(query.compile(dialect=postgresql.dialect())))
+            return SimpleNamespace(all=list)
+
+    await NoticeDeliveryDAO.get_due(CapturingSession(), 1, 10)
+
+    assert statements[0].endswith('FOR UPDATE OF notice_delivery SKIP LOCKED')
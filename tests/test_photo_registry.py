@@ -0,0 +1,102 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services import media
+from services.images import ImagePipeline
+from services.media import PhotoRegistry
+from services.models import SModel
+
+
+class Chat:
+    """Collects what was sent; an upload gets a file_id back like Telegram does."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, photo):
+        await asyncio.sleep(0)
+        self.sent.append(photo)
+        file_id = photo if isinstance(photo, str) else f'uploaded-{len(self.sent)}'
+        return SimpleNamespace(photo=[SimpleNamespace(file_id=file_id)])
+
+
+class NoDisk(ImagePipeline):
+
+    async def prepare(self, file_name):
+        raise FileNotFoundError(file_name)
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    (tmp_path / 'helmet.jpg').write_bytes(b'jpeg bytes')
+    return ImagePipeline(images_dir=tmp_path, cache_dir=tmp_path / 'cache')
+
+
+@pytest.fixture(autouse=True)
+def stored(monkeypatch):
+    stored = []
+
+    async def set_file_id(session, file_name, file_id, file_hash):
+        stored.append((file_name, file_id))
+
+    monkeypatch.setattr(media.SIZModelDAO, 'set_file_id', set_file_id)
+    return stored
+
+
+@pytest.mark.parametrize('file_name', [None, 'missing.jpg'])
+async def test_stored_file_id_is_sent_when_the_file_is_missing(file_name):
+    registry, chat = PhotoRegistry(NoDisk()), Chat()
+    model = SModel(
+        id=1, name='Каска', file_id='AgAD', file_name=file_name, file_hash='h'
+    )
+
+    await registry.send(None, model, chat.send)
+
+    assert chat.sent == ['AgAD']
+    assert registry.stats()['reused'] == 1
+
+
+async def test_model_without_image_raises_file_not_found():
+    registry = PhotoRegistry(NoDisk())
+    with pytest.raises(FileNotFoundError):
+        await registry.send(None, SModel(id=1, name='Каска'), Chat().send)
+
+
+async def test_concurrent_sends_upload_a_new_file_once(pipeline, stored):
+    registry, chat = PhotoRegistry(pipeline), Chat()
+    model = SModel(id=1, name='Каска', file_name='helmet.jpg')
+
+    await asyncio.gather(*(registry.send(None, model, chat.send) for _ in range(3)))
+
+    assert len([photo for photo in chat.sent if not isinstance(photo, str)]) == 1
+    assert chat.sent[1:] == ['uploaded-1', 'uploaded-1']
+    assert stored == [('helmet.jpg', 'uploaded-1')]
+
+
+async def test_row_file_id_wins_over_a_stale_cached_one(pipeline, stored):
+    key = (await pipeline.prepare('helmet.jpg')).key
+    registry, chat = PhotoRegistry(pipeline), Chat()
+    registry._file_ids['helmet.jpg'] = ('old', 'stale')
+    model = SModel(
+        id=1, name='Каска', file_name='helmet.jpg', file_id='AgAD', file_hash=key
+    )
+
+    await registry.send(None, model, chat.send)
+
+    assert chat.sent == ['AgAD']
+    assert registry._file_ids['helmet.jpg'] == (key, 'AgAD')
+    assert stored == []
+
+
+async def test_changed_file_is_uploaded_again(pipeline, stored):
+    registry, chat = PhotoRegistry(pipeline), Chat()
+    model = SModel(
+        id=1, name='Каска', file_name='helmet.jpg', file_id='AgAD', file_hash='old'
+    )
+
+    await registry.send(None, model, chat.send)
+
+    assert not isinstance(chat.sent[0], str)
+    assert stored == [('helmet.jpg', 'uploaded-1')]
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+import pytest
+
+from middlewares.global_middlewares import UserReachabilityMiddleware
+from services.base import AuthCache
+from services.models import AuthEntry
+from services.user import UserService
+
+
+@pytest.fixture
+def marked(monkeypatch):
+    cache = AuthCache()
+    calls = []
+
+    async def mark_reachable(session, tg_id):
+        calls.append(tg_id)
+
+    monkeypatch.setattr(UserService, 'auth_cache', cache)
+    monkeypatch.setattr(UserService, 'mark_reachable', mark_reachable)
+    return cache, calls
+
+
+async def handler(event, data):
+    return 'handled'
+
+
+def update_from(tg_id: int) -> dict:
+    return {'event_from_user': SimpleNamespace(id=tg_id), 'session': None}
+
+
+async def test_only_flagged_users_are_written(marked):
+    cache, calls = marked
+    cache.set(
+        1, AuthEntry(user_id=1, is_active=True, is_admin=False, is_unreachable=True)
+    )
+    cache.set(2, AuthEntry(user_id=2, is_active=True, is_admin=False))
+    middleware = UserReachabilityMiddleware()
+    for tg_id in (1, 2, 3):
+        assert await middleware(handler, None, update_from(tg_id)) == 'handled'
+    assert calls == [1]
+
+
+async def test_unknown_users_do_not_touch_cache_counters(marked):
+    cache, _ = marked
+    await UserReachabilityMiddleware()(handler, None, update_from(42))
+    assert cache.stats()['misses'] == 0
@@ -0,0 +1,31 @@
+import pytest
+
+from services.models import TrackCallback
+
+
+def test_record_round_trips():
+    track_cb = TrackCallback(chat_id=10, message_id=20, callback_data='model:3')
+    raw = track_cb.encode()
+
+    assert raw == [TrackCallback.version, 10, 20, 'model:3']
+    decoded = TrackCallback.decode(raw)
+    assert (decoded.chat_id, decoded.message_id, decoded.callback_data) == (
+        10, 20, 'model:3'
+    )
+
+
+def test_legacy_dict_with_the_full_message_is_loaded():
+    raw = {
+        'message': {'message_id': 20, 'date': 0, 'chat': {'id': 10, 'type': 'private'}},
+        'callback_data': 'model:3'
+    }
+    decoded = TrackCallback.decode(raw)
+    assert (decoded.chat_id, decoded.message_id, decoded.callback_data) == (
+        10, 20, 'model:3'
+    )
+
+
+@pytest.mark.parametrize('raw', [[TrackCallback.version + 1, 10, 20, 'x'], [], 'x'])
+def test_unknown_formats_are_rejected(raw):
+    with pytest.raises(ValueError):
+        TrackCallback.decode(raw)
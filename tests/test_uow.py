@@ -0,0 +1,129 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from database.uow import after_commit, save, unit_of_work
+from middlewares.global_middlewares import DbSessionMiddleware, UpdateSession
+
+
+class FakeSession:
+    """Records commit/flush/rollback calls in the order they happen."""
+
+    def __init__(self, **kw):
+        self.info = {}
+        self.calls = []
+        self.active = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    def in_transaction(self):
+        return self.active
+
+    async def flush(self):
+        self.calls.append('flush')
+
+    async def commit(self):
+        self.calls.append('commit')
+        self.active = False
+
+    async def rollback(self):
+        self.calls.append('rollback')
+        self.active = False
+
+
+async def test_save_commits_outside_a_unit_of_work():
+    session = FakeSession()
+    await save(session)
+    assert session.calls == ['commit']
+
+
+async def test_unit_of_work_flushes_and_commits_once_with_after_commit_callbacks():
+    sessions, fired = [], []
+
+    def session_maker():
+        sessions.append(FakeSession())
+        return sessions[-1]
+
+    async with unit_of_work(session_maker) as session:
+        await save(session)
+        await save(session)
+        after_commit(session, lambda: fired.append('cache dropped'))
+        assert fired == []
+
+    assert session.calls == ['flush', 'flush', 'commit']
+    assert fired == ['cache dropped']
+
+
+async def test_unit_of_work_rolls_back_and_skips_callbacks_on_error():
+    session, fired = FakeSession(), []
+    with pytest.raises(RuntimeError):
+        async with unit_of_work(lambda: session):
+            await save(session)
+            after_commit(session, lambda: fired.append('cache dropped'))
+            raise RuntimeError
+
+    assert session.calls == ['flush', 'rollback']
+    assert fired == []
+
+
+def make_middleware():
+    sessions = []
+
+    class RecordingSession(FakeSession):
+        def __init__(self, **kw):
+            super().__init__(**kw)
+            sessions.append(self)
+
+    return DbSessionMiddleware(async_sessionmaker(class_=RecordingSession)), sessions
+
+
+async def test_middleware_commits_once_when_the_handler_wrote():
+    middleware, sessions = make_middleware()
+
+    async def handler(event, data):
+        data['session'].active = True
+        await save(data['session'])
+        await save(data['session'])
+        return 'ok'
+
+    assert await middleware(handler, object(), {}) == 'ok'
+    assert sessions[0].calls == ['flush', 'flush', 'commit']
+
+
+async def test_middleware_skips_commit_when_no_transaction_began():
+    middleware, sessions = make_middleware()
+
+    async def handler(event, data):
+        return None
+
+    await middleware(handler, object(), {})
+    assert sessions[0].calls == []
+
+
+async def test_middleware_rolls_back_when_the_handler_fails():
+    middleware, sessions = make_middleware()
+
+    async def handler(event, data):
+        data['session'].active = True
+        await save(data['session'])
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        await middleware(handler, object(), {})
+    assert sessions[0].calls == ['flush', 'rollback']
+
+
+def test_only_update_sessions_are_marked_used_on_begin():
+    engine = create_engine('sqlite://')
+    with UpdateSession(engine) as update_session, Session(engine) as other_session:
+        assert 'used' not in update_session.info
+        update_session.execute(text('select 1'))
+        other_session.execute(text('select 1'))
+
+        assert update_session.info['used']
+        assert 'used' not in other_session.info
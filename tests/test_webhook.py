@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import pytest
+from aiogram import Bot
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from config.base import WebhookConfig
+from config.webhook import LimitedRequestHandler, run_webhook
+
+TOKEN = '42:TEST'
+SECRET = 's3cret'
+
+
+class SlowDispatcher:
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.fed = 0
+
+    async def feed_raw_update(self, bot, update, **kwargs):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        self.fed += 1
+
+
+async def wait_fed(dispatcher: SlowDispatcher, count: int) -> None:
+    while dispatcher.fed < count:
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def dispatcher():
+    return SlowDispatcher()
+
+
+@pytest.fixture
+async def client(dispatcher):
+    app = web.Application()
+    LimitedRequestHandler(
+        dispatcher=dispatcher, bot=Bot(TOKEN), max_tasks=2, secret_token=SECRET
+    ).register(app, path='/webhook')
+    async with TestClient(TestServer(app)) as test_client:
+        yield test_client, dispatcher
+
+
+async def test_updates_are_processed_at_most_max_tasks_at_a_time(client):
+    test_client, dispatcher = client
+    headers = {'X-Telegram-Bot-Api-Secret-Token': SECRET}
+    responses = await asyncio.gather(*(
+        test_client.post('/webhook', json={'update_id': i}, headers=headers)
+        for i in range(6)
+    ))
+    assert [response.status for response in responses] == [200] * 6
+    await asyncio.wait_for(wait_fed(dispatcher, 6), timeout=5)
+    assert dispatcher.peak == 2
+
+
+@pytest.mark.parametrize('dispatcher', [SlowDispatcher(delay=1)])
+async def test_slow_handler_is_acknowledged_at_once(client):
+    test_client, dispatcher = client
+    headers = {'X-Telegram-Bot-Api-Secret-Token': SECRET}
+    started = time.monotonic()
+    response = await test_client.post(
+        '/webhook', json={'update_id': 1}, headers=headers
+    )
+    assert response.status == 200
+    assert time.monotonic() - started < 0.5
+    assert dispatcher.fed == 0
+
+
+async def test_forged_update_is_rejected(client):
+    test_client, dispatcher = client
+    response = await test_client.post('/webhook', json={'update_id': 1})
+    assert response.status == 401
+    assert dispatcher.fed == 0
+
+
+async def test_webhook_mode_requires_a_secret():
+    config = WebhookConfig(
+        base_url=None, path='/webhook', secret=None, host='127.0.0.1', port=0,
+        max_tasks=1
+    )
+    with pytest.raises(RuntimeError):
+        await run_webhook(Bot(TOKEN), None, config)
@@ -0,0 +1,104 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from exceptions.writer import RowNotSaved
+from services import writer
+from services.writer import WriteBehindQueue
+
+
+class FakeDAO:
+    model = SimpleNamespace(__tablename__='reviews')
+    rows: list[dict] = []
+    batches: list[int] = []
+    fail_batches = 0
+    fail_rows: set[int] = set()
+
+    @classmethod
+    def reset(cls):
+        cls.rows, cls.batches, cls.fail_batches, cls.fail_rows = [], [], 0, set()
+
+    @classmethod
+    async def insert_many(cls, session, rows):
+        if cls.fail_batches:
+            cls.fail_batches -= 1
+            raise RuntimeError('connection lost')
+        cls.batches.append(len(rows))
+        cls.rows.extend(rows)
+        return len(rows)
+
+    @classmethod
+    async def add_new_object(cls, session, **row):
+        if row['n'] in cls.fail_rows:
+            raise ValueError('bad row')
+        cls.rows.append(row)
+
+
+@asynccontextmanager
+async def session_maker():
+    yield SimpleNamespace()
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    sleep = asyncio.sleep
+    monkeypatch.setattr(writer.asyncio, 'sleep', lambda delay: sleep(0))
+    FakeDAO.reset()
+
+
+async def test_put_returns_after_rows_are_flushed_in_one_batch():
+    queue = WriteBehindQueue(batch_size=10, flush_interval=0.05)
+    await queue.start(session_maker)
+    await asyncio.gather(*(queue.put(None, FakeDAO, n=n) for n in range(5)))
+
+    assert FakeDAO.batches == [5]
+    assert queue.stats()['flushed'] == 5
+    await queue.stop()
+
+
+async def test_non_sqlalchemy_error_is_retried_and_keeps_flusher_alive():
+    queue = WriteBehindQueue(flush_interval=0.01)
+    await queue.start(session_maker)
+    FakeDAO.fail_batches = 1
+    await queue.put(None, FakeDAO, n=1)
+    await queue.put(None, FakeDAO, n=2)
+
+    assert [row['n'] for row in FakeDAO.rows] == [1, 2]
+    await asyncio.wait_for(queue.stop(), 1)
+
+
+async def test_dropped_row_is_reported_to_its_caller_only():
+    queue = WriteBehindQueue(flush_interval=0.05, max_retries=1)
+    await queue.start(session_maker)
+    FakeDAO.fail_batches = 1
+    FakeDAO.fail_rows = {2}
+    results = await asyncio.gather(
+        *(queue.put(None, FakeDAO, n=n) for n in range(1, 4)), return_exceptions=True
+    )
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], RowNotSaved)
+    assert queue.stats()['failed'] == 1
+    await queue.stop()
+
+
+async def test_stop_gives_up_on_drain_after_timeout():
+    queue = WriteBehindQueue(drain_timeout=0.05)
+    hang = asyncio.Event()
+
+    async def insert_many(session, rows):
+        await hang.wait()
+
+    FakeDAO.insert_many = insert_many
+    try:
+        await queue.start(session_maker)
+        pending = asyncio.create_task(queue.put(None, FakeDAO, n=1))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(queue.stop(), 1)
+    finally:
+        del FakeDAO.insert_many
+
+    with pytest.raises((RowNotSaved, asyncio.CancelledError)):
+        await pending